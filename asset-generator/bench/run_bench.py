@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — Local Pipeline Benchmarks
+═══════════════════════════════════════════════════════════════
+Times every local stage of the asset pipeline on synthetic
+fixtures (no API calls, no quota):
+
+    image     decode, resize + encode per breakpoint/format,
+              blurhash/LQIP/colour placeholders, SSIM and the
+              per-rendition quality search, full optimize_image()
+    video     one ffmpeg transcode per rendition, the single-decode
+              multi-rendition job, and the per-title CRF search
+    manifest  record_asset / record_renditions, filtered queries,
+              generate_all --status
+    cache     asset_cache.cache_key / resolve (hit)
+    pending   pending_video_operations.json rewrite
+    prompts   catalogue parse, prompts.py façade, id lookups
+    dedupe    pHash/dHash of one image, multi-index radius query vs
+              a linear scan over 5,000 hashes
+    cli       manah-assets start-up (`list`, `plan`) against a bare
+              interpreter; `list` should stay under 100 ms
+    backend   MockBackend throughput against mock_server.py
+
+Results are written to bench/results/<timestamp>-<commit>.json so
+runs from different commits can be compared:
+
+    python bench/run_bench.py
+    python bench/run_bench.py --only image,manifest --repeat 10
+    python bench/run_bench.py --compare bench/results/<older>.json
+═══════════════════════════════════════════════════════════════
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import platform
+import tempfile
+import importlib
+import statistics
+import subprocess
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(BENCH_DIR, '..', 'scripts')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+# Keep every write inside a scratch directory, before the modules read their paths
+WORK_DIR = tempfile.mkdtemp(prefix="manah-bench-")
+os.environ["MANAH_MANIFEST"] = os.path.join(WORK_DIR, "manifest.sqlite")
+
+sys.path.insert(0, SCRIPTS_DIR)
+import asset_cache
+import manifest
+import transcode
+import image_pipeline
+import responsive
+import video_sources
+import posters
+
+asset_cache.CACHE_DIR = os.path.join(WORK_DIR, "cache")
+asset_cache.OBJECTS_DIR = os.path.join(asset_cache.CACHE_DIR, "objects")
+asset_cache.INDEX_FILE = os.path.join(asset_cache.CACHE_DIR, "index.json")
+responsive.MANIFEST_DIR = os.path.join(WORK_DIR, "responsive")
+responsive.TS_MODULE = os.path.join(WORK_DIR, "image-manifest.ts")
+video_sources.MANIFEST_DIR = os.path.join(WORK_DIR, "video-sources")
+video_sources.TS_MODULE = os.path.join(WORK_DIR, "video-manifest.ts")
+
+SUITES = ["image", "video", "manifest", "cache", "pending", "prompts", "dedupe", "cli", "backend"]
+
+
+class Skip(Exception):
+    """Raised by a suite whose tools (Pillow, ffmpeg, ...) are not available."""
+
+
+def measure(fn, repeat, warmup=1):
+    """Run `fn` warmup + repeat times; return timing stats in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "repeat": repeat,
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "stdev_ms": round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0,
+    }
+
+
+# ─── Fixtures ───
+
+def fixture_image(width=2816, height=1536):
+    """A synthetic PNG roughly the size of an Imagen 16:9 output."""
+    image_pipeline.require_pillow()
+    from PIL import Image
+    path = os.path.join(WORK_DIR, f"fixture-{width}x{height}.png")
+    if not os.path.exists(path):
+        # Gradients + noise, so encoders have real work to do
+        gradient = Image.linear_gradient("L").resize((width, height))
+        noise = Image.effect_noise((width, height), 64)
+        Image.merge("RGB", (gradient, noise, gradient.transpose(Image.FLIP_LEFT_RIGHT))).save(path)
+    return path
+
+
+def fixture_video(seconds=4):
+    """A 1080p H.264 test pattern, like a Veo output."""
+    if not shutil.which(transcode.FFMPEG):
+        raise Skip(f"{transcode.FFMPEG} not found")
+    path = os.path.join(WORK_DIR, f"fixture-{seconds}s.mp4")
+    if not os.path.exists(path):
+        subprocess.run(
+            [transcode.FFMPEG, "-y", "-hide_banner", "-loglevel", "error",
+             "-f", "lavfi", "-i", f"testsrc2=size=1920x1080:rate=24:duration={seconds}",
+             "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p", path],
+            check=True,
+        )
+    return path
+
+
+# ─── Suites ───
+
+def bench_image(repeat):
+    src = fixture_image()
+    img = image_pipeline.decode(src)
+    results = {"decode": measure(lambda: image_pipeline.decode(src), repeat)}
+
+    formats = [f for f in ("webp", "avif", "jpeg") if image_pipeline.supported(f)]
+    for suffix, width in image_pipeline.BREAKPOINTS.items():
+        resized = image_pipeline.resize_to_width(img, width)
+        results[f"resize/{suffix}"] = measure(lambda: image_pipeline.resize_to_width(img, width), repeat)
+        for fmt in formats:
+            results[f"encode/{suffix}/{fmt}"] = measure(lambda: image_pipeline.encode(resized, fmt), repeat)
+
+    small = image_pipeline.resize_to_width(img, image_pipeline.BREAKPOINTS["sm"])
+    results["placeholders (from sm)"] = measure(lambda: responsive.placeholders(small), repeat)
+
+    if image_pipeline.np is not None:
+        md = image_pipeline.resize_to_width(img, image_pipeline.BREAKPOINTS["md"])
+        luma = image_pipeline._luma(md)
+        results["ssim/md"] = measure(lambda: image_pipeline.ssim(luma, luma), repeat)
+        for fmt in formats:
+            results[f"search/md/{fmt}"] = measure(
+                lambda: image_pipeline.search_quality(md, fmt, reference=luma), max(1, repeat // 2))
+
+    dest = os.path.join(WORK_DIR, "renditions", "fixture")
+    results["optimize_image"] = measure(lambda: image_pipeline.optimize_image(src, dest), max(1, repeat // 2))
+    return results
+
+
+def bench_video(repeat):
+    src = fixture_video()
+    out_dir = os.path.join(WORK_DIR, "video")
+    budget = transcode.ThreadBudget()
+    repeat = max(1, repeat // 3)  # encodes are slow
+
+    results = {}
+    for rendition in transcode.WEB_RENDITIONS:
+        job = {"src": src, "outputs": [(rendition, transcode.rendition_path(out_dir, "single", rendition))]}
+        results[f"transcode/{rendition['name']}"] = measure(lambda: run_ok(job, budget), repeat, warmup=0)
+
+    job = {"src": src, "outputs": [(r, transcode.rendition_path(out_dir, "multi", r))
+                                   for r in transcode.WEB_RENDITIONS]}
+    results["transcode/all-renditions-one-decode"] = measure(lambda: run_ok(job, budget), repeat, warmup=0)
+
+    # WebM rungs, one codec at a time (skipped when this ffmpeg lacks the encoder)
+    for codec in ("vp9", "av1"):
+        renditions = transcode.web_renditions([codec], transcode.WEB_RENDITIONS[:1])
+        if renditions:
+            job = {"src": src, "outputs": [(r, transcode.rendition_path(out_dir, "webm", r)) for r in renditions]}
+            results[f"transcode/720p-{codec}"] = measure(lambda: run_ok(job, budget), repeat, warmup=0)
+
+    # TRANSCODE_MODE=per-title: the probe encodes + ssim passes that pick each rung's CRF
+    for rendition in transcode.WEB_RENDITIONS:
+        results[f"per-title search/{rendition['name']}"] = measure(
+            lambda: transcode.search_crf(src, rendition), repeat, warmup=0)
+
+    if posters.np is not None:
+        results["poster/pick-frame"] = measure(lambda: posters.pick_frame(src), repeat, warmup=0)
+        results["poster/preview"] = measure(
+            lambda: posters.preview(src, os.path.join(out_dir, "preview.webp")), repeat, warmup=0)
+    return results
+
+
+def run_ok(job, budget):
+    result = transcode.run_job(dict(job, fallback_copy=False), budget)
+    if result["status"] != "success":
+        raise RuntimeError(result["error"])
+
+
+def bench_manifest(repeat, rows=500):
+    src = fixture_image(640, 360)
+    for i in range(rows):
+        path = os.path.join(WORK_DIR, "assets", f"asset-{i}.png")
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            shutil.copyfile(src, path)
+        manifest.record_asset(f"asset_{i}", path, ("imagen", "replicate", "gemini")[i % 3],
+                              prompt=f"prompt {i}", category=f"cat{i % 8}")
+    renditions = [{"path": os.path.join(WORK_DIR, "assets", f"asset-0-{s}.webp"), "suffix": s,
+                   "format": "webp", "bytes": 1000, "width": w, "height": w // 2}
+                  for s, w in image_pipeline.BREAKPOINTS.items()]
+    target = os.path.join(WORK_DIR, "assets", "asset-0.png")
+
+    import generate_all
+    results = {
+        "record_asset": measure(lambda: manifest.record_asset(
+            "asset_0", target, "imagen", prompt="prompt 0", category="cat0", width=640, height=360), repeat),
+        "record_renditions": measure(lambda: manifest.record_renditions(target, renditions), repeat),
+        f"assets/all ({rows} rows)": measure(lambda: manifest.assets(), repeat),
+        "assets/category": measure(lambda: manifest.assets(category="cat3"), repeat),
+        "assets/id": measure(lambda: manifest.assets(asset_id="asset_42"), repeat),
+        "counts_by/backend": measure(lambda: manifest.counts_by("backend"), repeat),
+        "keys": measure(lambda: manifest.keys(), repeat),
+        "check_renditions": measure(lambda: manifest.check_renditions(), repeat),
+        "status": measure(lambda: quiet(generate_all.check_status), repeat),
+    }
+    return results
+
+
+def bench_cache(repeat):
+    src = fixture_image(640, 360)
+    dest = os.path.join(WORK_DIR, "cache-out", "hero.png")
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    shutil.copyfile(src, dest)
+    key = asset_cache.cache_key("imagen", "prompt", "16:9", {"number_of_images": 1})
+    asset_cache.store(key, dest, model="imagen", prompt="prompt")
+    return {
+        "cache_key": measure(lambda: asset_cache.cache_key("imagen", "prompt" * 50, "16:9", {"n": 1}), repeat * 10),
+        "resolve/hit": measure(lambda: asset_cache.resolve(key, dest), repeat * 10),
+        "store": measure(lambda: asset_cache.store(key, dest, model="imagen"), repeat),
+    }
+
+
+def bench_pending(repeat, entries=50):
+    path = os.path.join(WORK_DIR, "pending_video_operations.json")
+    pending = {
+        f"video_{i}": {
+            "operation_name": f"models/veo/operations/{i:032x}",
+            "filename": f"hero/video_{i}.mp4",
+            "filepath": f"/tmp/output/videos/hero/video_{i}.mp4",
+            "purpose": "Benchmark fixture",
+            "submitted_at": datetime.now().isoformat(),
+        }
+        for i in range(entries)
+    }
+
+    def save():
+        # Same atomic rewrite as generate_videos.save_pending_operations()
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(pending, f, indent=2)
+        os.replace(tmp, path)
+
+    def load():
+        with open(path) as f:
+            json.load(f)
+
+    return {
+        f"save ({entries} ops)": measure(save, repeat * 5),
+        f"load ({entries} ops)": measure(load, repeat * 5),
+    }
+
+
+def bench_prompts(repeat):
+    import catalogue
+    import prompts
+
+    def parse():
+        catalogue.load.cache_clear()
+        catalogue.load()
+
+    ids = [a.id for a in catalogue.group("images")]
+    return {
+        "catalogue parse (uncached)": measure(parse, repeat),
+        "import/reload prompts": measure(lambda: importlib.reload(prompts), repeat),
+        "get_all_image_prompts": measure(prompts.get_all_image_prompts, repeat * 10),
+        "get_all_video_prompts": measure(prompts.get_all_video_prompts, repeat * 10),
+        f"get by id ({len(ids)} lookups)": measure(
+            lambda: [catalogue.get(i, group="images") for i in ids], repeat * 10),
+    }
+
+
+def bench_dedupe(repeat, size=5000, radius=10):
+    import random
+    import dedupe
+
+    if dedupe.np is None or dedupe.Image is None:
+        raise Skip("numpy/Pillow not installed")
+    src = fixture_image()
+
+    # Families of near-identical hashes, like variants of the same shot
+    rng = random.Random(0)
+    values = []
+    while len(values) < size:
+        base = rng.getrandbits(64)
+        for _ in range(5):
+            values.append(base ^ sum(1 << rng.randrange(64) for _ in range(rng.randrange(4))))
+    tree = dedupe.MultiIndex()
+    for i, v in enumerate(values):
+        tree.add(v, i)
+    probes = values[::50]
+
+    def linear():
+        return [[i for i, v in enumerate(values) if dedupe.distance(p, v) <= radius] for p in probes]
+
+    return {
+        "hashes (phash + dhash, one decode)": measure(lambda: dedupe.hashes(src), repeat),
+        f"multi-index query r={radius} ({len(probes)} of {size})": measure(
+            lambda: [tree.query(p, radius) for p in probes], repeat),
+        f"linear scan r={radius} ({len(probes)} of {size})": measure(linear, repeat),
+    }
+
+
+def bench_cli(repeat):
+    cli = os.path.join(SCRIPTS_DIR, "manah_assets.py")
+
+    def run(*args):
+        return lambda: subprocess.run([sys.executable, *args], stdout=subprocess.DEVNULL, check=True)
+
+    return {
+        "python -c pass (interpreter floor)": measure(run("-c", "pass"), repeat),
+        "manah-assets list": measure(run(cli, "list"), repeat),
+        "manah-assets list --group news": measure(run(cli, "list", "--group", "news"), repeat),
+        "manah-assets plan --group images": measure(run(cli, "plan", "--group", "images"), repeat),
+    }
+
+
+def bench_backend(repeat, requests=32, concurrency=8, latency=0.05):
+    import backends
+    from mock_server import MockServer
+
+    server = MockServer(port=0, latency=latency, image_width=512).start()
+    backend = backends.MockBackend(base_url=server.url)
+
+    async def batch():
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(i):
+            async with sem:
+                await backend.generate_image(f"bench {i}")
+        await asyncio.gather(*(one(i) for i in range(requests)))
+
+    try:
+        stats = measure(lambda: asyncio.run(batch()), max(1, repeat // 2))
+    finally:
+        server.stop()
+    stats["requests_per_s"] = round(requests / (stats["median_ms"] / 1000), 1)
+    stats["ideal_requests_per_s"] = round(concurrency / latency, 1)
+    return {f"mock images ({requests} req, {concurrency} concurrent, {latency * 1000:.0f}ms)": stats}
+
+
+def quiet(fn, *args, **kwargs):
+    """Call fn with stdout discarded (status printing is not what we time)."""
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+
+# ─── Runner ───
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current, baseline_path):
+    """Print median deltas against an earlier results file."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\n  Compared with {os.path.basename(baseline_path)} ({baseline.get('commit')})")
+    for suite, benches in current["suites"].items():
+        old_suite = baseline.get("suites", {}).get(suite, {})
+        for name, stats in benches.items():
+            old = old_suite.get(name)
+            if not (isinstance(stats, dict) and isinstance(old, dict) and "median_ms" in old):
+                continue
+            delta = (stats["median_ms"] - old["median_ms"]) / old["median_ms"] * 100 if old["median_ms"] else 0
+            flag = "  ⚠️" if delta > 10 else ""
+            print(f"    {suite}/{name:45s} {old['median_ms']:>10.2f} → {stats['median_ms']:>10.2f} ms "
+                  f"({delta:+.0f}%){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the local asset pipeline stages")
+    parser.add_argument("--only", help=f"Comma-separated suites ({', '.join(SUITES)})")
+    parser.add_argument("--repeat", "-r", type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument("--output", "-o", help="Results file (default bench/results/<time>-<commit>.json)")
+    parser.add_argument("--compare", "-c", help="Earlier results file to diff against")
+    args = parser.parse_args()
+
+    suites = args.only.split(",") if args.only else SUITES
+    unknown = [s for s in suites if s not in SUITES]
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(unknown)}")
+
+    commit = git_commit()
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeat": args.repeat,
+        "suites": {},
+    }
+
+    print("=" * 60)
+    print("  MANAH GROUP — Pipeline Benchmarks")
+    print(f"  Commit: {commit} | Python {report['python']} | {report['cpus']} CPUs")
+    print("=" * 60)
+
+    try:
+        for suite in suites:
+            print(f"\n  ─── {suite} ───")
+            try:
+                results = globals()[f"bench_{suite}"](args.repeat)
+            except (Skip, SystemExit) as e:
+                print(f"    skipped: {e}")
+                report["suites"][suite] = {"skipped": str(e)}
+                continue
+            for name, stats in results.items():
+                print(f"    {name:45s} median {stats['median_ms']:>10.2f} ms  (min {stats['min_ms']:.2f})")
+            report["suites"][suite] = results
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    out = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n  Results: {out}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
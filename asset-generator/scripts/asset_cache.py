@@ -0,0 +1,193 @@
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — Content-Addressed Generation Cache
+═══════════════════════════════════════════════════════════════
+Every generated asset is stored once under output/cache/objects,
+keyed by a SHA-256 of (model, prompt, aspect ratio, config), with
+a JSON sidecar describing how it was produced. An index maps each
+output path to the key it was last produced from, so:
+
+  - editing a prompt changes the key and the asset is regenerated
+  - renaming a filename re-uses the existing blob instead of paying
+    for an identical generation
+  - lookups are a single stat() on objects/<k[:2]>/<k>
+
+Typical use inside a generator:
+
+    key = asset_cache.cache_key(MODEL, prompt, aspect, config)
+    hit = asset_cache.resolve(key, out_path)   # "skipped" | "cached" | None
+    if hit is None:
+        ...generate into out_path...
+        asset_cache.store(key, out_path, model=MODEL, prompt=prompt, ...)
+═══════════════════════════════════════════════════════════════
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import threading
+from datetime import datetime
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'output', 'cache')
+OBJECTS_DIR = os.path.join(CACHE_DIR, 'objects')
+INDEX_FILE = os.path.join(CACHE_DIR, 'index.json')
+
+_lock = threading.RLock()
+_index = None
+
+
+def cache_key(model, prompt, aspect_ratio=None, config=None):
+    """Return the hex SHA-256 key for a generation request."""
+    payload = json.dumps(
+        {
+            "model": model,
+            "prompt": prompt,
+            "aspect_ratio": aspect_ratio,
+            "config": config or {},
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def blob_path(key):
+    """Path of the blob stored for `key` (may not exist)."""
+    return os.path.join(OBJECTS_DIR, key[:2], key)
+
+
+def sidecar_path(key):
+    """Path of the JSON metadata stored next to the blob for `key`."""
+    return blob_path(key) + ".json"
+
+
+def _norm(path):
+    return os.path.normpath(os.path.abspath(path))
+
+
+def _load_index():
+    global _index
+    if _index is None:
+        if os.path.exists(INDEX_FILE):
+            with open(INDEX_FILE) as f:
+                _index = json.load(f)
+        else:
+            _index = {}
+    return _index
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _record(dest, key):
+    with _lock:
+        index = _load_index()
+        index[_norm(dest)] = key
+        _write_json(INDEX_FILE, index)
+
+
+def lookup(key):
+    """Return the sidecar metadata for `key` if its blob exists, else None."""
+    if not os.path.exists(blob_path(key)):
+        return None
+    try:
+        with open(sidecar_path(key)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"key": key}
+
+
+def recorded_key(dest):
+    """Return the key `dest` was last produced from, or None."""
+    with _lock:
+        return _load_index().get(_norm(dest))
+
+
+def materialize(key, dest):
+    """Place a copy of the blob for `key` at `dest`.
+
+    Always a copy, never a hard link: some writers save over an existing
+    output in place, which would rewrite the blob stored under the old key.
+    """
+    src = blob_path(key)
+    os.makedirs(os.path.dirname(os.path.abspath(dest)), exist_ok=True)
+    tmp = f"{dest}.{os.getpid()}.{threading.get_ident()}.tmp"
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dest)
+    _record(dest, key)
+
+
+def resolve(keys, dest):
+    """Try to satisfy `dest` from the cache without generating anything.
+
+    `keys` is a key or a list of acceptable keys (e.g. one per model in a
+    fallback chain). Returns:
+      "skipped" — dest already holds the output for one of the keys
+      "cached"  — dest was filled from an existing blob
+      None      — cache miss, the caller must generate
+    Files that predate the cache (no index entry) are adopted under the
+    first key rather than regenerated.
+    """
+    if isinstance(keys, str):
+        keys = [keys]
+
+    if os.path.exists(dest):
+        current = recorded_key(dest)
+        if current in keys:
+            if not os.path.exists(blob_path(current)):
+                store(current, dest)
+            return "skipped"
+        if current is None:
+            store(keys[0], dest, adopted=True)
+            return "skipped"
+
+    for key in keys:
+        if os.path.exists(blob_path(key)):
+            materialize(key, dest)
+            meta = lookup(key) or {}
+            paths = meta.get("paths", [])
+            if _norm(dest) not in paths:
+                meta["paths"] = paths + [_norm(dest)]
+                with _lock:
+                    _write_json(sidecar_path(key), meta)
+            return "cached"
+
+    return None
+
+
+def store(key, src_path, **meta):
+    """Copy a freshly generated file into the cache and index `src_path` under `key`.
+
+    Extra keyword arguments (model, prompt, aspect_ratio, config, ...) are
+    written to the sidecar so a blob can always be traced back to its request.
+    """
+    blob = blob_path(key)
+    os.makedirs(os.path.dirname(blob), exist_ok=True)
+
+    sha = hashlib.sha256()
+    tmp = f"{blob}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(src_path, "rb") as src, open(tmp, "wb") as out:
+        for chunk in iter(lambda: src.read(1024 * 1024), b""):
+            sha.update(chunk)
+            out.write(chunk)
+    os.replace(tmp, blob)
+
+    sidecar = dict(meta)
+    sidecar.update({
+        "key": key,
+        "sha256": sha.hexdigest(),
+        "bytes": os.path.getsize(blob),
+        "ext": os.path.splitext(src_path)[1].lower(),
+        "paths": [_norm(src_path)],
+        "stored_at": datetime.now().isoformat(),
+    })
+    with _lock:
+        _write_json(sidecar_path(key), sidecar)
+    _record(src_path, key)
+    return blob
@@ -0,0 +1,423 @@
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — Generation Backends
+═══════════════════════════════════════════════════════════════
+One interface for every provider the generators talk to:
+
+    backend = backends.get_backend("gemini", model)
+    results = backends.run(backend.generate_image(prompt, aspect_ratio="16:9"))
+    backends.save(results[0], out_path)
+
+    ImagenBackend      google-genai SDK, client.aio.models.generate_images
+                       (generate_images.py)
+    VeoBackend         google-genai SDK, long-running generate_videos;
+                       submit_video/poll_video for generate_videos.py
+    GeminiRestBackend  raw REST generateContent (sector/project images)
+    ReplicateBackend   replicate.async_run (FLUX 2 Pro, Veo 3 Fast) for
+                       the replicate, news, media and hero-video scripts
+    MockBackend        the local stand-in server in mock_server.py
+
+Request options come from the caller's catalogue recipe as
+`config=` on each call, so the backends hold no per-recipe state.
+
+Every backend returns a list of result dicts:
+    {"data": bytes | None, "url": str | None, "mime": str, "model": str}
+and raises BackendError (with HTTP status and Retry-After when
+known) for anything that went wrong, so callers handle errors the
+same way whatever the provider.
+
+SDKs are imported lazily, so using one backend never requires the
+others' packages.
+
+Synchronous generator code (including thread pools) drives every
+coroutine through run(), which submits it to one event loop kept on
+a daemon thread for the life of the process. get_backend() caches
+one backend per (name, model, options), so SDK clients and their
+connection pools are built once and reused on that same loop.
+═══════════════════════════════════════════════════════════════
+"""
+
+import os
+import json
+import base64
+import asyncio
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+import downloader
+import tracing
+
+GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta/models")
+MOCK_SERVER_URL = os.getenv("MOCK_SERVER_URL", "http://127.0.0.1:8765")
+REQUEST_TIMEOUT = 180
+VEO_POLL_INTERVAL = 15
+
+
+class BackendError(RuntimeError):
+    """A provider call failed. `status` is the HTTP status when known,
+    `retry_after` the server's requested back-off in seconds."""
+
+    def __init__(self, message, status=None, retry_after=None, backend=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+        self.backend = backend
+
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+MIME_EXTENSIONS = {"image/png": ".png", "image/jpeg": ".jpg", "image/webp": ".webp", "video/mp4": ".mp4"}
+
+
+def extension(result):
+    """File extension for a result's MIME type, e.g. ".png"."""
+    return MIME_EXTENSIONS.get(result.get("mime"), ".bin")
+
+
+def save(result, dest):
+    """Write one backend result to `dest`; returns downloader metrics."""
+    if result.get("data") is not None:
+        return downloader.write_bytes(result["data"], dest)
+    return downloader.download(result["url"], dest, headers=result.get("headers"))
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _event_loop():
+    """The process-wide backend event loop, started on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="backends-loop", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def run(coro):
+    """Run a backend coroutine from synchronous generator code.
+
+    Safe to call from several threads at once: each call's coroutine is
+    scheduled on the shared loop, so concurrent requests overlap there
+    instead of each spinning up (and tearing down) a loop of its own.
+    """
+    loop = _event_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("backends.run() called from the backend loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+class Backend:
+    """Base class. Subclasses implement generate_image and/or generate_video.
+
+    `config` is the provider's own request options (a catalogue recipe's
+    "config"), passed per call so one cached backend serves every recipe.
+    """
+
+    name = "backend"
+    kind = "image"
+
+    def __init__(self, model):
+        self.model = model
+
+    async def generate_image(self, prompt, aspect_ratio=None, count=1, config=None):
+        raise NotImplementedError(f"{self.name} does not generate images")
+
+    async def generate_video(self, prompt, aspect_ratio="16:9", duration=8, config=None):
+        raise NotImplementedError(f"{self.name} does not generate videos")
+
+    def _result(self, data=None, url=None, mime="image/png", headers=None):
+        return {"data": data, "url": url, "mime": mime, "model": self.model, "headers": headers}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.model!r})"
+
+
+async def _gather_some(calls):
+    """Await independent calls together; keep what succeeded, raise only if all failed."""
+    outcomes = await asyncio.gather(*calls, return_exceptions=True)
+    batches = [o for o in outcomes if not isinstance(o, BaseException)]
+    if not batches:
+        raise outcomes[0]
+    return [r for batch in batches for r in batch]
+
+
+# ─── HTTP helpers ───
+
+def _post_json(url, payload, headers=None, timeout=REQUEST_TIMEOUT, backend=None):
+    req = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json", **(headers or {})},
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        body = e.read().decode("utf-8", "replace")[:200]
+        raise BackendError(f"HTTP {e.code}: {body}", status=e.code,
+                           retry_after=parse_retry_after(e.headers.get("Retry-After")),
+                           backend=backend) from e
+    except (urllib.error.URLError, TimeoutError, OSError) as e:
+        raise BackendError(f"Connection error: {e}", backend=backend) from e
+
+
+def _sdk_error(e, backend):
+    """Translate a google-genai / replicate exception into a BackendError."""
+    status = getattr(e, "code", None) or getattr(e, "status", None)
+    if not isinstance(status, int):
+        status = None
+    response = getattr(e, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    return BackendError(str(e)[:300], status=status,
+                        retry_after=parse_retry_after(headers.get("Retry-After")), backend=backend)
+
+
+# ─── Google AI Studio REST (generateContent) ───
+
+class GeminiRestBackend(Backend):
+    """Gemini image models through the raw REST generateContent endpoint."""
+
+    name = "gemini"
+    generation_config = {"responseModalities": ["IMAGE", "TEXT"]}  # when no config is given
+
+    def __init__(self, model, api_key=None, base_url=None):
+        super().__init__(model)
+        self.api_key = api_key if api_key is not None else os.getenv("GOOGLE_API_KEY", "")
+        self.base_url = (base_url or GEMINI_API_BASE).rstrip("/")
+
+    def _call(self, prompt, config):
+        url = f"{self.base_url}/{self.model}:generateContent?key={urllib.parse.quote(self.api_key)}"
+        payload = {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": config or self.generation_config,
+        }
+        with tracing.span("gemini.generateContent", cat="api", model=self.model):
+            data = _post_json(url, payload, backend=self.name)
+        results = []
+        for part in data.get("candidates", [{}])[0].get("content", {}).get("parts", []):
+            if "inlineData" in part:
+                results.append(self._result(
+                    data=base64.b64decode(part["inlineData"]["data"]),
+                    mime=part["inlineData"].get("mimeType", "image/png"),
+                ))
+        return results
+
+    async def generate_image(self, prompt, aspect_ratio=None, count=1, config=None):
+        # generateContent returns one image per call
+        return await _gather_some([asyncio.to_thread(self._call, prompt, config) for _ in range(count)])
+
+
+# ─── google-genai SDK (Imagen, Veo) ───
+
+class _GenaiBackend(Backend):
+    def __init__(self, model, api_key=None, client=None):
+        super().__init__(model)
+        self.api_key = api_key if api_key is not None else os.getenv("GOOGLE_API_KEY", "")
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            from google import genai
+            self._client = genai.Client(api_key=self.api_key)
+        return self._client
+
+
+class ImagenBackend(_GenaiBackend):
+    """Imagen through google-genai; K images come back from a single request."""
+
+    name = "imagen"
+
+    async def generate_image(self, prompt, aspect_ratio="16:9", count=1, config=None):
+        from google.genai import types
+        config = dict(config or {}, number_of_images=count)
+        try:
+            with tracing.span("imagen.generate_images", cat="api", model=self.model, count=count):
+                response = await self.client.aio.models.generate_images(
+                    model=self.model,
+                    prompt=prompt,
+                    config=types.GenerateImagesConfig(aspect_ratio=aspect_ratio, **config),
+                )
+        except Exception as e:
+            raise _sdk_error(e, self.name) from e
+        mime = config.get("output_mime_type", "image/png")
+        return [self._result(data=img.image.image_bytes, mime=mime)
+                for img in (response.generated_images or []) if img.image]
+
+
+class VeoBackend(_GenaiBackend):
+    """Veo through google-genai: submit, poll the operation, return the video.
+
+    submit_video() and poll_video() expose the two halves, so a caller can
+    persist the operation name and collect the video in a later run.
+    """
+
+    name = "veo"
+    kind = "video"
+
+    async def submit_video(self, prompt, aspect_ratio="16:9", duration=8, config=None):
+        """Start a generation; returns the operation name."""
+        from google.genai import types
+        config = dict({"number_of_videos": 1}, **(config or {}), duration_seconds=duration)
+        try:
+            with tracing.span("veo.submit", cat="api", model=self.model, duration=duration):
+                operation = await self.client.aio.models.generate_videos(
+                    model=self.model,
+                    prompt=prompt,
+                    config=types.GenerateVideosConfig(aspect_ratio=aspect_ratio, **config),
+                )
+        except Exception as e:
+            raise _sdk_error(e, self.name) from e
+        return operation.name
+
+    async def poll_video(self, operation_name):
+        """None while the operation runs, then its results (possibly empty)."""
+        from google.genai import types
+        try:
+            with tracing.span("veo.poll", cat="api", model=self.model) as s:
+                operation = await self.client.aio.operations.get(
+                    types.GenerateVideosOperation(name=operation_name))
+                s.set(done=bool(operation.done))
+        except Exception as e:
+            raise _sdk_error(e, self.name) from e
+        if not operation.done:
+            return None
+        resp = getattr(operation, "result", None) or getattr(operation, "response", None)
+        results = []
+        for generated in getattr(resp, "generated_videos", None) or []:
+            vid = generated.video
+            if getattr(vid, "video_bytes", None):
+                results.append(self._result(data=vid.video_bytes, mime="video/mp4"))
+            elif getattr(vid, "uri", None):
+                # The URI needs the API key; downloader drops it on cross-host redirects
+                results.append(self._result(url=vid.uri, mime="video/mp4",
+                                            headers={"x-goog-api-key": self.api_key}))
+        return results
+
+    async def generate_video(self, prompt, aspect_ratio="16:9", duration=8, config=None):
+        name = await self.submit_video(prompt, aspect_ratio, duration, config)
+        while True:
+            results = await self.poll_video(name)
+            if results is not None:
+                return results
+            await asyncio.sleep(VEO_POLL_INTERVAL)
+
+
+# ─── Replicate ───
+
+class ReplicateBackend(Backend):
+    """Replicate models (FLUX 2 Pro images, Veo 3 Fast video) via replicate.async_run."""
+
+    name = "replicate"
+
+    def __init__(self, model, options=None):
+        super().__init__(model)
+        self.options = dict(options or {})
+
+    async def _run(self, inputs):
+        import replicate
+        try:
+            with tracing.span("replicate.run", cat="api", model=self.model):
+                output = await replicate.async_run(self.model, input=inputs)
+        except Exception as e:
+            raise _sdk_error(e, self.name) from e
+        outputs = output if isinstance(output, (list, tuple)) else [output]
+        return [o for o in outputs if o]
+
+    def _to_result(self, output, mime):
+        url = getattr(output, "url", None) or (output if isinstance(output, str) else None)
+        if url and str(url).startswith(("http://", "https://")):
+            return self._result(url=str(url), mime=mime)
+        return self._result(data=output.read(), mime=mime)
+
+    async def generate_image(self, prompt, aspect_ratio="16:9", count=1, config=None):
+        # FLUX returns one image per prediction, so K candidates are K concurrent predictions
+        inputs = {"prompt": prompt, "aspect_ratio": aspect_ratio, **self.options, **(config or {})}
+        fmt = str(inputs.get("output_format", "jpg")).replace("jpg", "jpeg")
+        outputs = await _gather_some([self._run(inputs) for _ in range(count)])
+        return [self._to_result(o, f"image/{fmt}") for o in outputs]
+
+    async def generate_video(self, prompt, aspect_ratio="16:9", duration=8, config=None):
+        inputs = {"prompt": prompt, "aspect_ratio": aspect_ratio, "duration": duration,
+                  **self.options, **(config or {})}
+        return [self._to_result(o, "video/mp4") for o in await self._run(inputs)]
+
+
+# ─── Local stand-in ───
+
+class MockBackend(Backend):
+    """Talks to mock_server.py — synthetic outputs, configurable latency and errors."""
+
+    name = "mock"
+
+    def __init__(self, model="mock-model", base_url=None):
+        super().__init__(model)
+        self.base_url = (base_url or MOCK_SERVER_URL).rstrip("/")
+
+    def _call(self, path, payload):
+        with tracing.span(f"mock{path}", cat="api", model=self.model):
+            data = _post_json(f"{self.base_url}{path}", dict(payload, model=self.model), backend=self.name)
+        return [self._result(data=base64.b64decode(item["data"]), mime=item["mime"])
+                for item in data.get("outputs", [])]
+
+    async def generate_image(self, prompt, aspect_ratio="16:9", count=1, config=None):
+        payload = {"prompt": prompt, "aspect_ratio": aspect_ratio, "count": count}
+        return await asyncio.to_thread(self._call, "/v1/images", payload)
+
+    async def generate_video(self, prompt, aspect_ratio="16:9", duration=8, config=None):
+        payload = {"prompt": prompt, "aspect_ratio": aspect_ratio, "duration": duration}
+        return await asyncio.to_thread(self._call, "/v1/videos", payload)
+
+
+BACKENDS = {
+    "gemini": GeminiRestBackend,
+    "imagen": ImagenBackend,
+    "veo": VeoBackend,
+    "replicate": ReplicateBackend,
+    "mock": MockBackend,
+}
+
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def get_backend(name, model, **kwargs):
+    """The backend for `name` and `model`, e.g. get_backend("gemini", "gemini-2.5-flash-image").
+
+    Instances are cached per process, so repeated calls share one client.
+    """
+    try:
+        cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown backend {name!r}; choose from {', '.join(BACKENDS)}") from None
+    key = (name, model, json.dumps(kwargs, sort_keys=True, default=repr))
+    with _instances_lock:
+        if key not in _instances:
+            _instances[key] = cls(model, **kwargs)
+        return _instances[key]
@@ -0,0 +1,250 @@
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — Asset Catalogue
+═══════════════════════════════════════════════════════════════
+Every asset the generators can produce, declared once in
+asset-generator/catalogue/*.json and parsed once per process.
+
+    styles.json        shared style directives (brand, aerial, …)
+    <group>.json       one file per asset group:
+        {"group", "backend", "kind", "output", "category"?,
+         "recipe": {"model", "model_env"?, "fallback"?, "fallback_env"?,
+                    "aspect_ratio"?, "config"},
+         "assets": [{"id", "filename", "style"?, "prompt",
+                     "aspect_ratio"?, "duration"?, "purpose"?}]}
+
+The recipe is the rest of the request the group's generator sends
+(model, default aspect ratio, generation config); *_env names an
+environment variable that overrides the model.
+
+A prompt may be a list of strings (joined with no separator) and
+is prefixed with its style's text, so the resolved prompt is the
+exact string the API receives.
+
+    import catalogue
+    catalogue.group("sectors")                    # tuple of Assets
+    catalogue.get("hero_main_01", group="images")
+    catalogue.select(backend="replicate", kind="video")
+    catalogue.load().by_path["website/public/images/news/aerospace-mro.jpg"]
+    catalogue.recipe("news")["model"]
+
+Assets are immutable and read like the old prompt dicts
+(asset["prompt"], asset.get("aspect_ratio", "16:9")); fields a
+record doesn't set are absent, not None.
+═══════════════════════════════════════════════════════════════
+"""
+
+import os
+import json
+from collections.abc import Mapping
+from functools import lru_cache
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CATALOGUE_DIR = os.path.join(BASE_DIR, '..', 'catalogue')
+# Catalogue "output" roots are relative to the website repo root (asset-generator/ and website/)
+REPO_ROOT = os.path.normpath(os.path.join(BASE_DIR, '..', '..'))
+
+FIELDS = ("id", "group", "backend", "kind", "category", "filename", "path",
+          "style", "prompt", "aspect_ratio", "duration", "purpose")
+
+
+class CatalogueError(ValueError):
+    """A catalogue file is malformed or two assets collide."""
+
+
+class Asset(Mapping):
+    """One catalogue entry: an immutable, dict-readable record."""
+
+    __slots__ = FIELDS
+
+    def __init__(self, **values):
+        for field in FIELDS:
+            object.__setattr__(self, field, values.get(field))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("catalogue assets are immutable")
+
+    def __getitem__(self, key):
+        value = getattr(self, key, None) if key in FIELDS else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        return (f for f in FIELDS if getattr(self, f) is not None)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __hash__(self):
+        return hash((self.group, self.id))
+
+    def __eq__(self, other):
+        if isinstance(other, Asset):
+            return (self.group, self.id) == (other.group, other.id)
+        return Mapping.__eq__(self, other)
+
+    def __repr__(self):
+        return f"Asset({self.group}:{self.id})"
+
+    @property
+    def abspath(self):
+        """Absolute output path under the repo root."""
+        return os.path.join(REPO_ROOT, self.path)
+
+
+def _text(value):
+    return "".join(value) if isinstance(value, list) else (value or "")
+
+
+class Catalogue:
+    """All assets plus the lookup indexes the generators query."""
+
+    def __init__(self, assets, styles, recipes=None):
+        self.assets = tuple(assets)
+        self.styles = styles
+        self.recipes = recipes or {}  # group → raw "recipe" block
+        self.by_key = {}       # (group, id) → Asset
+        self.by_id = {}        # id → (Asset, …)  — ids repeat across backends
+        self.by_group = {}     # group → (Asset, …) in file order
+        self.by_category = {}  # category → (Asset, …)
+        self.by_backend = {}   # backend → (Asset, …)
+        self.by_path = {}      # repo-relative output path → Asset
+
+        indexes = {"by_id": {}, "by_group": {}, "by_category": {}, "by_backend": {}}
+        for asset in self.assets:
+            key = (asset.group, asset.id)
+            if key in self.by_key:
+                raise CatalogueError(f"duplicate asset id {asset.id!r} in group {asset.group!r}")
+            if asset.path in self.by_path:
+                other = self.by_path[asset.path]
+                raise CatalogueError(f"{asset!r} and {other!r} both write {asset.path}")
+            self.by_key[key] = asset
+            self.by_path[asset.path] = asset
+            indexes["by_id"].setdefault(asset.id, []).append(asset)
+            indexes["by_group"].setdefault(asset.group, []).append(asset)
+            indexes["by_category"].setdefault(asset.category, []).append(asset)
+            indexes["by_backend"].setdefault(asset.backend, []).append(asset)
+        for name, index in indexes.items():
+            setattr(self, name, {k: tuple(v) for k, v in index.items()})
+
+    def get(self, asset_id, group=None, backend=None):
+        """The asset with `asset_id` (narrowed by group/backend), or None."""
+        if group is not None:
+            asset = self.by_key.get((group, asset_id))
+            return asset if asset is not None and backend in (None, asset.backend) else None
+        matches = [a for a in self.by_id.get(asset_id, ()) if backend in (None, a.backend)]
+        if len(matches) > 1:
+            groups = ", ".join(a.group for a in matches)
+            raise CatalogueError(f"{asset_id!r} is in several groups ({groups}); pass group=")
+        return matches[0] if matches else None
+
+    def select(self, group=None, category=None, backend=None, kind=None):
+        """Assets matching every given filter, in catalogue order."""
+        if group is not None:
+            pool = self.by_group.get(group, ())
+        elif category is not None:
+            pool = self.by_category.get(category, ())
+        elif backend is not None:
+            pool = self.by_backend.get(backend, ())
+        else:
+            pool = self.assets
+        return tuple(
+            a for a in pool
+            if category in (None, a.category) and backend in (None, a.backend) and kind in (None, a.kind)
+        )
+
+    def categories(self, group):
+        """Category names of a group, in first-seen order."""
+        return list(dict.fromkeys(a.category for a in self.by_group.get(group, ())))
+
+    def find_path(self, path):
+        """The asset that writes `path` (repo-relative or absolute), or None."""
+        if os.path.isabs(path):
+            path = os.path.relpath(os.path.normpath(path), REPO_ROOT)
+        return self.by_path.get(os.path.normpath(path))
+
+
+def _load_group(path, styles, recipes):
+    with open(path) as f:
+        doc = json.load(f)
+    try:
+        group, backend, kind, output = doc["group"], doc["backend"], doc["kind"], doc["output"]
+    except KeyError as e:
+        raise CatalogueError(f"{os.path.basename(path)}: missing {e.args[0]!r}") from None
+    if "recipe" in doc:
+        recipes[group] = doc["recipe"]
+
+    assets = []
+    for entry in doc.get("assets", []):
+        style = entry.get("style")
+        if style is not None and style not in styles:
+            raise CatalogueError(f"{group}:{entry.get('id')}: unknown style {style!r}")
+        assets.append(Asset(
+            id=entry["id"],
+            group=group,
+            backend=entry.get("backend", backend),
+            kind=kind,
+            category=entry.get("category", doc.get("category", group)),
+            filename=entry["filename"],
+            path=os.path.normpath(os.path.join(output, entry["filename"])),
+            style=style,
+            prompt=(styles[style] if style else "") + _text(entry["prompt"]),
+            aspect_ratio=entry.get("aspect_ratio"),
+            duration=entry.get("duration"),
+            purpose=entry.get("purpose"),
+        ))
+    return assets
+
+
+@lru_cache(maxsize=None)
+def load(directory=CATALOGUE_DIR):
+    """Parse every catalogue file in `directory` once; later calls return the same Catalogue."""
+    with open(os.path.join(directory, "styles.json")) as f:
+        styles = {name: _text(text) for name, text in json.load(f).items()}
+    assets, recipes = [], {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".json") and name != "styles.json":
+            assets.extend(_load_group(os.path.join(directory, name), styles, recipes))
+    return Catalogue(assets, styles, recipes)
+
+
+def group(name):
+    """Every asset in a group, in file order."""
+    return load().by_group.get(name, ())
+
+
+def get(asset_id, group=None, backend=None):
+    return load().get(asset_id, group=group, backend=backend)
+
+
+def select(group=None, category=None, backend=None, kind=None):
+    return load().select(group=group, category=category, backend=backend, kind=kind)
+
+
+def style(name):
+    """A shared style directive's text."""
+    return load().styles[name]
+
+
+def recipe(name):
+    """A group's generation recipe with environment overrides applied.
+
+    Returns {"model", "models", "aspect_ratio", "config"}; "models" is the
+    model followed by its fallback, if any. Read at call time so a .env
+    loaded after import still counts. `config` is a fresh copy.
+    """
+    raw = load().recipes.get(name)
+    if raw is None:
+        raise CatalogueError(f"group {name!r} has no recipe")
+    model = os.getenv(raw["model_env"], raw["model"]) if raw.get("model_env") else raw["model"]
+    models = [model]
+    if raw.get("fallback"):
+        fallback = os.getenv(raw["fallback_env"], raw["fallback"]) if raw.get("fallback_env") else raw["fallback"]
+        models.append(fallback)
+    return {
+        "model": model,
+        "models": models,
+        "aspect_ratio": raw.get("aspect_ratio"),
+        "config": json.loads(json.dumps(raw.get("config", {}))),
+    }
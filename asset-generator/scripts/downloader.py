@@ -0,0 +1,385 @@
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — Streaming, Resumable Downloader
+═══════════════════════════════════════════════════════════════
+One download path for every generator (Replicate outputs, Veo
+URIs). Replaces the per-script `urllib.request.urlretrieve` calls.
+
+  - keep-alive connections pooled per host and reused
+  - chunked streaming into `<dest>.part`, atomic rename on success,
+    so a dropped connection never leaves a truncated file at `dest`
+  - Range-based resume of an existing `.part` file, only for the same
+    URL and only while the server's ETag/Last-Modified still match
+    (`If-Range`; the `.part.json` sidecar remembers both)
+  - size (Content-Length) and optional SHA-256 verification
+  - bounded parallelism for batches, with throughput metrics
+═══════════════════════════════════════════════════════════════
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+import http.client
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import tracing
+
+CHUNK_SIZE = 1024 * 1024
+TIMEOUT = 120
+RETRIES = 3
+MAX_REDIRECTS = 5
+MAX_PARALLEL = int(os.getenv("DOWNLOAD_WORKERS", "4"))
+USER_AGENT = "manah-asset-generator/1.0"
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+# If-Range travels with Range: without it a changed file's tail would be appended to the old partial
+FORWARDED_HEADERS = ("User-Agent", "Accept-Encoding", "Range", "If-Range")
+
+
+class DownloadError(RuntimeError):
+    """Raised when a download cannot be completed after all retries."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class ConnectionPool:
+    """Idle keep-alive HTTP(S) connections, keyed by (scheme, host, port)."""
+
+    def __init__(self, max_idle_per_host=MAX_PARALLEL):
+        self.max_idle_per_host = max_idle_per_host
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return (connection, reused) for `key`, reusing an idle one if possible."""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return _new_connection(key), False
+
+    def put(self, key, conn):
+        """Return a connection whose response has been fully read."""
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            for conns in self._idle.values():
+                for conn in conns:
+                    conn.close()
+            self._idle.clear()
+
+
+_pool = ConnectionPool()
+
+
+def _new_connection(key):
+    scheme, host, port = key
+    cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+    return cls(host, port, timeout=TIMEOUT)
+
+
+def _split(url):
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        raise DownloadError(f"Unsupported URL scheme: {url[:60]}")
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    return (parts.scheme, parts.hostname, port), path
+
+
+def _open(url, headers):
+    """Send a GET, following redirects. Returns (response, connection, pool key)."""
+    for _ in range(MAX_REDIRECTS + 1):
+        key, path = _split(url)
+        conn, reused = _pool.get(key)
+        try:
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            if not reused:
+                raise
+            # The server dropped an idle keep-alive connection; retry on a fresh one
+            conn = _new_connection(key)
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+
+        if resp.status in REDIRECT_CODES:
+            location = resp.getheader("Location")
+            resp.read()
+            _release(key, conn, resp)
+            if not location:
+                raise DownloadError(f"HTTP {resp.status} without Location header")
+            target = urllib.parse.urljoin(url, location)
+            if _split(target)[0] != key:
+                # Never forward credentials (e.g. x-goog-api-key) to another host
+                headers = {k: v for k, v in headers.items() if k in FORWARDED_HEADERS}
+            url = target
+            continue
+        return resp, conn, key
+    raise DownloadError(f"Too many redirects for {url[:80]}")
+
+
+def _release(key, conn, resp):
+    if resp.will_close:
+        conn.close()
+    else:
+        _pool.put(key, conn)
+
+
+def _sha256(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _meta_path(part):
+    return part + ".json"
+
+
+def _read_meta(part):
+    """URL and validators recorded for a partial download, or None."""
+    try:
+        with open(_meta_path(part)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(part, url, resp):
+    length = resp.getheader("Content-Length")
+    with open(_meta_path(part), "w") as f:
+        json.dump({"url": url, "etag": resp.getheader("ETag"),
+                   "last_modified": resp.getheader("Last-Modified"),
+                   "length": int(length) if length and length.isdigit() else None}, f)
+
+
+def _range_total(content_range):
+    """Complete length from a Content-Range header ("bytes 0-99/1234"), or None."""
+    total = content_range.rpartition("/")[2]
+    return int(total) if total.isdigit() else None
+
+
+def _discard(part):
+    """Remove a partial download and its sidecar."""
+    for path in (part, _meta_path(part)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _validator(meta):
+    """The If-Range value for a partial: a strong ETag, else Last-Modified, else None."""
+    etag = meta.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return meta.get("last_modified")
+
+
+def download(url, dest, headers=None, expected_sha256=None, retries=RETRIES):
+    """Stream `url` to `dest`, resuming a previous partial download if present.
+
+    Returns metrics: {"url", "path", "bytes", "seconds", "mb_per_s", "resumed_from"}.
+    Raises DownloadError if the file cannot be fetched and verified.
+    """
+    with tracing.span("download", host=urllib.parse.urlsplit(url).hostname, dest=dest) as s:
+        metrics = _download(url, dest, headers, expected_sha256, retries)
+        s.set(bytes=metrics["bytes"], mb_per_s=metrics["mb_per_s"], resumed_from=metrics["resumed_from"])
+    return metrics
+
+
+def _download(url, dest, headers, expected_sha256, retries):
+    os.makedirs(os.path.dirname(os.path.abspath(dest)), exist_ok=True)
+    part = dest + ".part"
+    base_headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "identity"}
+    base_headers.update(headers or {})
+
+    start = time.time()
+    resumed_from = 0
+    last_error = None
+    completed = False
+
+    for attempt in range(retries):
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        req_headers = dict(base_headers)
+        meta = _read_meta(part) if offset else None
+        if offset:
+            validator = _validator(meta) if meta and meta.get("url") == url else None
+            if validator:
+                # If-Range: the server sends the whole (new) file instead of a tail that doesn't match
+                req_headers["Range"] = f"bytes={offset}-"
+                req_headers["If-Range"] = validator
+            else:
+                # Left by another URL, or nothing to prove it is the same file — start over
+                _discard(part)
+                offset = 0
+
+        conn = key = None
+        try:
+            resp, conn, key = _open(url, req_headers)
+
+            if resp.status == 416 and offset:
+                # Nothing left to fetch, or the server rejects our offset — start over
+                resp.read()
+                _release(key, conn, resp)
+                if expected_sha256 and _sha256(part) == expected_sha256:
+                    completed = True
+                    break
+                _discard(part)
+                continue
+            if resp.status == 206:
+                content_range = resp.getheader("Content-Range", "")
+                known = (meta or {}).get("length")
+                total = _range_total(content_range)
+                if not content_range.startswith(f"bytes {offset}-") or (known and total != known):
+                    # Resumed from somewhere else, or a tail of a file of another size; refetch
+                    conn.close()
+                    _discard(part)
+                    raise DownloadError(f"Unexpected Content-Range: {content_range}")
+                mode = "ab"
+                resumed_from = offset
+            elif resp.status == 200:
+                # A full body: the file changed (If-Range) or the server ignores Range
+                mode, offset, resumed_from = "wb", 0, 0
+                _write_meta(part, url, resp)
+            else:
+                body = resp.read(300).decode("utf-8", "replace")
+                conn.close()
+                raise DownloadError(f"HTTP {resp.status}: {body}", status=resp.status)
+
+            length = resp.getheader("Content-Length")
+            expected = int(length) if length is not None else None
+
+            received = 0
+            with open(part, mode) as f:
+                while True:
+                    # read1() returns whatever has arrived, so bytes received
+                    # before a dropped connection are on disk for the resume
+                    chunk = resp.read1(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    received += len(chunk)
+
+            if expected is not None and received != expected:
+                conn.close()
+                raise http.client.IncompleteRead(b"", expected - received)
+            _release(key, conn, resp)
+            completed = True
+            break
+
+        except DownloadError as e:
+            last_error = e
+            # Client errors other than timeouts/throttling will not fix themselves
+            if e.status and 400 <= e.status < 500 and e.status not in (408, 429):
+                break
+        except (OSError, http.client.HTTPException) as e:
+            last_error = e
+            if conn is not None:
+                conn.close()
+        if attempt < retries - 1:
+            time.sleep(2 ** attempt)
+
+    if not completed:
+        raise DownloadError(f"Download failed after {attempt + 1} attempt(s): {last_error}",
+                            status=getattr(last_error, "status", None))
+
+    if expected_sha256 and _sha256(part) != expected_sha256:
+        _discard(part)
+        raise DownloadError(f"SHA-256 mismatch for {url[:80]}")
+
+    os.replace(part, dest)
+    _discard(part)  # the sidecar
+    size = os.path.getsize(dest)
+    seconds = max(time.time() - start, 1e-6)
+    return {
+        "url": url,
+        "path": dest,
+        "bytes": size,
+        "seconds": round(seconds, 3),
+        "mb_per_s": round((size - resumed_from) / seconds / (1024 * 1024), 2),
+        "resumed_from": resumed_from,
+    }
+
+
+def write_bytes(data, dest):
+    """Atomically write in-memory bytes (e.g. Veo video_bytes) to `dest`."""
+    os.makedirs(os.path.dirname(os.path.abspath(dest)), exist_ok=True)
+    start = time.time()
+    part = dest + ".part"
+    with tracing.span("write", dest=dest, bytes=len(data)):
+        with open(part, "wb") as f:
+            f.write(data)
+        os.replace(part, dest)
+    return {"url": None, "path": dest, "bytes": len(data),
+            "seconds": round(time.time() - start, 3), "mb_per_s": None, "resumed_from": 0}
+
+
+def save_output(output, dest):
+    """Save a Replicate `run()` output — FileOutput, URL string, or a list of either."""
+    if isinstance(output, (list, tuple)):
+        if not output:
+            raise DownloadError("Empty output list")
+        output = output[0]
+
+    url = getattr(output, "url", None)
+    if url is None and isinstance(output, str):
+        url = output
+    if url and str(url).startswith(("http://", "https://")):
+        return download(str(url), dest)
+    if hasattr(output, "read"):
+        return write_bytes(output.read(), dest)
+    return download(str(output), dest)
+
+
+def download_many(jobs, max_workers=MAX_PARALLEL):
+    """Download several files with bounded parallelism.
+
+    Each job: {"url": ..., "dest": ..., "headers": {...}, "expected_sha256": ...}
+    Returns one result per job in input order; failures carry an "error" key.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+
+    def run(job):
+        try:
+            return download(job["url"], job["dest"], job.get("headers"), job.get("expected_sha256"))
+        except DownloadError as e:
+            return {"url": job["url"], "path": job["dest"], "error": str(e)}
+
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as pool:
+        results = list(pool.map(run, jobs))
+
+    wall = max(time.time() - start, 1e-6)
+    total = sum(r.get("bytes", 0) for r in results)
+    failed = sum(1 for r in results if "error" in r)
+    print(f"  Downloaded {len(jobs) - failed}/{len(jobs)} file(s), "
+          f"{total / (1024 * 1024):.1f} MB in {wall:.1f}s ({total / wall / (1024 * 1024):.1f} MB/s)")
+    return results
+
+
+def describe(metrics):
+    """Short human-readable summary of one download's metrics."""
+    size = metrics["bytes"]
+    text = f"{size / (1024 * 1024):.1f} MB" if size >= 1024 * 1024 else f"{size / 1024:.0f} KB"
+    if metrics.get("mb_per_s"):
+        text += f" @ {metrics['mb_per_s']:.1f} MB/s"
+    if metrics.get("resumed_from"):
+        text += f", resumed from {metrics['resumed_from'] / 1024:.0f} KB"
+    return text
@@ -3,8 +3,16 @@
 ═══════════════════════════════════════════════════════════════
 MANAH GROUP — Master Asset Generation Orchestrator
 ═══════════════════════════════════════════════════════════════
-Generates all images and submits all video generation requests
-for the Manah Group website in the optimal order.
+Generates every image and video for the Manah Group website in
+one process. Each asset becomes a chain of tasks
+(generate → download → optimise → publish) in a task graph, run
+with per-backend concurrency limits so Veo submissions, Imagen
+calls, Replicate calls and local optimisation overlap.
+
+Replicate-side lists are included when REPLICATE_API_TOKEN is set,
+Gemini sector/project images when GOOGLE_API_KEY is set. Generator
+scripts (and their SDKs) are imported by the first task that needs
+them; manah_assets.py drives the same graph per asset and per stage.
 
 Usage:
     python scripts/generate_all.py            # Generate everything
@@ -12,67 +20,141 @@ Usage:
     python scripts/generate_all.py --videos   # Videos only
     python scripts/generate_all.py --dry-run  # Preview all prompts
     python scripts/generate_all.py --status   # Check generation status
+    python scripts/generate_all.py --status --backend replicate --missing-renditions
+    python scripts/generate_all.py --status --stale   # Prompt edited since generation
+    python scripts/generate_all.py --no-publish    # Generate only, no website copy
+    python scripts/generate_all.py --no-replicate  # Google assets only
 ═══════════════════════════════════════════════════════════════
 """
 
 import os
 import sys
 import json
+import time
 import argparse
-import subprocess
-from pathlib import Path
+import importlib
+import threading
+from functools import partial
 from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from prompts import get_summary, get_all_image_prompts, get_all_video_prompts
+from prompts import get_summary
+import catalogue
+from orchestrator import TaskGraph
+import ratelimit
+import image_pipeline
+import dedupe
+import transcode
+import streaming
+import posters
+import manifest
+import provenance
+import responsive
+import video_sources
+import tracing
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_DIR = os.path.join(BASE_DIR, '..', 'output')
+# Same destination as `./run.sh copy`
+WEBSITE_IMAGES_DIR = os.path.join(BASE_DIR, '..', '..', 'website', 'public', 'images')
+WEBSITE_VIDEOS_DIR = os.path.join(BASE_DIR, '..', '..', 'website', 'public', 'videos')
+
+
+def _flags(row, current_hashes):
+    flags = []
+    current = current_hashes.get((row["backend"], row["id"]))
+    if current and row["prompt_hash"] and current != row["prompt_hash"]:
+        flags.append("stale")
+    if not row["renditions"] or not all(r["present"] for r in row["renditions"]):
+        flags.append("missing-renditions")
+    return flags
+
+
+def index_existing(assets=None):
+    """Add catalogue outputs that exist on disk but not in the manifest; returns how many."""
+    indexed = manifest.keys()
+    added = 0
+    for asset in catalogue.load().assets if assets is None else assets:
+        path = asset.abspath
+        if (asset.backend, asset.id) not in indexed and os.path.exists(path):
+            manifest.record_asset(asset.id, path, asset.backend, prompt=asset.prompt,
+                                  category=asset.category, status="indexed")
+            added += 1
+    return added
+
+
+def reindex():
+    """Index outputs that already exist on disk but predate the manifest or provenance records."""
+    added = index_existing()
+    print(f"  Indexed {added} existing file(s) into {os.path.normpath(manifest.MANIFEST_PATH)}")
+    missing = manifest.check_renditions()
+    print(f"  Re-checked web renditions on disk: {missing} missing")
 
+    # Files generated before provenance was recorded count as produced by the current recipe
+    adopted = provenance.adopt(provenance.plan()["untracked"])
+    print(f"  Recorded provenance for {adopted} untracked file(s)")
 
-def check_status():
-    """Check the current status of all generated assets."""
-    img_dir = os.path.join(OUTPUT_DIR, 'images')
-    vid_dir = os.path.join(OUTPUT_DIR, 'videos')
 
-    all_images = get_all_image_prompts()
-    all_videos = get_all_video_prompts()
+def check_status(category=None, backend=None, stale=False, missing_renditions=False):
+    """Report asset status from the manifest index, with optional filters.
+
+    Nothing is stat()ed here: files the manifest has not seen yet (generated
+    before it existed, or copied in from another checkout) and renditions
+    deleted since they were written are picked up by reindex().
+    """
+    everything = catalogue.load().assets
+    indexed = manifest.keys()
+    rows = manifest.assets(category=category, backend=backend)
+
+    # Stale = prompt edited in the catalogue since the asset was generated
+    current_hashes = {(a.backend, a.id): manifest.prompt_hash(a.prompt) for a in everything}
+
+    for row in rows:
+        row["flags"] = _flags(row, current_hashes)
+    if stale:
+        rows = [r for r in rows if "stale" in r["flags"]]
+    if missing_renditions:
+        rows = [r for r in rows if "missing-renditions" in r["flags"]]
 
     print("\n" + "=" * 60)
     print("  MANAH GROUP — Asset Generation Status")
     print("=" * 60)
 
-    # Check images
-    img_done = 0
-    img_missing = []
-    for p in all_images:
-        filepath = os.path.join(img_dir, p["filename"])
-        if os.path.exists(filepath):
-            img_done += 1
-        else:
-            img_missing.append(p)
-
-    print(f"\n  📸 Images: {img_done}/{len(all_images)} generated")
-    if img_missing:
-        print(f"     Missing:")
-        for p in img_missing:
-            print(f"       - {p['id']} ({p['purpose']})")
-
-    # Check videos
-    vid_done = 0
-    vid_missing = []
-    for p in all_videos:
-        filepath = os.path.join(vid_dir, p["filename"])
-        if os.path.exists(filepath):
-            vid_done += 1
-        else:
-            vid_missing.append(p)
-
-    print(f"\n  🎬 Videos: {vid_done}/{len(all_videos)} generated")
-    if vid_missing:
-        print(f"     Missing:")
-        for p in vid_missing:
-            print(f"       - {p['id']} ({p['purpose']})")
+    by_backend = manifest.counts_by("backend")
+    print(f"\n  📇 Indexed assets: {sum(by_backend.values())}")
+    for name, count in by_backend.items():
+        print(f"       {name or '?':>10}: {count}")
+
+    for group, assets in catalogue.load().by_group.items():
+        assets = [a for a in assets if backend in (None, a.backend) and category in (None, a.category)]
+        if not assets:
+            continue
+        missing = [a for a in assets if (a.backend, a.id) not in indexed]
+        icon = "🎬" if assets[0].kind == "video" else "📸"
+        print(f"\n  {icon} {group}: {len(assets) - len(missing)}/{len(assets)} generated")
+        if missing:
+            print(f"     Missing:")
+            for a in missing:
+                print(f"       - {a.id} ({a.purpose or a.path})")
+    if any((a.backend, a.id) not in indexed for a in everything):
+        print("\n  ℹ️  Missing is read from the manifest; --reindex picks up files generated before it")
+
+    filters = [f for f, on in (("stale", stale), ("missing renditions", missing_renditions)) if on]
+    if category or backend or filters:
+        title = ", ".join([v for v in (category, backend) if v] + filters)
+        print(f"\n  🔎 {title}: {len(rows)} asset(s)")
+        for r in rows:
+            size = f"{r['width']}x{r['height']}" if r["width"] else "-"
+            flags = f"  [{', '.join(r['flags'])}]" if r["flags"] else ""
+            print(f"       - {r['id']:32s} {r['backend'] or '?':>9} {size:>10} "
+                  f"{(r['bytes'] or 0) / 1024:>7.0f} KB  {len(r['renditions'])} rendition(s){flags}")
+    else:
+        n_stale = sum(1 for r in rows if "stale" in r["flags"])
+        n_missing = sum(1 for r in rows if "missing-renditions" in r["flags"])
+        if n_stale:
+            print(f"\n  ⚠️  {n_stale} stale asset(s) — prompt changed since generation (--stale)")
+        if n_missing:
+            print(f"  ⚠️  {n_missing} asset(s) without web renditions (--missing-renditions)")
 
     # Check pending operations
     ops_file = os.path.join(OUTPUT_DIR, 'pending_video_operations.json')
@@ -84,59 +166,442 @@ def check_status():
             for vid_id, data in pending.items():
                 print(f"       - {vid_id} (submitted: {data.get('submitted_at', 'unknown')})")
 
-    # Check logs
-    img_log = os.path.join(OUTPUT_DIR, 'image_generation_log.json')
-    if os.path.exists(img_log):
-        with open(img_log) as f:
-            log = json.load(f)
-        errors = log.get("errors", 0)
-        if errors > 0:
-            print(f"\n  ⚠️  Last image run had {errors} error(s)")
-
-    total = len(all_images) + len(all_videos)
-    done = img_done + vid_done
-    print(f"\n  Overall: {done}/{total} assets ready ({done/total*100:.0f}%)")
-    print("=" * 60 + "\n")
+    print("\n" + "=" * 60 + "\n")
+
+
+# ─── Task Graph ───
+
+PRIORITY_ORDER = ["hero", "divisions", "sectors", "about", "sustainability", "careers", "partners", "ui-elements"]
+
+# Max concurrent tasks per backend. API calls inside those tasks also go
+# through ratelimit's adaptive limiters, which settle below these ceilings.
+BACKEND_LIMITS = {
+    "imagen": ratelimit.max_concurrency("imagen"),
+    "veo": ratelimit.max_concurrency("veo"),
+    "veo-poll": 8,
+    "replicate": ratelimit.max_concurrency("replicate"),
+    "gemini": ratelimit.max_concurrency("gemini"),
+    "cpu": os.cpu_count() or 1,
+    "ffmpeg": max(1, (os.cpu_count() or 1) // (int(os.getenv("TRANSCODE_THREADS", "4")) * 2)),
+    "io": 4,
+}
+
+VEO_POLL_INTERVAL = 20  # first wait between status checks, doubles up to 120s
+STAGES = ("generate", "optimise", "publish")
+WEB_SIZES = {"sm": 640, "md": 1024, "lg": 1920}  # Replicate-side images skip the xl rendition
+
+_shared = {}
+_shared_lock = threading.RLock()
+
+
+def _get_shared(name, factory):
+    """Create a shared client/limiter once per run, on first use."""
+    with _shared_lock:
+        if name not in _shared:
+            _shared[name] = factory()
+        return _shared[name]
+
+
+def _check_google_key():
+    # Imagen and Veo go through backends.get_backend(), which shares one client per model
+    import generate_images
+    _get_shared("google-key", generate_images.check_api_key)
+
+
+def _ok(result):
+    """Raise if a generator reported failure, so downstream tasks are skipped."""
+    if result is None or result.get("status") in ("error", "empty"):
+        raise RuntimeError((result or {}).get("error") or "no output returned")
+    return result
+
+
+def _publish(src, dest):
+    if src.lower().endswith(dedupe.IMAGE_EXTENSIONS):
+        dedupe.guard(src)  # warns, or fails the task with DUPE_ACTION=block
+    image_pipeline.copy_original(src, dest)
+    return dest
+
+
+def _transcode(src, out_dir, base):
+    budget = _get_shared("ffmpeg", transcode.ThreadBudget)
+    job = {
+        "label": base,
+        "src": src,
+        "outputs": [(r, transcode.rendition_path(out_dir, base, r)) for r in transcode.web_renditions()],
+    }
+    result = transcode.run_job(job, budget)
+    if result["status"] != "success":
+        raise RuntimeError(result["error"][:200])
+    return result
+
+
+def _package(src, base):
+    budget = _get_shared("ffmpeg", transcode.ThreadBudget)
+    result = streaming.package(src, streaming.stream_dir(WEBSITE_VIDEOS_DIR, base), label=base, budget=budget)
+    if result["status"] != "success":
+        raise RuntimeError(result["error"][:200])
+    return result
+
+
+def _poster(src, out_dir, base):
+    # Poster renditions + animated preview; the run's manifest export picks them up.
+    # Runs after the transcode task, which replaces the source's rendition rows.
+    return posters.make_posters(src, out_dir, base)
+
+
+def _generator(name):
+    """Import a generator script on first use.
+
+    The scripts exit at import time when their SDK or API key is missing;
+    that becomes an ordinary task failure instead of ending the run.
+    """
+    try:
+        return importlib.import_module(name)
+    except SystemExit:
+        raise RuntimeError(f"{name} could not start (missing SDK or API key)") from None
+
+
+def _add(graph, stages, stage, task_id, fn, deps=(), **kwargs):
+    """Add one stage's task if that stage was asked for.
+
+    Dependencies on stages left out of this run are dropped, so
+    `optimise` alone works on whatever is already on disk.
+    """
+    if stage not in stages:
+        return
+    graph.add(task_id, fn, deps=[d for d in deps if d in graph.tasks], **kwargs)
+
+
+def _exists(path):
+    if not os.path.exists(path):
+        raise RuntimeError(f"not generated yet: {os.path.relpath(path)}")
+    return path
+
+
+def _web_image(graph, stages, tid, src, dest_dir, filename, priority, sizes=None):
+    """optimise → publish for one generated image."""
+    base = os.path.splitext(filename)[0]
+    _add(graph, stages, "optimise", f"optimise:{tid}",
+         lambda _: image_pipeline.optimize_image(_exists(src), os.path.join(dest_dir, base), sizes=sizes),
+         deps=[f"generate:{tid}"], backend="cpu", priority=priority)
+    _add(graph, stages, "publish", f"publish:{tid}",
+         lambda _: _publish(_exists(src), os.path.join(dest_dir, filename)),
+         deps=[f"optimise:{tid}", f"generate:{tid}"], backend="io", priority=priority)
+
+
+# Imagen (Google GenAI)
+
+def _imagen_generate(prompt_data, _inputs):
+    generate_images = _generator("generate_images")
+    _check_google_key()
+    return _ok(generate_images.generate_single_image(prompt_data, generate_images.OUTPUT_DIR))
+
+
+def add_imagen_image(graph, asset, priority, stages=STAGES):
+    """generate → optimise → publish for one catalogue image (group "images")."""
+    _add(graph, stages, "generate", f"generate:{asset.id}", partial(_imagen_generate, asset),
+         backend="imagen", priority=priority)
+    _web_image(graph, stages, asset.id, asset.abspath, WEBSITE_IMAGES_DIR, asset.filename, priority)
+
 
+# Veo (Google GenAI, long-running operations)
 
-def run_generation(images_only=False, videos_only=False, dry_run=False):
-    """Run the complete generation pipeline."""
-    get_summary()
+def _veo_pending():
+    generate_videos = _generator("generate_videos")
+    return _get_shared("veo-pending", generate_videos.load_pending_operations)
 
-    scripts_dir = os.path.dirname(os.path.abspath(__file__))
-    flag = "--dry-run" if dry_run else ""
 
-    if not videos_only:
-        print("\n" + "=" * 60)
-        print("  PHASE 1: Image Generation")
-        print("=" * 60 + "\n")
+def _veo_save():
+    generate_videos = _generator("generate_videos")
+    pending = _veo_pending()
+    with generate_videos.PENDING_LOCK:
+        snapshot = dict(pending)
+    with _shared_lock:
+        generate_videos.save_pending_operations(snapshot)
 
-        # Generate images in priority order
-        priority_order = ["hero", "divisions", "sectors", "about", "sustainability", "careers", "partners", "ui-elements"]
-        for category in priority_order:
-            print(f"\n  ─── Category: {category.upper()} ───")
-            cmd = f"python {os.path.join(scripts_dir, 'generate_images.py')} --category {category} {flag}".strip()
-            subprocess.run(cmd, shell=True)
 
-    if not images_only:
-        print("\n" + "=" * 60)
-        print("  PHASE 2: Video Generation (Async)")
-        print("=" * 60 + "\n")
+def _veo_submit(prompt_data, _inputs):
+    generate_videos = _generator("generate_videos")
+    pending = _veo_pending()
+    _check_google_key()
+    result = _ok(generate_videos.submit_video_generation(prompt_data, generate_videos.OUTPUT_DIR, pending))
+    if result["status"] == "submitted":
+        _veo_save()
+    return result
 
-        cmd = f"python {os.path.join(scripts_dir, 'generate_videos.py')} {flag}".strip()
-        subprocess.run(cmd, shell=True)
 
-    if not dry_run:
-        print("\n" + "=" * 60)
-        print("  GENERATION PIPELINE COMPLETE")
-        print("=" * 60)
-        print("\n  📸 Images are saved to: output/images/")
-        print("  🎬 Videos are processing asynchronously.")
-        print("     Check video status with:")
-        print("     python scripts/generate_videos.py --poll")
-        print("     or")
-        print("     python scripts/generate_all.py --status")
-        print("=" * 60 + "\n")
+def _veo_download(prompt_data, _inputs):
+    """Block until the Veo operation finishes and the file is downloaded."""
+    generate_videos = _generator("generate_videos")
+    pending = _veo_pending()
+    vid = prompt_data["id"]
+    filepath = os.path.join(generate_videos.OUTPUT_DIR, prompt_data["filename"])
+
+    interval = VEO_POLL_INTERVAL
+    while True:
+        with generate_videos.PENDING_LOCK:
+            op_data = pending.get(vid)
+        if op_data is None:
+            break
+        time.sleep(interval)
+        if generate_videos.poll_operation(vid, op_data) == "done":
+            with generate_videos.PENDING_LOCK:
+                pending.pop(vid, None)
+            _veo_save()
+            break
+        interval = min(interval * 2, generate_videos.POLL_MAX_INTERVAL)
+
+    if not os.path.exists(filepath):
+        raise RuntimeError(f"operation finished without a video for {vid}")
+    return filepath
+
+
+def add_veo_video(graph, asset, priority, stages=STAGES):
+    """submit → download → optimise → publish for one catalogue video (group "videos")."""
+    src = asset.abspath
+    base = os.path.splitext(asset.filename)[0]
+
+    _add(graph, stages, "generate", f"submit:{asset.id}", partial(_veo_submit, asset),
+         backend="veo", priority=priority)
+    _add(graph, stages, "generate", f"download:{asset.id}", partial(_veo_download, asset),
+         deps=[f"submit:{asset.id}"], backend="veo-poll", priority=priority)
+    _add(graph, stages, "optimise", f"optimise:{asset.id}", lambda _: _transcode(_exists(src), WEBSITE_VIDEOS_DIR, base),
+         deps=[f"download:{asset.id}"], backend="ffmpeg", priority=priority)
+    _add(graph, stages, "optimise", f"poster:{asset.id}", lambda _: _poster(_exists(src), WEBSITE_VIDEOS_DIR, base),
+         deps=[f"optimise:{asset.id}", f"download:{asset.id}"], backend="cpu", priority=priority)
+    _add(graph, stages, "publish", f"publish:{asset.id}",
+         lambda _: _publish(_exists(src), os.path.join(WEBSITE_VIDEOS_DIR, asset.filename)),
+         deps=[f"optimise:{asset.id}", f"download:{asset.id}"], backend="io", priority=priority)
+
+
+# Replicate (FLUX images, Veo 3 Fast videos)
+
+def add_replicate_image(graph, asset, priority, stages=STAGES):
+    tid = f"replicate:{asset.id}"
+    _add(graph, stages, "generate", f"generate:{tid}",
+         lambda _: _ok(_generator("generate_replicate").generate_image(asset)),
+         backend="replicate", priority=priority)
+    _web_image(graph, stages, tid, asset.abspath, WEBSITE_IMAGES_DIR, asset.filename, priority)
+
+
+def add_replicate_video(graph, asset, priority, stages=STAGES):
+    tid = f"replicate:{asset.id}"
+    src = asset.abspath
+    base = os.path.splitext(asset.filename)[0]
+    _add(graph, stages, "generate", f"generate:{tid}",
+         lambda _: _ok(_generator("generate_replicate").generate_video(asset)),
+         backend="replicate", priority=priority)
+    _add(graph, stages, "optimise", f"optimise:{tid}",
+         lambda _: _transcode(_exists(src), WEBSITE_VIDEOS_DIR, base),
+         deps=[f"generate:{tid}"], backend="ffmpeg", priority=priority)
+    _add(graph, stages, "optimise", f"poster:{tid}",
+         lambda _: _poster(_exists(src), WEBSITE_VIDEOS_DIR, base),
+         deps=[f"optimise:{tid}", f"generate:{tid}"], backend="cpu", priority=priority)
+
+
+def add_media_image(graph, asset, priority, stages=STAGES):
+    tid = f"media:{asset.id}"
+    _add(graph, stages, "generate", f"generate:{tid}",
+         lambda _: _ok(_generator("generate_media_images").generate_image(asset)),
+         backend="replicate", priority=priority)
+    # The website copy is a .png, as in generate_media_images.main()
+    _web_image(graph, stages, tid, asset.abspath, WEBSITE_IMAGES_DIR,
+               asset.filename.replace(".jpg", ".png"), priority, sizes=WEB_SIZES)
+
+
+def add_news_image(graph, asset, priority, stages=STAGES):
+    # News images are generated straight into the website tree
+    tid = f"news:{asset.id}"
+    path = asset.abspath
+    _add(graph, stages, "generate", f"generate:{tid}",
+         lambda _: _ok({"status": "success"} if _generator("generate_news_images").generate_image(asset) else None),
+         backend="replicate", priority=priority)
+    _add(graph, stages, "optimise", f"optimise:{tid}",
+         lambda _: image_pipeline.optimize_image(_exists(path), os.path.splitext(path)[0], sizes=WEB_SIZES),
+         deps=[f"generate:{tid}"], backend="cpu", priority=priority)
+
+
+def add_hero_video(graph, asset, priority, stages=STAGES):
+    tid = f"hero-video:{asset.id}"
+    src = asset.abspath
+    _add(graph, stages, "generate", f"generate:{tid}",
+         lambda _: _ok(_generator("generate_hero_videos").generate_video(asset)),
+         backend="replicate", priority=priority)
+    _add(graph, stages, "optimise", f"optimise:{tid}",
+         lambda _: _transcode(_exists(src), os.path.join(WEBSITE_VIDEOS_DIR, "hero"), f"hero_{asset.id}"),
+         deps=[f"generate:{tid}"], backend="ffmpeg", priority=priority)
+    # HLS/DASH after the progressive renditions, so the MP4 fallback lands first
+    _add(graph, stages, "optimise", f"package:{tid}",
+         lambda _: _package(_exists(src), f"hero_{asset.id}"),
+         deps=[f"optimise:{tid}", f"generate:{tid}"], backend="ffmpeg", priority=priority)
+    _add(graph, stages, "optimise", f"poster:{tid}",
+         lambda _: _poster(_exists(src), os.path.join(WEBSITE_VIDEOS_DIR, "hero"), f"hero_{asset.id}"),
+         deps=[f"optimise:{tid}", f"generate:{tid}"], backend="cpu", priority=priority)
+
+
+# Gemini REST (sector cards, project images — written straight into the website tree)
+
+def add_gemini_image(graph, asset, priority, stages=STAGES):
+    module = {"sectors": "generate_sector_images", "projects": "generate_project_images"}[asset.group]
+    _add(graph, stages, "generate", f"generate:{asset.group}:{asset.id}",
+         lambda _: _ok({"status": _generator(module).generate_image(asset)}),
+         backend="gemini", priority=priority)
+
+
+# group → (builder, priority); lower runs first
+GROUP_BUILDERS = {
+    # Veo takes minutes per clip, so submissions go first and their
+    # polling overlaps everything else
+    "videos": (add_veo_video, 0),
+    "images": (add_imagen_image, 10),
+    "sectors": (add_gemini_image, 40),
+    "projects": (add_gemini_image, 40),
+    "replicate-images": (add_replicate_image, 50),
+    "replicate-videos": (add_replicate_video, 50),
+    "media-blog": (add_media_image, 50),
+    "media-gallery": (add_media_image, 50),
+    "news": (add_news_image, 50),
+    "hero-videos": (add_hero_video, 50),
+}
+
+
+def select_assets(images=True, videos=True, replicate=True, gemini=True):
+    """The catalogue assets a generate_all run covers."""
+    groups = []
+    if videos:
+        groups.append("videos")
+    if images:
+        groups.append("images")
+    if gemini and os.getenv("GOOGLE_API_KEY"):
+        groups += ["sectors", "projects"]
+    if replicate and os.getenv("REPLICATE_API_TOKEN"):
+        groups += ["replicate-images", "replicate-videos", "media-blog", "media-gallery", "news", "hero-videos"]
+    return [a for g in groups for a in catalogue.group(g)]
+
+
+def build_graph(assets, stages=STAGES):
+    """Turn catalogue assets into generate → download → optimise → publish tasks."""
+    graph = TaskGraph()
+    for asset in sorted(assets, key=lambda a: GROUP_BUILDERS[a.group][1]):
+        builder, priority = GROUP_BUILDERS[asset.group]
+        if asset.group == "images":
+            rank = PRIORITY_ORDER.index(asset.category) if asset.category in PRIORITY_ORDER else len(PRIORITY_ORDER)
+            priority += rank
+        builder(graph, asset, priority, stages)
+    return graph
+
+
+def print_graph(graph):
+    """Dry run: show what would run, grouped by backend."""
+    by_backend = {}
+    for task in graph.tasks.values():
+        by_backend.setdefault(task.backend, []).append(task)
+
+    print("\n" + "=" * 60)
+    print(f"  DRY RUN — {len(graph.tasks)} tasks")
+    print("=" * 60)
+    for backend, tasks in sorted(by_backend.items(), key=lambda kv: min(t.priority for t in kv[1])):
+        limit = BACKEND_LIMITS.get(backend, 1)
+        print(f"\n  ─── {backend} ({len(tasks)} tasks, {limit} at a time) ───")
+        for task in sorted(tasks, key=lambda t: t.priority):
+            after = f"  ← {', '.join(task.deps)}" if task.deps else ""
+            print(f"    [{task.priority:>2}] {task.id}{after}")
+    print()
+
+
+def load_env():
+    """Load ../.env into the environment (python-dotenv is only needed for real runs)."""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv(os.path.join(BASE_DIR, '..', '.env'))
+
+
+def run_generation(images_only=False, videos_only=False, dry_run=False, replicate=True, publish=True,
+                   assets=None, stages=None):
+    """Run the complete generation pipeline as one in-process task graph.
+
+    `assets`/`stages` narrow the run (manah_assets.py passes them); by
+    default every catalogue asset goes through every stage.
+    """
+    load_env()
+    if assets is None:
+        get_summary()
+        assets = select_assets(images=not videos_only, videos=not images_only,
+                               replicate=replicate and not (images_only or videos_only),
+                               gemini=not (images_only or videos_only))
+    if stages is None:
+        stages = STAGES if publish else ("generate",)
+
+    graph = build_graph(assets, stages)
+
+    if dry_run:
+        print_graph(graph)
+        return
+
+    total = len(graph.tasks)
+    finished = [0]
+
+    def on_finish(task):
+        finished[0] += 1
+        took = f"{task.finished_at - task.started_at:.1f}s" if task.started_at else "-"
+        icon = {"done": "✅", "failed": "❌", "skipped": "⏭ "}.get(task.state, "  ")
+        line = f"  [{finished[0]}/{total}] {icon} {task.id} ({task.backend}, {took})"
+        if task.error:
+            line += f" — {task.error[:100]}"
+        print(line)
+
+    print("\n" + "=" * 60)
+    print(f"  Running {total} tasks")
+    print("  " + ", ".join(f"{b}={n}" for b, n in BACKEND_LIMITS.items()))
+    print("=" * 60 + "\n")
+
+    start = time.time()
+    graph.run(BACKEND_LIMITS, on_finish=on_finish)
+    # Tasks skipped because a dependency failed are reported too
+    for task in graph.tasks.values():
+        if task.state == "skipped":
+            on_finish(task)
+
+    counts = graph.summary()
+    busy = {}
+    for task in graph.tasks.values():
+        if task.started_at and task.finished_at:
+            busy[task.backend] = busy.get(task.backend, 0) + task.finished_at - task.started_at
+
+    print("\n" + "=" * 60)
+    print("  GENERATION PIPELINE COMPLETE")
+    print("=" * 60)
+    print(f"  Wall time: {time.time() - start:.1f}s")
+    print(f"  Tasks: {counts.get('done', 0)} done, {counts.get('failed', 0)} failed, "
+          f"{counts.get('skipped', 0)} skipped")
+    for backend, seconds in sorted(busy.items(), key=lambda kv: -kv[1]):
+        print(f"    {backend:>10}: {seconds:.1f}s busy")
+    limiters = ratelimit.limiter_stats()
+    for stats in limiters:
+        print(f"    {stats['name']:>10}: settled at {stats['limit']} in flight "
+              f"(peak {stats['peak']}, {stats['throttled']} throttled)")
+    print(f"\n  📸 Images: output/images/ → {os.path.normpath(WEBSITE_IMAGES_DIR)}")
+    print(f"  🎬 Videos: output/videos/ → {os.path.normpath(WEBSITE_VIDEOS_DIR)}")
+    if "optimise" in stages:
+        print(f"  🗂  Image manifest: {responsive.export()} assets → website/src/lib/image-manifest.ts")
+        print(f"  🎞  Video manifest: {video_sources.export()} videos → website/src/lib/video-manifest.ts")
+    print("=" * 60 + "\n")
+
+    log_path = os.path.join(OUTPUT_DIR, 'pipeline_log.json')
+    with open(log_path, "w") as f:
+        json.dump({
+            "timestamp": datetime.now().isoformat(),
+            "wall_seconds": round(time.time() - start, 2),
+            "summary": counts,
+            "limiters": limiters,
+            "tasks": [
+                {"id": t.id, "backend": t.backend, "state": t.state, "error": t.error,
+                 "seconds": round(t.finished_at - t.started_at, 2) if t.started_at and t.finished_at else None}
+                for t in graph.tasks.values()
+            ],
+        }, f, indent=2)
 
 
 if __name__ == "__main__":
@@ -145,9 +610,23 @@ if __name__ == "__main__":
     parser.add_argument("--videos", "-v", action="store_true", help="Generate videos only")
     parser.add_argument("--dry-run", "-d", action="store_true", help="Preview all prompts")
     parser.add_argument("--status", "-s", action="store_true", help="Check generation status")
+    parser.add_argument("--category", "-c", help="--status: only this category")
+    parser.add_argument("--backend", "-b", help="--status: only this backend (imagen, veo, replicate, gemini)")
+    parser.add_argument("--stale", action="store_true", help="--status: only assets whose prompt changed")
+    parser.add_argument("--missing-renditions", action="store_true", help="--status: only assets without web renditions")
+    parser.add_argument("--reindex", action="store_true", help="Index existing output files into the manifest")
+    parser.add_argument("--trace", nargs="?", const="1", metavar="PATH", help="Write a Chrome trace of this run")
+    parser.add_argument("--no-replicate", action="store_true", help="Skip the Replicate-side asset lists")
+    parser.add_argument("--no-publish", action="store_true", help="Generate only; skip optimise/publish tasks")
     args = parser.parse_args()
 
+    if args.trace:
+        tracing.enable(args.trace)
+    if args.reindex:
+        reindex()
     if args.status:
-        check_status()
-    else:
-        run_generation(images_only=args.images, videos_only=args.videos, dry_run=args.dry_run)
+        check_status(category=args.category, backend=args.backend,
+                     stale=args.stale, missing_renditions=args.missing_renditions)
+    elif not args.reindex:
+        run_generation(images_only=args.images, videos_only=args.videos, dry_run=args.dry_run,
+                       replicate=not args.no_replicate, publish=not args.no_publish)
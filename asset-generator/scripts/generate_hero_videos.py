@@ -13,15 +13,27 @@ Usage:
 import os
 import sys
 import json
-import time
 import argparse
-import urllib.request
-import subprocess
 from pathlib import Path
 from datetime import datetime
-
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import asset_cache
+import backends
+import catalogue
+import downloader
+import ratelimit
+import resilience
+import manifest
+import provenance
+import transcode
+import streaming
+import posters
+
+# ReplicateBackend imports the SDK lazily; check for it up front for a clear hint
 try:
-    import replicate
+    import replicate  # noqa: F401
 except ImportError:
     print("ERROR: replicate not installed. Run: pip3 install replicate")
     sys.exit(1)
@@ -36,92 +48,13 @@ if not REPLICATE_TOKEN:
 
 os.environ["REPLICATE_API_TOKEN"] = REPLICATE_TOKEN
 
-VIDEO_MODEL = "google/veo-3-fast"
+RECIPE = catalogue.recipe("hero-videos")  # model, aspect ratio, generation config
+VIDEO_MODEL = RECIPE["model"]
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'output', 'replicate', 'videos', 'hero')
 WEBSITE_VIDEO_DIR = "/Users/chinmay/Desktop/Manah/website/public/videos/hero"
 
-HERO_VIDEOS = [
-    {
-        "id": "infrastructure",
-        "filename": "hero_infrastructure.mp4",
-        "duration": 4,
-        "prompt": (
-            "Cinematic aerial drone shot gliding forward over a massive modern power transmission "
-            "and infrastructure construction project at golden hour. Enormous steel lattice towers "
-            "stretching to the horizon. Camera moves steadily forward at medium altitude revealing "
-            "the immense scale — roads, bridges, electrical substations below. Warm golden sunlight "
-            "streaming through dramatic clouds, casting long shadows across the landscape. "
-            "Dust particles catching golden light. Deep navy-blue shadows contrast with warm amber "
-            "highlights. Ultra-smooth camera motion. Shot on Arri Alexa 65mm. "
-            "Photorealistic, 4K cinematic quality. No text, no people close-up."
-        ),
-        "purpose": "Division 1: Manah Dynamics — Infrastructure & EPC"
-    },
-    {
-        "id": "aerospace",
-        "filename": "hero_aerospace.mp4",
-        "duration": 4,
-        "prompt": (
-            "Cinematic slow dolly shot inside a pristine modern aircraft MRO maintenance hangar. "
-            "Camera glides smoothly along the polished fuselage of a wide-body commercial aircraft. "
-            "Open engine cowling reveals intricate turbine blades. Cool blue-white industrial LED "
-            "lighting with warm amber spot highlights reflecting off the aircraft's metallic skin. "
-            "Mirror-like reflections on the polished concrete hangar floor. Precision tools and "
-            "advanced diagnostic equipment visible. Atmosphere of meticulous, high-tech precision. "
-            "Ultra-smooth camera motion. Shot on Arri Alexa with anamorphic lens flare. "
-            "Photorealistic, 4K cinematic quality. No text, no people close-up."
-        ),
-        "purpose": "Division 2: Manah Aerospace — Aviation MRO"
-    },
-    {
-        "id": "green_energy",
-        "filename": "hero_green_energy.mp4",
-        "duration": 4,
-        "prompt": (
-            "Cinematic aerial shot rising slowly over a vast solar farm at sunrise transition. "
-            "Thousands of solar panels catching the first golden rays of dawn, creating geometric "
-            "patterns across the landscape. Elegant white wind turbines spinning slowly in the "
-            "background against a gradient sky — deep navy blue transitioning to warm amber-gold. "
-            "Morning mist hovering just above the ground. Camera rises steadily revealing the "
-            "enormous clean energy installation stretching to the horizon. Serene, powerful, hopeful. "
-            "Ultra-smooth camera motion. Shot on RED V-Raptor. "
-            "Photorealistic, 4K cinematic quality. No text, no people."
-        ),
-        "purpose": "Division 3: Manah Green Energy — Renewables & Green Hydrogen"
-    },
-    {
-        "id": "technology",
-        "filename": "hero_technology.mp4",
-        "duration": 4,
-        "prompt": (
-            "Cinematic slow tracking shot inside a state-of-the-art electronics manufacturing "
-            "cleanroom. Camera glides smoothly past automated SMT (Surface Mount Technology) pick-and-place "
-            "machines operating with robotic precision. Micro-components being placed on circuit boards "
-            "at high speed. Cool blue-violet ambient lighting with warm golden accent lights on the "
-            "machinery. LED indicators glowing. Shallow depth of field creating beautiful bokeh on "
-            "background equipment. Atmosphere of advanced technological precision and defence-grade "
-            "quality. Ultra-smooth dolly motion. Shot on Sony Venice 2 with Cooke anamorphic lenses. "
-            "Photorealistic, 4K cinematic quality. No text, no people close-up."
-        ),
-        "purpose": "Division 4: Manah Technology — Electronics Manufacturing"
-    },
-    {
-        "id": "investments",
-        "filename": "hero_investments.mp4",
-        "duration": 4,
-        "prompt": (
-            "Cinematic aerial shot at blue hour (twilight) sweeping over a modern Indian cityscape "
-            "with illuminated corporate towers and infrastructure. Camera glides forward smoothly "
-            "over a river reflecting city lights, revealing multiple project sites — a bridge under "
-            "construction, a modern glass office complex, industrial facilities with warm amber "
-            "lighting. The sky transitions from deep navy to warm gold at the horizon. City lights "
-            "twinkling below. Represents strategic investment, growth, and urban development. "
-            "Ultra-smooth aerial camera motion. Shot on Arri Alexa 65mm. "
-            "Photorealistic, 4K cinematic quality. No text, no people."
-        ),
-        "purpose": "Division 5: Manah Investments — Strategic Growth"
-    },
-]
+# Prompts live in catalogue/hero-videos.json
+HERO_VIDEOS = catalogue.group("hero-videos")
 
 
 def generate_video(prompt_data):
@@ -129,41 +62,45 @@ def generate_video(prompt_data):
     out_path = os.path.join(OUTPUT_DIR, prompt_data["filename"])
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
 
-    if os.path.exists(out_path):
-        print(f"  SKIP (exists): {prompt_data['filename']}")
-        return {"status": "skipped", "id": prompt_data["id"], "file": out_path}
+    aspect = RECIPE["aspect_ratio"]
+    config = dict(RECIPE["config"], duration=prompt_data["duration"])
+    key = asset_cache.cache_key(VIDEO_MODEL, prompt_data["prompt"], aspect, config)
+
+    # Files that predate the cache are adopted as up to date
+    hit = asset_cache.resolve(key, out_path)
+    if hit is not None:
+        print(f"  SKIP (up to date): {prompt_data['filename']}" if hit == "skipped"
+              else f"  CACHED: {prompt_data['filename']}")
+        manifest.record_asset(prompt_data["id"], out_path, "replicate", VIDEO_MODEL,
+                              prompt_data["prompt"], "hero-video", status=hit)
+        provenance.record(prompt_data, out_path, VIDEO_MODEL)
+        return {"status": hit, "id": prompt_data["id"], "file": out_path}
 
     print(f"  Generating: {prompt_data['id']}")
     print(f"    Purpose: {prompt_data['purpose']}")
     print(f"    Duration: {prompt_data['duration']}s")
     print(f"    Model: {VIDEO_MODEL}")
 
+    backend = backends.get_backend("replicate", VIDEO_MODEL)
     try:
-        output = replicate.run(
-            VIDEO_MODEL,
-            input={
-                "prompt": prompt_data["prompt"],
-                "duration": prompt_data["duration"],
-                "aspect_ratio": "16:9",
-                "resolution": "720p",
-            }
+        results = resilience.call(
+            "replicate", VIDEO_MODEL,
+            lambda: backends.run(backend.generate_video(
+                prompt_data["prompt"], aspect_ratio=aspect, duration=prompt_data["duration"],
+                config=RECIPE["config"])),
         )
 
-        if output:
-            if hasattr(output, 'read'):
-                with open(out_path, "wb") as f:
-                    f.write(output.read())
-            elif isinstance(output, str):
-                urllib.request.urlretrieve(output, out_path)
-            elif isinstance(output, list) and len(output) > 0:
-                url = str(output[0])
-                urllib.request.urlretrieve(url, out_path)
-            else:
-                url = str(output)
-                urllib.request.urlretrieve(url, out_path)
-
-            size_mb = os.path.getsize(out_path) / (1024 * 1024)
-            print(f"  Saved: {out_path} ({size_mb:.1f} MB)")
+        if results:
+            download = backends.save(results[0], out_path)
+            asset_cache.store(
+                key, out_path,
+                model=VIDEO_MODEL, prompt=prompt_data["prompt"],
+                aspect_ratio=aspect, config=config,
+            )
+            manifest.record_asset(prompt_data["id"], out_path, "replicate", VIDEO_MODEL,
+                                  prompt_data["prompt"], "hero-video")
+            provenance.record(prompt_data, out_path, VIDEO_MODEL)
+            print(f"  Saved: {out_path} ({downloader.describe(download)})")
             return {"status": "success", "id": prompt_data["id"], "file": out_path}
 
         print(f"  No output returned for: {prompt_data['id']}")
@@ -174,29 +111,46 @@ def generate_video(prompt_data):
         return {"status": "error", "id": prompt_data["id"], "error": str(e)}
 
 
-def optimize_for_web(src_path, video_id):
-    """Compress video to 720p and 480p for web delivery."""
-    base = f"hero_{video_id}"
+def optimize_for_web(items, per_title=None):
+    """Compress videos to 720p and 480p for web delivery.
+
+    `items` is a list of (src_path, video_id) pairs; all sources are
+    transcoded concurrently, each decoded once for both renditions.
+    `per_title` picks each clip's CRFs by probing (default: TRANSCODE_MODE).
+    """
+    if per_title is None:
+        per_title = transcode.TRANSCODE_MODE == "per-title"
+    jobs = []
+    for src_path, video_id in items:
+        base = f"hero_{video_id}"
+        jobs.append({
+            "label": base,
+            "src": src_path,
+            "per_title": per_title,
+            "outputs": [
+                (r, transcode.rendition_path(WEBSITE_VIDEO_DIR, base, r))
+                for r in transcode.web_renditions()
+            ],
+        })
+    return transcode.transcode_all(jobs)
+
+
+def package_for_web(items, per_title=None):
+    """HLS + DASH (shared CMAF segments) for each clip, in videos/stream/hero_{id}/ next to the MP4s."""
+    budget = transcode.ThreadBudget()
+    results = []
+    for src_path, video_id in items:
+        base = f"hero_{video_id}"
+        result = streaming.package(src_path, streaming.stream_dir(os.path.dirname(WEBSITE_VIDEO_DIR), base),
+                                   label=base, budget=budget, per_title=per_title)
+        streaming.print_result(result)
+        results.append(result)
+    return results
 
-    for res_name, scale, crf in [("720p", "1280:720", "28"), ("480p", "854:480", "30")]:
-        out_path = os.path.join(WEBSITE_VIDEO_DIR, f"{base}-{res_name}.mp4")
-        os.makedirs(os.path.dirname(out_path), exist_ok=True)
 
-        try:
-            subprocess.run([
-                "ffmpeg", "-y", "-i", src_path,
-                "-vf", f"scale={scale}:force_original_aspect_ratio=decrease",
-                "-c:v", "libx264", "-preset", "slow", "-crf", crf,
-                "-an",
-                "-movflags", "+faststart",
-                "-pix_fmt", "yuv420p",
-                out_path
-            ], capture_output=True, check=True)
-            size_kb = os.path.getsize(out_path) / 1024
-            print(f"    {res_name}: {out_path} ({size_kb:.0f} KB)")
-        except (subprocess.CalledProcessError, FileNotFoundError) as e:
-            print(f"    ffmpeg error ({res_name}): {str(e)[:100]}")
-            subprocess.run(["cp", src_path, out_path], capture_output=True)
+def posters_for_web(items):
+    """Poster renditions + animated preview for each clip, next to its MP4s."""
+    return posters.make_all([(src_path, WEBSITE_VIDEO_DIR, f"hero_{video_id}") for src_path, video_id in items])
 
 
 def main():
@@ -204,11 +158,15 @@ def main():
     parser.add_argument("--id", help="Generate single video by ID (infrastructure, aerospace, green_energy, technology, investments)")
     parser.add_argument("--dry-run", "-d", action="store_true", help="Preview prompts only")
     parser.add_argument("--skip-optimize", action="store_true", help="Skip ffmpeg optimization")
+    parser.add_argument("--no-package", action="store_true", help="Skip HLS/DASH packaging")
+    parser.add_argument("--per-title", action="store_true",
+                        help="Pick each clip's CRFs by probing (writes {video}.ladder.json)")
     args = parser.parse_args()
 
     videos = HERO_VIDEOS
     if args.id:
-        videos = [v for v in HERO_VIDEOS if v["id"] == args.id]
+        video = catalogue.get(args.id, group="hero-videos")
+        videos = [video] if video else []
         if not videos:
             print(f"Error: No video with id '{args.id}'")
             print(f"Available: {', '.join(v['id'] for v in HERO_VIDEOS)}")
@@ -230,26 +188,25 @@ def main():
             print(f"  Prompt:  {v['prompt'][:200]}...")
         return
 
-    results = []
-    for i, video in enumerate(videos):
+    # Runs concurrently; the shared "replicate" limiter decides how many are in flight
+    with ThreadPoolExecutor(max_workers=ratelimit.max_concurrency("replicate")) as pool:
+        results = list(pool.map(generate_video, videos))
+    to_optimize = [(r["file"], v["id"]) for r, v in zip(results, videos) if r["status"] in ("success", "cached")]
+
+    if to_optimize and not args.skip_optimize:
         print(f"\n{'─' * 60}")
-        print(f"  [{i+1}/{len(videos)}] {video['id'].upper()}")
+        print("  Optimizing for web...")
         print(f"{'─' * 60}")
-        result = generate_video(video)
-        results.append(result)
-
-        # Rate limit: wait 5s between API calls
-        if i < len(videos) - 1 and result["status"] != "skipped":
-            print("  Waiting 5s for rate limit...")
-            time.sleep(5)
-
-        if result["status"] == "success" and not args.skip_optimize:
-            print("  Optimizing for web...")
-            optimize_for_web(result["file"], video["id"])
+        optimize_for_web(to_optimize, per_title=args.per_title or None)
+        print("\n  Poster frames & previews...")
+        posters_for_web(to_optimize)
+        if not args.no_package:
+            print("\n  Packaging HLS/DASH...")
+            package_for_web(to_optimize, per_title=args.per_title or None)
 
     success = sum(1 for r in results if r["status"] == "success")
     errors = sum(1 for r in results if r["status"] == "error")
-    skipped = sum(1 for r in results if r["status"] == "skipped")
+    skipped = sum(1 for r in results if r["status"] in ("skipped", "cached"))
 
     print("\n" + "=" * 60)
     print(f"  COMPLETE: {success} generated | {skipped} skipped | {errors} errors")
@@ -21,14 +21,23 @@ import argparse
 import base64
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from prompts import IMAGE_PROMPTS, get_all_image_prompts
-
+import backends
+import catalogue
+import ratelimit
+import resilience
+import asset_cache
+import manifest
+import provenance
+import image_scoring
+import tracing
+
+# ImagenBackend imports the SDK lazily; check for it up front for a clear hint
 try:
-    from google import genai
-    from google.genai import types
+    from google import genai  # noqa: F401
 except ImportError:
     print("ERROR: google-genai package not installed.")
     print("Run: pip install google-genai --break-system-packages")
@@ -39,16 +48,28 @@ from dotenv import load_dotenv
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 API_KEY = os.getenv("GOOGLE_API_KEY", "")
-IMAGE_MODEL = os.getenv("IMAGE_MODEL", "imagen-3.0-generate-002")
+RECIPE = catalogue.recipe("images")  # IMAGE_MODEL overrides the model
+IMAGE_MODEL = RECIPE["model"]
+# Models tried in order (IMAGEN_MODEL_CHAIN overrides, e.g.
+# "imagen:imagen-4.0-generate-001,imagen:imagen-3.0-generate-002")
+MODEL_CHAIN = resilience.model_chain([("imagen", m) for m in RECIPE["models"]], env="IMAGEN_MODEL_CHAIN")
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'output', 'images')
 
-# Rate limiting
-REQUESTS_PER_MINUTE = 10
-DELAY_BETWEEN_REQUESTS = 60 / REQUESTS_PER_MINUTE  # 6 seconds
+# Rate limiting — requests go through the shared adaptive limiter, which
+# grows in-flight calls while Imagen accepts them and backs off on 429/503.
+# IMAGE_MAX_CONCURRENCY caps it (and sizes the worker pool).
+MAX_CONCURRENT_REQUESTS = ratelimit.limiter("imagen").maximum
+MAX_CANDIDATES = 4  # Imagen returns at most 4 images per request
+
+# GenerateImagesConfig fields (aspect_ratio is set per prompt), from the
+# "images" recipe in the catalogue; ImagenBackend sends them as-is. Part of
+# the cache key, so changing any of these regenerates affected images.
+IMAGE_CONFIG = RECIPE["config"]
+CONFIGS = {"imagen": IMAGE_CONFIG}
 
 
-def setup_client():
-    """Initialize the Google GenAI client."""
+def check_api_key():
+    """Exit with setup instructions when the Google AI Studio key is missing."""
     if not API_KEY or API_KEY == "PASTE_YOUR_KEY_HERE":
         print("=" * 60)
         print("  ERROR: API key not configured!")
@@ -57,84 +78,122 @@ def setup_client():
         print("=" * 60)
         sys.exit(1)
 
-    client = genai.Client(api_key=API_KEY)
-    return client
 
+def generate_single_image(prompt_data, output_base, candidates=1):
+    """Generate a single image using Imagen 3.
 
-def generate_single_image(client, prompt_data, output_base):
-    """Generate a single image using Imagen 3."""
+    resilience.generate_image walks MODEL_CHAIN (breaker, retries and the
+    shared limiter per link) only once the skip check has passed, so
+    already-generated images never consume quota. With
+    `candidates` > 1 one request returns that many images; all are kept
+    under output/candidates/ and the best-scoring one is promoted.
+    """
     filepath = os.path.join(output_base, prompt_data["filename"])
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
 
-    # Skip if already generated
-    if os.path.exists(filepath):
-        print(f"  ⏭  SKIP (exists): {prompt_data['filename']}")
+    # Imagen 4 uses generate_images with GenerateImagesConfig
+    # Supports: 1:1, 3:4, 4:3, 9:16, 16:9
+    aspect = prompt_data.get("aspect_ratio", RECIPE["aspect_ratio"])
+    # One key per chain link, and per count: a best pick from more
+    # candidates also satisfies this request
+    links = resilience.chain_keys(MODEL_CHAIN, prompt_data["prompt"], aspect, CONFIGS,
+                                  image_scoring.accepted_counts(candidates, MAX_CANDIDATES))
+
+    # Skip if this exact request was already generated by any model in the chain
+    hit = asset_cache.resolve(list(links), filepath)
+    if hit is not None:
+        backend_name, model, _ = links.get(asset_cache.recorded_key(filepath), ("imagen", IMAGE_MODEL, None))
+        manifest.record_asset(prompt_data["id"], filepath, backend_name, model,
+                              prompt_data["prompt"], prompt_data.get("category"), status=hit)
+        provenance.record(prompt_data, filepath, model)
+    if hit == "skipped":
+        print(f"  ⏭  SKIP (up to date): {prompt_data['filename']}")
         return {"status": "skipped", "id": prompt_data["id"], "file": filepath}
+    if hit == "cached":
+        print(f"  ♻️  CACHED: {prompt_data['filename']}")
+        return {"status": "cached", "id": prompt_data["id"], "file": filepath}
 
-    print(f"  🎨 Generating: {prompt_data['id']}")
-    print(f"     Purpose: {prompt_data['purpose']}")
+    print(f"  🎨 Generating: {prompt_data['id']} — {prompt_data['purpose']}")
 
     try:
-        # Imagen 4 uses generate_images with GenerateImagesConfig
-        # Supports: 1:1, 3:4, 4:3, 9:16, 16:9
-        aspect = prompt_data.get("aspect_ratio", "16:9")
-
-        response = client.models.generate_images(
-            model=IMAGE_MODEL,
-            prompt=prompt_data["prompt"],
-            config=types.GenerateImagesConfig(
-                number_of_images=1,
-                aspect_ratio=aspect,
-                safety_filter_level="BLOCK_LOW_AND_ABOVE",
-                person_generation="ALLOW_ADULT",
-                output_mime_type="image/png",
-            ),
+        results, backend_name, model = resilience.generate_image(
+            prompt_data["prompt"], MODEL_CHAIN, aspect_ratio=aspect, count=candidates,
+            label=prompt_data["id"], configs=CONFIGS,
         )
 
         # Save the generated image
-        if response.generated_images and len(response.generated_images) > 0:
-            image = response.generated_images[0]
-            # Imagen 4 returns image via .image property
-            image.image.save(filepath)
+        if results:
+            if candidates > 1:
+                paths = []
+                for i, result in enumerate(results, start=1):
+                    path = image_scoring.candidate_path(backend_name, prompt_data["id"], i, backends.extension(result))
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    backends.save(result, path)
+                    paths.append(path)
+                with tracing.span("score_candidates", asset=prompt_data["id"], candidates=len(paths)):
+                    ranking = image_scoring.promote(paths, filepath)
+                print(f"  🏆 {prompt_data['id']}: best of {len(paths)} candidates")
+                print(image_scoring.describe(ranking))
+            else:
+                with tracing.span("save", asset=prompt_data["id"], path=filepath):
+                    backends.save(results[0], filepath)
+            key = resilience.link_key(links, backend_name, model)
+            asset_cache.store(
+                key, filepath,
+                model=model, prompt=prompt_data["prompt"],
+                aspect_ratio=aspect, config=links[key][2],
+            )
+            manifest.record_asset(prompt_data["id"], filepath, backend_name, model,
+                                  prompt_data["prompt"], prompt_data.get("category"))
+            provenance.record(prompt_data, filepath, model)
 
             file_size = os.path.getsize(filepath)
-            print(f"  ✅ Saved: {filepath} ({file_size / 1024:.1f} KB)")
+            print(f"  ✅ Saved: {prompt_data['filename']} ({file_size / 1024:.1f} KB)")
             return {"status": "success", "id": prompt_data["id"], "file": filepath, "size": file_size}
         else:
-            print(f"  ⚠️  No image returned for: {prompt_data['id']}")
-            if hasattr(response, 'filtered_reason'):
-                print(f"     Reason: {response.filtered_reason}")
+            print(f"  ⚠️  No image returned for: {prompt_data['id']} (filtered?)")
             return {"status": "empty", "id": prompt_data["id"]}
 
     except Exception as e:
         error_msg = str(e)
-        print(f"  ❌ Error: {error_msg[:100]}")
+        print(f"  ❌ Error ({prompt_data['id']}): {error_msg[:100]}")
         return {"status": "error", "id": prompt_data["id"], "error": error_msg}
 
 
-def generate_images(category=None, single_id=None, dry_run=False):
+def generate_images(category=None, single_id=None, dry_run=False, candidates=1):
     """Generate images for all or specific categories."""
-    all_prompts = get_all_image_prompts()
+    all_prompts = catalogue.group("images")
+
+    if candidates > MAX_CANDIDATES:
+        print(f"  Note: Imagen returns at most {MAX_CANDIDATES} images per call; using {MAX_CANDIDATES}")
+        candidates = MAX_CANDIDATES
+    candidates = max(1, candidates)
+    if candidates > 1 and not dry_run:
+        image_scoring.require_numpy()
 
     # Filter by category or ID
     if single_id:
-        prompts = [p for p in all_prompts if p["id"] == single_id]
+        prompt = catalogue.get(single_id, group="images")
+        prompts = [prompt] if prompt else []
         if not prompts:
             print(f"Error: No prompt found with id '{single_id}'")
             sys.exit(1)
     elif category:
-        prompts = [p for p in all_prompts if p["category"] == category]
+        prompts = catalogue.select(group="images", category=category)
         if not prompts:
             print(f"Error: No prompts found for category '{category}'")
-            print(f"Available categories: {list(IMAGE_PROMPTS.keys())}")
+            print(f"Available categories: {catalogue.load().categories('images')}")
             sys.exit(1)
     else:
         prompts = all_prompts
 
     print("=" * 60)
     print(f"  MANAH GROUP — Image Generation")
-    print(f"  Model: {IMAGE_MODEL}")
+    print(f"  Models: {' → '.join(m for _, m in MODEL_CHAIN)}")
     print(f"  Images to generate: {len(prompts)}")
+    print(f"  Concurrency: adaptive, up to {MAX_CONCURRENT_REQUESTS} in flight")
+    if candidates > 1:
+        print(f"  Candidates: {candidates} per image (best one promoted)")
     print(f"  Output: {OUTPUT_DIR}")
     if dry_run:
         print(f"  MODE: DRY RUN (no API calls)")
@@ -149,29 +208,34 @@ def generate_images(category=None, single_id=None, dry_run=False):
             print(f"  Prompt:   {p['prompt'][:150]}...")
         return
 
-    client = setup_client()
-    results = []
+    check_api_key()
+    limiter = ratelimit.limiter("imagen")
+    results = [None] * len(prompts)
     start_time = time.time()
 
-    for i, prompt_data in enumerate(prompts):
-        print(f"\n[{i+1}/{len(prompts)}] ─────────────────────────────")
-        result = generate_single_image(client, prompt_data, OUTPUT_DIR)
-        results.append(result)
-
-        # Rate limiting
-        if i < len(prompts) - 1 and result["status"] != "skipped":
-            print(f"  ⏳ Waiting {DELAY_BETWEEN_REQUESTS:.0f}s (rate limit)...")
-            time.sleep(DELAY_BETWEEN_REQUESTS)
+    print()
+    with ThreadPoolExecutor(max_workers=max(1, MAX_CONCURRENT_REQUESTS)) as pool:
+        futures = {
+            pool.submit(generate_single_image, prompt_data, OUTPUT_DIR, candidates): i
+            for i, prompt_data in enumerate(prompts)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            results[i] = future.result()
+            print(f"[{done}/{len(prompts)}] {results[i]['id']}: {results[i]['status']}")
 
     # ─── Summary ───
     elapsed = time.time() - start_time
     success = sum(1 for r in results if r["status"] == "success")
     skipped = sum(1 for r in results if r["status"] == "skipped")
+    cached = sum(1 for r in results if r["status"] == "cached")
     errors = sum(1 for r in results if r["status"] == "error")
 
     print("\n" + "=" * 60)
     print(f"  GENERATION COMPLETE")
-    print(f"  Time: {elapsed:.0f}s | Success: {success} | Skipped: {skipped} | Errors: {errors}")
+    print(f"  Time: {elapsed:.0f}s | Success: {success} | Skipped: {skipped} | Cached: {cached} | Errors: {errors}")
+    stats = limiter.snapshot()
+    print(f"  Imagen concurrency settled at {stats['limit']} (peak {stats['peak']}, {stats['throttled']} throttled)")
     print("=" * 60)
 
     # Save results log
@@ -179,12 +243,14 @@ def generate_images(category=None, single_id=None, dry_run=False):
     with open(log_path, "w") as f:
         json.dump({
             "timestamp": datetime.now().isoformat(),
-            "model": IMAGE_MODEL,
+            "models": [m for _, m in MODEL_CHAIN],
             "total": len(prompts),
             "success": success,
             "skipped": skipped,
+            "cached": cached,
             "errors": errors,
             "elapsed_seconds": elapsed,
+            "limiter": stats,
             "results": results
         }, f, indent=2)
     print(f"  Log saved: {log_path}")
@@ -199,11 +265,17 @@ if __name__ == "__main__":
     parser.add_argument("--id", help="Generate single image by ID")
     parser.add_argument("--dry-run", "-d", action="store_true", help="Preview prompts without generating")
     parser.add_argument("--list", "-l", action="store_true", help="List all available image IDs")
+    parser.add_argument("--candidates", "-k", type=int, default=1,
+                        help=f"Generate K candidates per image in one call and keep the best (max {MAX_CANDIDATES})")
+    parser.add_argument("--trace", nargs="?", const="1", metavar="PATH", help="Write a Chrome trace of this run")
     args = parser.parse_args()
 
+    if args.trace:
+        tracing.enable(args.trace)
+
     if args.list:
-        for p in get_all_image_prompts():
+        for p in catalogue.group("images"):
             print(f"  {p['id']:35s} [{p['category']:15s}] {p['purpose']}")
         sys.exit(0)
 
-    generate_images(category=args.category, single_id=args.id, dry_run=args.dry_run)
+    generate_images(category=args.category, single_id=args.id, dry_run=args.dry_run, candidates=args.candidates)
@@ -9,13 +9,27 @@ import os
 import sys
 import time
 import json
-import subprocess
-import urllib.request
+import argparse
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import asset_cache
+import backends
+import catalogue
+import manifest
+import provenance
+import downloader
+import resilience
+import tracing
+import image_pipeline
+import transcode
+import posters
+import image_scoring
+
+# ReplicateBackend imports the SDK lazily; check for it up front for a clear hint
 try:
-    import replicate
+    import replicate  # noqa: F401
 except ImportError:
     print("ERROR: replicate package not installed. Run: pip3 install replicate")
     sys.exit(1)
@@ -30,245 +44,121 @@ if not REPLICATE_TOKEN:
 
 os.environ["REPLICATE_API_TOKEN"] = REPLICATE_TOKEN
 
-IMAGE_MODEL = "black-forest-labs/flux-2-pro"
-VIDEO_MODEL = "google/veo-3-fast"
+# Models and generation config: the recipes in catalogue/replicate-*.json
+IMAGE_RECIPE = catalogue.recipe("replicate-images")
+VIDEO_RECIPE = catalogue.recipe("replicate-videos")
+IMAGE_MODEL = IMAGE_RECIPE["model"]
+VIDEO_MODEL = VIDEO_RECIPE["model"]
+# Image models tried in order (FLUX_MODEL_CHAIN overrides, e.g.
+# "replicate:black-forest-labs/flux-2-pro,imagen:imagen-4.0-generate-001").
+# Videos stay on VIDEO_MODEL, whose recipe (duration, resolution) is model-specific.
+MODEL_CHAIN = resilience.model_chain([("replicate", m) for m in IMAGE_RECIPE["models"]], env="FLUX_MODEL_CHAIN")
+CONFIGS = {"replicate": IMAGE_RECIPE["config"]}
 
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'output', 'replicate')
 WEBSITE_IMAGES_DIR = "/Users/chinmay/Desktop/Manah/website/public/images"
 
-# ─── Brand Style Directives ───
-
-BRAND_STYLE = (
-    "Ultra-premium corporate photography style. Deep navy blue (#0A1628) and warm gold (#C8A96E) "
-    "color accents. Cinematic lighting with dramatic shadows. Shot on medium format camera. "
-    "Professional grade, editorial quality. No text, no logos, no watermarks. "
-    "Clean composition with clear focal point. "
-)
-
-PORTRAIT_STYLE = (
-    "Professional corporate portrait photography. Studio lighting with subtle rim light. "
-    "Deep navy background with warm gold accent lighting. Shot on 85mm f/1.4 lens. "
-    "Sharp focus on subject, creamy bokeh background. Editorial quality. "
-    "No text, no watermarks. Indian professional. "
-)
-
-# ─── Missing Image Prompts ───
-
-MISSING_IMAGES = [
-    {
-        "id": "leader_chairman",
-        "filename": "leaders/chairman.jpg",
-        "prompt": (
-            PORTRAIT_STYLE +
-            "Distinguished Indian male executive in his late 50s. Silver-streaked hair, "
-            "clean-shaven, wearing a premium charcoal suit with subtle navy tie and gold cufflinks. "
-            "Confident, warm smile. Deep navy studio background with warm rim light on one side. "
-            "Headshot from chest up. Exudes authority, wisdom, and approachability. "
-            "30+ years of corporate leadership presence."
-        ),
-        "aspect_ratio": "3:4",
-        "purpose": "Chairman & MD portrait - Rajesh Menon"
-    },
-    {
-        "id": "leader_coo",
-        "filename": "leaders/coo.jpg",
-        "prompt": (
-            PORTRAIT_STYLE +
-            "Professional Indian woman executive in her mid-40s. Confident expression, "
-            "elegant posture. Wearing a tailored navy blazer with a subtle gold brooch. "
-            "Hair neatly styled. Deep navy studio background with warm golden accent light. "
-            "Headshot from chest up. Exudes competence, determination, and modern leadership. "
-            "Corporate executive presence."
-        ),
-        "aspect_ratio": "3:4",
-        "purpose": "COO portrait - Anita Sharma"
-    },
-    {
-        "id": "leader_cfo",
-        "filename": "leaders/cfo.jpg",
-        "prompt": (
-            PORTRAIT_STYLE +
-            "Professional Indian male executive in his late 40s. Sharp, analytical expression. "
-            "Wearing a well-fitted dark navy suit with burgundy tie. Clean-shaven, modern glasses. "
-            "Deep navy studio background with warm side lighting. Headshot from chest up. "
-            "Exudes financial acumen, precision, and trustworthiness. Strategic corporate leader."
-        ),
-        "aspect_ratio": "3:4",
-        "purpose": "CFO portrait - Vikram Patel"
-    },
-    {
-        "id": "leader_cto",
-        "filename": "leaders/cto.jpg",
-        "prompt": (
-            PORTRAIT_STYLE +
-            "Indian male technology executive in his early 50s, with a scholarly appearance. "
-            "Short beard, modern frameless glasses. Wearing a navy blazer over a light shirt, "
-            "no tie for a tech-forward look. Deep navy studio background with cool blue "
-            "and warm gold accent lighting. Headshot from chest up. "
-            "Exudes innovation, intelligence, and technical depth. Visionary technologist."
-        ),
-        "aspect_ratio": "3:4",
-        "purpose": "CTO portrait - Dr. Suresh Kumar"
-    },
-    {
-        "id": "sustain_community",
-        "filename": "sustainability/community_impact.png",
-        "prompt": (
-            BRAND_STYLE +
-            "Indian rural community benefiting from infrastructure development. "
-            "Children studying under reliable electric light. Clean water facility "
-            "with modern pipeline. Smiling faces, vibrant colors. Professional documentary "
-            "photography style. Warm, human, genuine. Social impact of infrastructure."
-        ),
-        "aspect_ratio": "4:3",
-        "purpose": "Sustainability - social impact section"
-    },
-]
-
-# ─── Video Prompts ───
-
-VIDEO_PROMPTS = [
-    {
-        "id": "video_hero_main",
-        "filename": "hero/hero_main_loop.mp4",
-        "prompt": (
-            "Cinematic aerial drone shot slowly flying over a massive modern infrastructure "
-            "construction project in India at golden hour. Camera glides smoothly forward over "
-            "power transmission towers, steel structures, and construction cranes. "
-            "Workers visible below coordinating operations. Dramatic clouds with golden sunlight "
-            "streaming through. Dust particles catching light. Slow, majestic camera movement. "
-            "Deep navy shadows and warm golden highlights. 4K cinematic quality. "
-            "Shot on Arri Alexa. Smooth, loopable."
-        ),
-        "duration": 8,
-        "purpose": "Homepage hero background video - primary loop"
-    },
-    {
-        "id": "video_hero_energy",
-        "filename": "hero/hero_renewable_loop.mp4",
-        "prompt": (
-            "Cinematic aerial time-lapse of a vast solar farm transitioning from dawn to "
-            "golden hour. Camera slowly rises revealing the enormous scale of the installation. "
-            "Wind turbines spinning gently in the background. Cloud shadows moving across the "
-            "solar panels. Warm golden light gradually illuminating the panels. "
-            "Serene, powerful, hopeful mood. Deep navy to warm gold color transition. "
-            "4K cinematic quality. Smooth, loopable."
-        ),
-        "duration": 8,
-        "purpose": "Homepage hero background video - renewable energy loop"
-    },
-    {
-        "id": "video_hero_aerospace",
-        "filename": "hero/hero_aerospace_loop.mp4",
-        "prompt": (
-            "Cinematic slow dolly shot inside a modern aircraft MRO hangar. Camera moves "
-            "along the fuselage of a wide-body commercial aircraft being serviced. "
-            "Technicians working on open engine cowling with precision tools. Cool blue "
-            "industrial lighting with warm spot highlights on the aircraft skin. "
-            "Reflections on the polished hangar floor. Precision, technology, expertise. "
-            "4K cinematic quality. Smooth, loopable."
-        ),
-        "duration": 8,
-        "purpose": "Homepage hero background video - aerospace loop"
-    },
-    {
-        "id": "video_about_story",
-        "filename": "about/company_story.mp4",
-        "prompt": (
-            "Cinematic montage sequence: starts with sunrise over Indian landscape, "
-            "transitions to time-lapse of a building being constructed from foundation to "
-            "completion, then to a team of engineers reviewing plans together, ending with "
-            "a sweeping aerial shot of completed infrastructure against a dramatic sky. "
-            "Deep navy and warm gold color grading throughout. Smooth cross-dissolve "
-            "transitions. Emotional, inspiring, aspirational. 4K cinematic."
-        ),
-        "duration": 8,
-        "purpose": "About page - company story background"
-    },
-    {
-        "id": "video_div_dynamics",
-        "filename": "divisions/dynamics_reel.mp4",
-        "prompt": (
-            "Cinematic drone shot circling a large-scale power transmission project. "
-            "High-voltage towers being assembled with cranes. Camera orbits slowly revealing "
-            "the scale of the project against the Indian countryside. Workers in safety gear "
-            "visible on the towers. Golden hour lighting creating long shadows. "
-            "Powerful, impressive engineering scale. 4K cinematic."
-        ),
-        "duration": 8,
-        "purpose": "Manah Dynamics division page background"
-    },
-    {
-        "id": "video_div_green",
-        "filename": "divisions/green_energy_reel.mp4",
-        "prompt": (
-            "Cinematic slow-motion shot of hydrogen being produced in a modern electrolysis "
-            "facility. Camera tracks along gleaming pipelines and storage tanks. "
-            "Subtle steam or vapor visible. Green and teal lighting accents. "
-            "Wind turbines visible through facility windows. Clean, futuristic, hopeful. "
-            "4K cinematic quality."
-        ),
-        "duration": 8,
-        "purpose": "Green Energy division page background"
-    },
-    {
-        "id": "video_careers_culture",
-        "filename": "careers/culture_reel.mp4",
-        "prompt": (
-            "Cinematic lifestyle montage of modern Indian corporate culture. Young professionals "
-            "walking into a modern glass office building, collaborative meetings with diverse teams, "
-            "engineers at project sites with hard hats, team lunch in a bright cafeteria, "
-            "after-work sports activity. Warm, vibrant color grading with navy and gold tones. "
-            "Natural, candid moments. Aspirational employer brand. 4K cinematic."
-        ),
-        "duration": 8,
-        "purpose": "Careers page - culture video background"
-    },
-]
-
-
-def generate_image(prompt_data):
-    """Generate a single image using FLUX 2 Pro on Replicate."""
+# Prompts live in catalogue/replicate-images.json and catalogue/replicate-videos.json
+MISSING_IMAGES = catalogue.group("replicate-images")
+VIDEO_PROMPTS = catalogue.group("replicate-videos")
+
+
+def generate_candidates(prompt_data, aspect, candidates):
+    """Run K FLUX predictions concurrently (one output per call) and return (paths, backend, model).
+
+    The first model in MODEL_CHAIN that returns anything supplies every
+    candidate; ReplicateBackend keeps the predictions that succeeded, so a
+    link only fails over when all of them fail.
+    """
+    try:
+        results, backend_name, model = resilience.generate_image(
+            prompt_data["prompt"], MODEL_CHAIN, aspect_ratio=aspect, count=candidates,
+            label=prompt_data["id"], configs=CONFIGS,
+        )
+    except Exception as e:
+        print(f"    Every candidate failed: {str(e)[:120]}")
+        return [], None, None
+    paths = []
+    for index, result in enumerate(results, start=1):
+        path = image_scoring.candidate_path(backend_name, prompt_data["id"], index, backends.extension(result))
+        try:
+            backends.save(result, path)
+        except downloader.DownloadError as e:
+            print(f"    Candidate {index} failed: {str(e)[:120]}")
+            continue
+        paths.append(path)
+    return paths, backend_name, model
+
+
+def generate_image(prompt_data, candidates=1):
+    """Generate a single image using FLUX 2 Pro on Replicate.
+
+    FLUX returns one image per prediction, so `candidates` > 1 runs that
+    many predictions in parallel and promotes the best-scoring one.
+    """
     out_path = os.path.join(OUTPUT_DIR, "images", prompt_data["filename"])
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
 
-    if os.path.exists(out_path):
-        print(f"  SKIP (exists): {prompt_data['filename']}")
+    aspect = prompt_data.get("aspect_ratio", IMAGE_RECIPE["aspect_ratio"])
+    # The best of K is a different result from a single draw, so it gets its own key;
+    # a best pick from more candidates, or from any model in the chain, also satisfies this request
+    links = resilience.chain_keys(MODEL_CHAIN, prompt_data["prompt"], aspect, CONFIGS,
+                                  image_scoring.accepted_counts(candidates))
+
+    hit = asset_cache.resolve(list(links), out_path)
+    if hit is not None:
+        backend_name, model, _ = links.get(asset_cache.recorded_key(out_path), ("replicate", IMAGE_MODEL, None))
+        manifest.record_asset(prompt_data["id"], out_path, backend_name, model,
+                              prompt_data["prompt"], "replicate", status=hit)
+        provenance.record(prompt_data, out_path, model)
+    if hit == "skipped":
+        print(f"  SKIP (up to date): {prompt_data['filename']}")
         return {"status": "skipped", "id": prompt_data["id"], "file": out_path}
+    if hit == "cached":
+        print(f"  CACHED: {prompt_data['filename']}")
+        return {"status": "cached", "id": prompt_data["id"], "file": out_path}
 
     print(f"  Generating: {prompt_data['id']}")
     print(f"    Purpose: {prompt_data['purpose']}")
 
+    if candidates > 1:
+        paths, backend_name, model = generate_candidates(prompt_data, aspect, candidates)
+        if not paths:
+            return {"status": "error", "id": prompt_data["id"], "error": "no candidate succeeded"}
+        ranking = image_scoring.promote(paths, out_path)
+        key = resilience.link_key(links, backend_name, model)
+        asset_cache.store(
+            key, out_path,
+            model=model, prompt=prompt_data["prompt"],
+            aspect_ratio=aspect, config=links[key][2],
+        )
+        manifest.record_asset(prompt_data["id"], out_path, backend_name, model,
+                              prompt_data["prompt"], "replicate")
+        provenance.record(prompt_data, out_path, model)
+        print(f"  Best of {len(paths)} candidates → {out_path}")
+        print(image_scoring.describe(ranking))
+        return {"status": "success", "id": prompt_data["id"], "file": out_path}
+
     try:
-        aspect = prompt_data.get("aspect_ratio", "16:9")
-        output = replicate.run(
-            IMAGE_MODEL,
-            input={
-                "prompt": prompt_data["prompt"],
-                "aspect_ratio": aspect,
-                "output_format": "jpg",
-                "output_quality": 95,
-                "safety_tolerance": 2,
-                "steps": 30,
-            }
+        results, backend_name, model = resilience.generate_image(
+            prompt_data["prompt"], MODEL_CHAIN, aspect_ratio=aspect,
+            label=prompt_data["id"], configs=CONFIGS,
         )
 
-        # FLUX 2 Pro returns a FileOutput or URL
-        if output:
-            if hasattr(output, 'read'):
-                with open(out_path, "wb") as f:
-                    f.write(output.read())
-            elif isinstance(output, str):
-                urllib.request.urlretrieve(output, out_path)
-            elif isinstance(output, list) and len(output) > 0:
-                url = str(output[0])
-                urllib.request.urlretrieve(url, out_path)
-            else:
-                url = str(output)
-                urllib.request.urlretrieve(url, out_path)
-
-            size_kb = os.path.getsize(out_path) / 1024
-            print(f"  Saved: {out_path} ({size_kb:.0f} KB)")
+        # FLUX 2 Pro returns a FileOutput or URL; ReplicateBackend turns either into a result
+        if results:
+            download = backends.save(results[0], out_path)
+
+            key = resilience.link_key(links, backend_name, model)
+            asset_cache.store(
+                key, out_path,
+                model=model, prompt=prompt_data["prompt"],
+                aspect_ratio=aspect, config=links[key][2],
+            )
+            manifest.record_asset(prompt_data["id"], out_path, backend_name, model,
+                                  prompt_data["prompt"], "replicate")
+            provenance.record(prompt_data, out_path, model)
+            print(f"  Saved: {out_path} ({downloader.describe(download)})")
             return {"status": "success", "id": prompt_data["id"], "file": out_path}
         else:
             print(f"  No output returned for: {prompt_data['id']}")
@@ -284,40 +174,47 @@ def generate_video(prompt_data):
     out_path = os.path.join(OUTPUT_DIR, "videos", prompt_data["filename"])
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
 
-    if os.path.exists(out_path):
-        print(f"  SKIP (exists): {prompt_data['filename']}")
+    aspect = VIDEO_RECIPE["aspect_ratio"]
+    config = dict(VIDEO_RECIPE["config"], duration=prompt_data.get("duration", 8))
+    key = asset_cache.cache_key(VIDEO_MODEL, prompt_data["prompt"], aspect, config)
+
+    hit = asset_cache.resolve(key, out_path)
+    if hit is not None:
+        manifest.record_asset(prompt_data["id"], out_path, "replicate", VIDEO_MODEL,
+                              prompt_data["prompt"], "replicate-video", status=hit)
+        provenance.record(prompt_data, out_path, VIDEO_MODEL)
+    if hit == "skipped":
+        print(f"  SKIP (up to date): {prompt_data['filename']}")
         return {"status": "skipped", "id": prompt_data["id"], "file": out_path}
+    if hit == "cached":
+        print(f"  CACHED: {prompt_data['filename']}")
+        return {"status": "cached", "id": prompt_data["id"], "file": out_path}
 
     print(f"  Generating: {prompt_data['id']}")
     print(f"    Purpose: {prompt_data['purpose']}")
     print(f"    Duration: {prompt_data.get('duration', 8)}s")
 
+    backend = backends.get_backend("replicate", VIDEO_MODEL)
     try:
-        output = replicate.run(
-            VIDEO_MODEL,
-            input={
-                "prompt": prompt_data["prompt"],
-                "duration": prompt_data.get("duration", 8),
-                "aspect_ratio": "16:9",
-                "resolution": "720p",
-            }
+        results = resilience.call(
+            "replicate", VIDEO_MODEL,
+            lambda: backends.run(backend.generate_video(
+                prompt_data["prompt"], aspect_ratio=aspect, duration=config["duration"],
+                config=VIDEO_RECIPE["config"])),
         )
 
-        if output:
-            if hasattr(output, 'read'):
-                with open(out_path, "wb") as f:
-                    f.write(output.read())
-            elif isinstance(output, str):
-                urllib.request.urlretrieve(output, out_path)
-            elif isinstance(output, list) and len(output) > 0:
-                url = str(output[0])
-                urllib.request.urlretrieve(url, out_path)
-            else:
-                url = str(output)
-                urllib.request.urlretrieve(url, out_path)
-
-            size_mb = os.path.getsize(out_path) / (1024 * 1024)
-            print(f"  Saved: {out_path} ({size_mb:.1f} MB)")
+        if results:
+            download = backends.save(results[0], out_path)
+
+            asset_cache.store(
+                key, out_path,
+                model=VIDEO_MODEL, prompt=prompt_data["prompt"],
+                aspect_ratio=aspect, config=config,
+            )
+            manifest.record_asset(prompt_data["id"], out_path, "replicate", VIDEO_MODEL,
+                                  prompt_data["prompt"], "replicate-video")
+            provenance.record(prompt_data, out_path, VIDEO_MODEL)
+            print(f"  Saved: {out_path} ({downloader.describe(download)})")
             return {"status": "success", "id": prompt_data["id"], "file": out_path}
         else:
             print(f"  No output returned for: {prompt_data['id']}")
@@ -335,14 +232,7 @@ def optimize_images():
         print("  No images to optimize.")
         return
 
-    # Responsive breakpoints: mobile, tablet, desktop, retina
-    sizes = {
-        "sm": 640,
-        "md": 1024,
-        "lg": 1920,
-        "xl": 2560,
-    }
-
+    jobs = []
     for root, _, files in os.walk(src_dir):
         for fname in files:
             if not fname.lower().endswith(('.jpg', '.jpeg', '.png')):
@@ -351,46 +241,16 @@ def optimize_images():
             src = os.path.join(root, fname)
             rel = os.path.relpath(src, src_dir)
             base, _ = os.path.splitext(rel)
-
-            # Generate WebP at each breakpoint
-            for suffix, width in sizes.items():
-                webp_path = os.path.join(WEBSITE_IMAGES_DIR, f"{base}-{suffix}.webp")
-                os.makedirs(os.path.dirname(webp_path), exist_ok=True)
-
-                cmd = [
-                    "sips",
-                    "--resampleWidth", str(width),
-                    "-s", "format", "jpeg",
-                    src,
-                    "--out", webp_path.replace('.webp', '.jpg')
-                ]
-                subprocess.run(cmd, capture_output=True)
-
-                # Convert to WebP using sips (macOS) or fallback
-                jpg_tmp = webp_path.replace('.webp', '.jpg')
-                if os.path.exists(jpg_tmp):
-                    # Try cwebp if available, otherwise keep jpg
-                    try:
-                        subprocess.run(
-                            ["cwebp", "-q", "85", jpg_tmp, "-o", webp_path],
-                            capture_output=True, check=True
-                        )
-                        os.remove(jpg_tmp)
-                        size_kb = os.path.getsize(webp_path) / 1024
-                        print(f"    {webp_path} ({size_kb:.0f} KB)")
-                    except (subprocess.CalledProcessError, FileNotFoundError):
-                        # cwebp not available, keep as optimized jpg
-                        final_path = os.path.join(WEBSITE_IMAGES_DIR, f"{base}-{suffix}.jpg")
-                        os.rename(jpg_tmp, final_path)
-                        size_kb = os.path.getsize(final_path) / 1024
-                        print(f"    {final_path} ({size_kb:.0f} KB)")
+            jobs.append({"src": src, "dest_base": os.path.join(WEBSITE_IMAGES_DIR, base)})
 
             # Also copy original to website dir
             orig_dest = os.path.join(WEBSITE_IMAGES_DIR, rel)
-            os.makedirs(os.path.dirname(orig_dest), exist_ok=True)
-            subprocess.run(["cp", src, orig_dest], capture_output=True)
+            image_pipeline.copy_original(src, orig_dest)
             print(f"  Original: {orig_dest}")
 
+    # Responsive breakpoints (sm/md/lg/xl), decoded once per source
+    image_pipeline.optimize_many(jobs)
+
 
 def optimize_videos():
     """Compress videos with ffmpeg for web delivery."""
@@ -399,6 +259,9 @@ def optimize_videos():
         print("  No videos to optimize.")
         return
 
+    video_dir = os.path.join(WEBSITE_IMAGES_DIR, "..", "videos")
+    jobs = []
+    stills = []
     for root, _, files in os.walk(src_dir):
         for fname in files:
             if not fname.lower().endswith(('.mp4', '.webm')):
@@ -408,53 +271,42 @@ def optimize_videos():
             rel = os.path.relpath(src, src_dir)
             base, _ = os.path.splitext(rel)
 
-            # Desktop version (720p, H.264, optimized)
-            desktop_path = os.path.join(WEBSITE_IMAGES_DIR, "..", "videos", f"{base}-720p.mp4")
-            os.makedirs(os.path.dirname(desktop_path), exist_ok=True)
-
-            try:
-                subprocess.run([
-                    "ffmpeg", "-y", "-i", src,
-                    "-vf", "scale=1280:720:force_original_aspect_ratio=decrease",
-                    "-c:v", "libx264", "-preset", "slow", "-crf", "28",
-                    "-an",  # no audio for background videos
-                    "-movflags", "+faststart",
-                    "-pix_fmt", "yuv420p",
-                    desktop_path
-                ], capture_output=True, check=True)
-                size_mb = os.path.getsize(desktop_path) / (1024 * 1024)
-                print(f"    720p: {desktop_path} ({size_mb:.1f} MB)")
-            except (subprocess.CalledProcessError, FileNotFoundError) as e:
-                print(f"    ffmpeg error for {fname}: {str(e)[:100]}")
-                # Fallback: just copy
-                subprocess.run(["cp", src, desktop_path], capture_output=True)
-
-            # Mobile version (480p, more compressed)
-            mobile_path = os.path.join(WEBSITE_IMAGES_DIR, "..", "videos", f"{base}-480p.mp4")
-            try:
-                subprocess.run([
-                    "ffmpeg", "-y", "-i", src,
-                    "-vf", "scale=854:480:force_original_aspect_ratio=decrease",
-                    "-c:v", "libx264", "-preset", "slow", "-crf", "30",
-                    "-an",
-                    "-movflags", "+faststart",
-                    "-pix_fmt", "yuv420p",
-                    mobile_path
-                ], capture_output=True, check=True)
-                size_mb = os.path.getsize(mobile_path) / (1024 * 1024)
-                print(f"    480p: {mobile_path} ({size_mb:.1f} MB)")
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                pass
-
+            # Desktop (720p) and mobile (480p) H.264 from a single decode
+            jobs.append({
+                "label": rel,
+                "src": src,
+                "outputs": [
+                    (r, transcode.rendition_path(video_dir, base, r))
+                    for r in transcode.web_renditions()
+                ],
+            })
+            stills.append((src, os.path.join(video_dir, os.path.dirname(base)), os.path.basename(base)))
+
+    transcode.transcode_all(jobs)
+    # Poster frames at the image breakpoints + a short animated WebP preview
+    posters.make_all(stills)
     print("  Video optimization complete.")
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate Manah assets on Replicate")
+    parser.add_argument("--candidates", "-k", type=int, default=1,
+                        help="Generate K candidates per image and keep the best")
+    parser.add_argument("--trace", nargs="?", const="1", metavar="PATH", help="Write a Chrome trace of this run")
+    args = parser.parse_args()
+    if args.trace:
+        tracing.enable(args.trace)
+    candidates = max(1, args.candidates)
+    if candidates > 1:
+        image_scoring.require_numpy()
+
     print("=" * 60)
     print("  MANAH GROUP — Replicate Asset Generator")
-    print(f"  Image Model: {IMAGE_MODEL}")
+    print(f"  Image Models: {' → '.join(m for _, m in MODEL_CHAIN)}")
     print(f"  Video Model: {VIDEO_MODEL}")
     print(f"  Missing Images: {len(MISSING_IMAGES)}")
+    if candidates > 1:
+        print(f"  Candidates: {candidates} per image (best one promoted)")
     print(f"  Videos: {len(VIDEO_PROMPTS)}")
     print("=" * 60)
 
@@ -466,10 +318,10 @@ def main():
     img_results = []
     for i, prompt in enumerate(MISSING_IMAGES):
         print(f"\n[{i+1}/{len(MISSING_IMAGES)}] ────────────────────────")
-        result = generate_image(prompt)
+        result = generate_image(prompt, candidates)
         img_results.append(result)
 
-    img_success = sum(1 for r in img_results if r["status"] == "success")
+    img_success = sum(1 for r in img_results if r["status"] in ("success", "cached"))
     img_errors = sum(1 for r in img_results if r["status"] == "error")
     print(f"\n  Images: {img_success} generated, {img_errors} errors")
 
@@ -484,7 +336,7 @@ def main():
         result = generate_video(prompt)
         vid_results.append(result)
 
-    vid_success = sum(1 for r in vid_results if r["status"] == "success")
+    vid_success = sum(1 for r in vid_results if r["status"] in ("success", "cached"))
     vid_errors = sum(1 for r in vid_results if r["status"] == "error")
     print(f"\n  Videos: {vid_success} generated, {vid_errors} errors")
 
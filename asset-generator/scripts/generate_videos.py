@@ -14,6 +14,7 @@ Usage:
     python scripts/generate_videos.py --id video_hero_main  # Generate single video
     python scripts/generate_videos.py --dry-run         # Preview prompts only
     python scripts/generate_videos.py --poll             # Poll pending operations
+    python scripts/generate_videos.py --poll --watch     # Poll until every video is on disk
 ═══════════════════════════════════════════════════════════════
 """
 
@@ -22,16 +23,25 @@ import sys
 import json
 import time
 import argparse
-import urllib.request
+import threading
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from prompts import VIDEO_PROMPTS, get_all_video_prompts
-
+import asset_cache
+import backends
+import catalogue
+import downloader
+import manifest
+import provenance
+import ratelimit
+import resilience
+import tracing
+
+# VeoBackend imports the SDK lazily; check for it up front for a clear hint
 try:
-    from google import genai
-    from google.genai import types
+    from google import genai  # noqa: F401
 except ImportError:
     print("ERROR: google-genai package not installed.")
     print("Run: pip install google-genai --break-system-packages")
@@ -41,18 +51,23 @@ from dotenv import load_dotenv
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 API_KEY = os.getenv("GOOGLE_API_KEY", "")
-VIDEO_MODEL = os.getenv("VIDEO_MODEL", "veo-2.0-generate-001")
+RECIPE = catalogue.recipe("videos")  # VIDEO_MODEL overrides the model
+VIDEO_MODEL = RECIPE["model"]
+# GenerateVideosConfig fields besides duration; part of the cache key
+VIDEO_CONFIG = RECIPE["config"]
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'output', 'videos')
 OPERATIONS_FILE = os.path.join(os.path.dirname(__file__), '..', 'output', 'pending_video_operations.json')
 
-# Rate limiting for video generation (more conservative)
-BATCH_SIZE = 3  # Submit videos in batches of 3
-DELAY_BETWEEN_BATCHES = 15  # seconds between batches
+# Submissions go through the shared adaptive "veo" limiter (ratelimit.py):
+# up to VIDEO_MAX_CONCURRENCY in flight, backing off on 429/503.
 POLL_INTERVAL = 30  # seconds between status checks
+POLL_BACKOFF = 1.5  # --watch: multiply an operation's interval after each miss
+POLL_MAX_INTERVAL = 120  # --watch: never wait longer than this per operation
+POLL_WORKERS = 8  # concurrent status checks
 
 
-def setup_client():
-    """Initialize the Google GenAI client."""
+def check_api_key():
+    """Exit with setup instructions when the Google AI Studio key is missing."""
     if not API_KEY or API_KEY == "PASTE_YOUR_KEY_HERE":
         print("=" * 60)
         print("  ERROR: API key not configured!")
@@ -60,7 +75,15 @@ def setup_client():
         print("  asset-generator/.env")
         print("=" * 60)
         sys.exit(1)
-    return genai.Client(api_key=API_KEY)
+
+
+def _veo():
+    """The process-wide VeoBackend for VIDEO_MODEL (cached by backends.get_backend)."""
+    return backends.get_backend("veo", VIDEO_MODEL)
+
+
+# Guards the in-memory operations dict, which submission and poll workers share
+PENDING_LOCK = threading.Lock()
 
 
 def load_pending_operations():
@@ -74,23 +97,44 @@ def load_pending_operations():
 def save_pending_operations(operations):
     """Save pending operations to file."""
     os.makedirs(os.path.dirname(OPERATIONS_FILE), exist_ok=True)
-    with open(OPERATIONS_FILE, "w") as f:
+    tmp = OPERATIONS_FILE + ".tmp"
+    with open(tmp, "w") as f:
         json.dump(operations, f, indent=2)
+    os.replace(tmp, OPERATIONS_FILE)
+
 
+def submit_video_generation(prompt_data, output_base, pending):
+    """Submit a video generation request (async).
 
-def submit_video_generation(client, prompt_data, output_base):
-    """Submit a video generation request (async)."""
+    `pending` is the in-memory operations dict, read and written under
+    PENDING_LOCK; the caller persists it.
+    """
     filepath = os.path.join(output_base, prompt_data["filename"])
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
 
-    # Skip if already generated
-    if os.path.exists(filepath):
-        print(f"  ⏭  SKIP (exists): {prompt_data['filename']}")
-        return {"status": "skipped", "id": prompt_data["id"]}
+    # Veo 3.1 supports 5, 6, or 8 second durations
+    duration = prompt_data.get("duration", 8)
+    if duration not in (5, 6, 8):
+        duration = 8
+    aspect = RECIPE["aspect_ratio"]
+    config = dict(VIDEO_CONFIG, duration_seconds=duration)  # as VeoBackend sends it
+    key = asset_cache.cache_key(VIDEO_MODEL, prompt_data["prompt"], aspect, config)
+
+    # Skip if this exact request was already generated (files that predate
+    # the cache are adopted as up to date)
+    hit = asset_cache.resolve(key, filepath)
+    if hit is not None:
+        print(f"  ⏭  SKIP (up to date): {prompt_data['filename']}" if hit == "skipped"
+              else f"  ♻️  CACHED: {prompt_data['filename']}")
+        manifest.record_asset(prompt_data["id"], filepath, "veo", VIDEO_MODEL,
+                              prompt_data["prompt"], prompt_data.get("category"), status=hit)
+        provenance.record(prompt_data, filepath, VIDEO_MODEL)
+        return {"status": hit, "id": prompt_data["id"]}
 
     # Check if already submitted
-    pending = load_pending_operations()
-    if prompt_data["id"] in pending:
+    with PENDING_LOCK:
+        submitted = prompt_data["id"] in pending
+    if submitted:
         print(f"  ⏭  SKIP (pending): {prompt_data['id']} — use --poll to check status")
         return {"status": "pending", "id": prompt_data["id"]}
 
@@ -101,35 +145,26 @@ def submit_video_generation(client, prompt_data, output_base):
     try:
         # Veo 3.1 supports: 720p, 1080p, 4K resolution
         # Supports: 16:9, 9:16 aspect ratios
-        # Supports: 5s, 6s, 8s durations
         # Supports native audio generation
-        duration = prompt_data.get("duration", 8)
-        # Veo 3.1 supports 5, 6, or 8 second durations
-        if duration not in (5, 6, 8):
-            duration = 8
-
-        operation = client.models.generate_videos(
-            model=VIDEO_MODEL,
-            prompt=prompt_data["prompt"],
-            config=types.GenerateVideosConfig(
-                number_of_videos=1,
-                duration_seconds=duration,
-                aspect_ratio="16:9",
-                resolution="1080p",
-            ),
+        backend = _veo()
+        op_name = resilience.call(
+            "veo", VIDEO_MODEL,
+            lambda: backends.run(backend.submit_video(
+                prompt_data["prompt"], aspect_ratio=aspect, duration=duration, config=VIDEO_CONFIG)),
         )
 
         # Store the operation for later polling
-        op_name = operation.name if hasattr(operation, 'name') else str(operation)
-        pending = load_pending_operations()
-        pending[prompt_data["id"]] = {
-            "operation_name": op_name,
-            "filename": prompt_data["filename"],
-            "filepath": filepath,
-            "purpose": prompt_data["purpose"],
-            "submitted_at": datetime.now().isoformat(),
-        }
-        save_pending_operations(pending)
+        with PENDING_LOCK:
+            pending[prompt_data["id"]] = {
+                "operation_name": op_name,
+                "filename": prompt_data["filename"],
+                "filepath": filepath,
+                "purpose": prompt_data["purpose"],
+                "category": prompt_data.get("category"),
+                "prompt_hash": manifest.prompt_hash(prompt_data["prompt"]),
+                "cache_key": key,
+                "submitted_at": datetime.now().isoformat(),
+            }
 
         print(f"  📤 Submitted! Operation: {op_name[:50]}...")
         print(f"     Run `python scripts/generate_videos.py --poll` to check status")
@@ -141,7 +176,68 @@ def submit_video_generation(client, prompt_data, output_base):
         return {"status": "error", "id": prompt_data["id"], "error": error_msg}
 
 
-def poll_pending_operations(client):
+def poll_operation(video_id, op_data):
+    """Check one pending operation and download the video if it is done.
+
+    Returns "done" (remove from queue), "pending" (still processing) or
+    "error" (transient failure, keep in queue).
+    """
+    tag = f"  [{video_id}]"
+    try:
+        results = backends.run(_veo().poll_video(op_data["operation_name"]))
+    except Exception as e:
+        error_str = str(e)
+        if getattr(e, "status", None) == 404 or "not found" in error_str.lower() or "404" in error_str:
+            print(f"{tag} ❌ Operation expired or not found. Removing from queue.")
+            return "done"
+        print(f"{tag} ❌ Poll error: {error_str[:120]}")
+        return "error"
+
+    if results is None:
+        elapsed = ""
+        if "submitted_at" in op_data:
+            submitted = datetime.fromisoformat(op_data["submitted_at"])
+            mins = int((datetime.now() - submitted).total_seconds()) // 60
+            elapsed = f" (submitted {mins}m ago)"
+        print(f"{tag} ⏳ Still processing{elapsed}")
+        return "pending"
+
+    print(f"{tag} ✅ COMPLETE!")
+    try:
+        if not results:
+            print(f"{tag} ⚠️  Operation done but no generated videos in result")
+            return "done"
+
+        # Inline bytes, or a URI fetched with the API key (VeoBackend sets the header)
+        if results[0]["url"]:
+            print(f"{tag} 📥 Downloading from URI...")
+        download = backends.save(results[0], op_data["filepath"])
+        print(f"{tag} 📁 Saved: {op_data['filepath']} ({downloader.describe(download)})")
+        manifest.record_asset(video_id, op_data["filepath"], "veo", VIDEO_MODEL,
+                              category=op_data.get("category"), digest=op_data.get("prompt_hash"))
+        asset = catalogue.get(video_id, group="videos")
+        if op_data.get("cache_key"):
+            asset_cache.store(op_data["cache_key"], op_data["filepath"], model=VIDEO_MODEL,
+                              prompt=asset["prompt"] if asset else None)
+        # Only when the catalogue still asks for what was submitted
+        if asset and manifest.prompt_hash(asset["prompt"]) == op_data.get("prompt_hash"):
+            provenance.record(asset, op_data["filepath"], VIDEO_MODEL)
+        return "done"
+    except Exception as save_err:
+        print(f"{tag} ⚠️  Download error: {str(save_err)[:100]} — keeping in queue")
+        return "error"
+
+
+def poll_many(pending, video_ids):
+    """Poll several operations concurrently. Returns {video_id: outcome}."""
+    if not video_ids:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(POLL_WORKERS, len(video_ids))) as pool:
+        outcomes = pool.map(lambda vid: poll_operation(vid, pending[vid]), video_ids)
+        return dict(zip(video_ids, outcomes))
+
+
+def poll_pending_operations():
     """Check status of pending video operations and download completed ones."""
     pending = load_pending_operations()
     if not pending:
@@ -149,71 +245,12 @@ def poll_pending_operations(client):
         return
 
     print(f"  Polling {len(pending)} pending operation(s)...\n")
-    completed = []
-
-    for video_id, op_data in pending.items():
-        print(f"  [{video_id}]")
-        print(f"    Operation: {op_data['operation_name'][:60]}...")
-
-        try:
-            # Reconstruct the operation object from the stored name
-            operation = types.GenerateVideosOperation(name=op_data['operation_name'])
-            result = client.operations.get(operation)
-
-            if hasattr(result, 'done') and result.done:
-                print(f"    ✅ COMPLETE!")
-
-                try:
-                    resp = getattr(result, 'result', None) or getattr(result, 'response', None)
-                    if resp and hasattr(resp, 'generated_videos') and resp.generated_videos:
-                        vid = resp.generated_videos[0].video
-                        saved = False
-                        if vid:
-                            # Try video_bytes first, then authenticated URI download
-                            if hasattr(vid, 'video_bytes') and vid.video_bytes:
-                                with open(op_data["filepath"], "wb") as f:
-                                    f.write(vid.video_bytes)
-                                saved = True
-                            elif hasattr(vid, 'uri') and vid.uri:
-                                print(f"    📥 Downloading from URI...")
-                                # URI requires API key for authentication
-                                separator = "&" if "?" in vid.uri else "?"
-                                auth_uri = f"{vid.uri}{separator}key={API_KEY}"
-                                urllib.request.urlretrieve(auth_uri, op_data["filepath"])
-                                saved = True
-                        if saved:
-                            file_size = os.path.getsize(op_data["filepath"])
-                            print(f"    📁 Saved: {op_data['filepath']} ({file_size / (1024*1024):.1f} MB)")
-                            completed.append(video_id)
-                        else:
-                            print(f"    ⚠️  No video data available (no bytes or URI)")
-                            completed.append(video_id)
-                    else:
-                        print(f"    ⚠️  Operation done but no generated videos in result")
-                        completed.append(video_id)
-                except Exception as save_err:
-                    print(f"    ⚠️  Download error: {str(save_err)[:100]}")
-                    print(f"    Keeping in queue — re-run --poll to retry")
-            else:
-                elapsed = ""
-                if "submitted_at" in op_data:
-                    from datetime import datetime as dt
-                    submitted = dt.fromisoformat(op_data["submitted_at"])
-                    mins = (dt.now() - submitted).seconds // 60
-                    elapsed = f" (submitted {mins}m ago)"
-                print(f"    ⏳ Still processing{elapsed}")
-
-        except Exception as e:
-            error_str = str(e)
-            if "not found" in error_str.lower() or "404" in error_str:
-                print(f"    ❌ Operation expired or not found. Removing from queue.")
-                completed.append(video_id)
-            else:
-                print(f"    ❌ Poll error: {error_str[:120]}")
+    outcomes = poll_many(pending, list(pending))
 
     # Remove completed operations
-    for vid_id in completed:
-        del pending[vid_id]
+    for vid_id, outcome in outcomes.items():
+        if outcome == "done":
+            del pending[vid_id]
     save_pending_operations(pending)
 
     remaining = len(pending)
@@ -223,36 +260,92 @@ def poll_pending_operations(client):
         print(f"\n  All videos complete!")
 
 
-def generate_videos(category=None, single_id=None, dry_run=False, poll=False, batch_size=None):
-    """Generate videos or poll for pending operations."""
-    client = setup_client()
+def watch_pending_operations():
+    """Poll until every pending operation has finished.
+
+    Each operation has its own schedule: polled immediately, then every
+    POLL_INTERVAL seconds growing by POLL_BACKOFF per miss up to
+    POLL_MAX_INTERVAL. Videos are downloaded as soon as they complete and
+    the operations file is written at most once per cycle.
+    """
+    pending = load_pending_operations()
+    if not pending:
+        print("  No pending video operations found.")
+        return
+
+    print(f"  Watching {len(pending)} pending operation(s) (Ctrl+C to stop)...\n")
+    now = time.monotonic()
+    schedule = {vid: {"next": now, "interval": POLL_INTERVAL} for vid in pending}
+    start = now
+
+    try:
+        while pending:
+            now = time.monotonic()
+            due = [vid for vid in pending if schedule[vid]["next"] <= now]
+            outcomes = poll_many(pending, due)
+
+            changed = False
+            for vid, outcome in outcomes.items():
+                if outcome == "done":
+                    del pending[vid]
+                    del schedule[vid]
+                    changed = True
+                else:
+                    state = schedule[vid]
+                    state["next"] = time.monotonic() + state["interval"]
+                    state["interval"] = min(state["interval"] * POLL_BACKOFF, POLL_MAX_INTERVAL)
+            if changed:
+                save_pending_operations(pending)
+
+            if pending:
+                wake = min(state["next"] for state in schedule.values())
+                time.sleep(max(0.0, wake - time.monotonic()))
+    except KeyboardInterrupt:
+        save_pending_operations(pending)
+        print(f"\n  Stopped. {len(pending)} video(s) still pending — run --poll --watch to resume.")
+        return
+
+    print(f"\n  All videos complete! ({time.monotonic() - start:.0f}s)")
+
+
+def generate_videos(category=None, single_id=None, dry_run=False, poll=False, batch_size=None, watch=False):
+    """Generate videos or poll for pending operations.
+
+    With `watch`, keep polling after submission (or instead of a one-shot
+    poll) until every video has been downloaded.
+    """
+    check_api_key()
 
     if poll:
-        poll_pending_operations(client)
+        if watch:
+            watch_pending_operations()
+        else:
+            poll_pending_operations()
         return
 
-    all_prompts = get_all_video_prompts()
+    all_prompts = catalogue.group("videos")
 
     if single_id:
-        prompts = [p for p in all_prompts if p["id"] == single_id]
+        prompt = catalogue.get(single_id, group="videos")
+        prompts = [prompt] if prompt else []
         if not prompts:
             print(f"Error: No prompt found with id '{single_id}'")
             sys.exit(1)
     elif category:
-        prompts = [p for p in all_prompts if p["category"] == category]
+        prompts = catalogue.select(group="videos", category=category)
         if not prompts:
             print(f"Error: No prompts found for category '{category}'")
-            print(f"Available categories: {list(VIDEO_PROMPTS.keys())}")
+            print(f"Available categories: {catalogue.load().categories('videos')}")
             sys.exit(1)
     else:
         prompts = all_prompts
 
-    total_batches = (len(prompts) + BATCH_SIZE - 1) // BATCH_SIZE
+    limiter = ratelimit.limiter("veo")
 
     print("=" * 60)
     print(f"  MANAH GROUP — Video Generation")
     print(f"  Model: {VIDEO_MODEL}")
-    print(f"  Videos to generate: {len(prompts)} ({total_batches} batches of {BATCH_SIZE})")
+    print(f"  Videos to generate: {len(prompts)} (adaptive, up to {limiter.maximum} submissions in flight)")
     print(f"  Output: {OUTPUT_DIR}")
     if dry_run:
         print(f"  MODE: DRY RUN (no API calls)")
@@ -268,39 +361,41 @@ def generate_videos(category=None, single_id=None, dry_run=False, poll=False, ba
         return
 
     results = []
-    batches = [prompts[i:i + BATCH_SIZE] for i in range(0, len(prompts), BATCH_SIZE)]
-
-    for batch_idx, batch in enumerate(batches):
-        print(f"\n{'─' * 60}")
-        print(f"  BATCH {batch_idx + 1}/{len(batches)} ({len(batch)} videos)")
-        print(f"{'─' * 60}")
-
-        batch_had_submission = False
-        for i, prompt_data in enumerate(batch):
-            overall_idx = batch_idx * BATCH_SIZE + i
-            print(f"\n[{overall_idx + 1}/{len(prompts)}] ─────────────────────────────")
-            result = submit_video_generation(client, prompt_data, OUTPUT_DIR)
-            results.append(result)
-            if result["status"] == "submitted":
-                batch_had_submission = True
-
-        if batch_idx < len(batches) - 1 and batch_had_submission:
-            print(f"\n  ⏳ Batch {batch_idx + 1} done. Waiting {DELAY_BETWEEN_BATCHES}s before next batch...")
-            time.sleep(DELAY_BETWEEN_BATCHES)
+    pending = load_pending_operations()
+
+    print()
+    try:
+        with ThreadPoolExecutor(max_workers=limiter.maximum) as pool:
+            futures = [pool.submit(submit_video_generation, p, OUTPUT_DIR, pending) for p in prompts]
+            for done, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                results.append(result)
+                print(f"[{done}/{len(prompts)}] {result['id']}: {result['status']}")
+    finally:
+        # One write for the whole batch, also when it is interrupted or a worker raises
+        with PENDING_LOCK:
+            snapshot = dict(pending)
+        save_pending_operations(snapshot)
 
     submitted = sum(1 for r in results if r["status"] == "submitted")
-    skipped = sum(1 for r in results if r["status"] in ("skipped", "pending"))
+    skipped = sum(1 for r in results if r["status"] in ("skipped", "cached", "pending"))
     errors = sum(1 for r in results if r["status"] == "error")
 
     print("\n" + "=" * 60)
     print(f"  SUBMISSION COMPLETE")
     print(f"  Submitted: {submitted} | Skipped: {skipped} | Errors: {errors}")
-    if submitted > 0:
+    stats = limiter.snapshot()
+    print(f"  Veo concurrency settled at {stats['limit']} (peak {stats['peak']}, {stats['throttled']} throttled)")
+    if submitted > 0 and not watch:
         print(f"\n  ⏳ Videos are generating asynchronously.")
         print(f"  Run this to check status:")
         print(f"  python scripts/generate_videos.py --poll")
     print("=" * 60)
 
+    if watch:
+        print()
+        watch_pending_operations()
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generate Manah website videos")
@@ -308,12 +403,17 @@ if __name__ == "__main__":
     parser.add_argument("--id", help="Generate single video by ID")
     parser.add_argument("--dry-run", "-d", action="store_true", help="Preview prompts only")
     parser.add_argument("--poll", "-p", action="store_true", help="Poll pending video operations")
+    parser.add_argument("--watch", "-w", action="store_true", help="Keep polling until all videos are downloaded")
     parser.add_argument("--list", "-l", action="store_true", help="List all video IDs")
+    parser.add_argument("--trace", nargs="?", const="1", metavar="PATH", help="Write a Chrome trace of this run")
     args = parser.parse_args()
 
+    if args.trace:
+        tracing.enable(args.trace)
+
     if args.list:
-        for p in get_all_video_prompts():
+        for p in catalogue.group("videos"):
             print(f"  {p['id']:30s} [{p['category']:12s}] {p.get('duration', 8)}s — {p['purpose']}")
         sys.exit(0)
 
-    generate_videos(category=args.category, single_id=args.id, dry_run=args.dry_run, poll=args.poll)
+    generate_videos(category=args.category, single_id=args.id, dry_run=args.dry_run, poll=args.poll, watch=args.watch)
@@ -0,0 +1,364 @@
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — In-Process Image Optimisation Pipeline
+═══════════════════════════════════════════════════════════════
+Decodes each source image once with Pillow, derives every
+responsive breakpoint from the decoded pixels and encodes
+WebP / AVIF / JPEG straight from memory. Replaces the old
+`sips` → temp JPEG → `cwebp` subprocess chain, which needed
+two process spawns per breakpoint and only worked on macOS.
+
+Work is spread across a process pool, one source image per task.
+
+Output naming matches the previous scripts:
+    {dest_base}-{suffix}.{ext}   e.g. leaders/cfo-md.webp
+
+OPTIMIZE_MODE=ssim replaces the fixed quality with a per-rendition
+search: for each breakpoint and format, binary-search the encoder
+quality for the smallest file whose SSIM against the downscaled
+pixels (NumPy, luma, 8×8 windows) still reaches
+OPTIMIZE_TARGET_SSIM. Flat graphics settle at low q, detailed
+aerials at high q, and the search never goes above the fixed-mode
+quality, so it can only shrink a file relative to fixed mode. WebP and AVIF are searched side by side; WebP
+is always kept as the fallback and AVIF only where it is smaller
+at the same target.
+
+Each source also gets a responsive manifest entry (dimensions,
+bytes and format of every rendition, blurhash/LQIP/dominant
+colour) via responsive.py; optimize_many() refreshes the
+website's typed module once the batch is done.
+═══════════════════════════════════════════════════════════════
+"""
+
+import io
+import os
+import shutil
+import manifest
+import tracing
+import responsive
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Responsive breakpoints: mobile, tablet, desktop, retina
+BREAKPOINTS = {
+    "sm": 640,
+    "md": 1024,
+    "lg": 1920,
+    "xl": 2560,
+}
+
+# "fixed": ENCODER_OPTIONS quality for every image; "ssim": search quality per rendition
+OPTIMIZE_MODE = os.getenv("OPTIMIZE_MODE", "fixed")
+# q85 WebP already scores only 0.97–0.99 on our renders, so 0.98 would often need
+# more bits than fixed mode; 0.95 roughly halved the WebP bytes on catalogue heroes
+TARGET_SSIM = float(os.getenv("OPTIMIZE_TARGET_SSIM", "0.95"))
+
+# Formats written for every breakpoint, e.g. OPTIMIZE_FORMATS=webp,avif
+DEFAULT_FORMATS = tuple(f.strip() for f in os.getenv(
+    "OPTIMIZE_FORMATS", "webp,avif" if OPTIMIZE_MODE == "ssim" else "webp").split(",") if f.strip())
+
+EXTENSIONS = {"webp": "webp", "avif": "avif", "jpeg": "jpg"}
+
+ENCODER_OPTIONS = {
+    "webp": {"format": "WEBP", "quality": 85, "method": 4},
+    "avif": {"format": "AVIF", "quality": 60, "speed": 6},
+    "jpeg": {"format": "JPEG", "quality": 85, "optimize": True, "progressive": True},
+}
+
+# Quality bounds for the SSIM search, capped at the ENCODER_OPTIONS quality
+# (the top bound is used if nothing reaches the target)
+QUALITY_RANGE = {"webp": (40, 95), "avif": (25, 90), "jpeg": (50, 95)}
+# Faster encoder settings for search probes; the chosen quality is re-encoded with ENCODER_OPTIONS
+SEARCH_OPTIONS = {"avif": {"speed": 8}}
+# Smaller breakpoints search ±this many steps around the larger one's quality first
+SEARCH_WINDOW = 8
+
+MAX_WORKERS = int(os.getenv("OPTIMIZE_WORKERS", "0")) or os.cpu_count() or 1
+
+
+def require_pillow():
+    """Exit with an install hint when Pillow is missing."""
+    if Image is None:
+        raise SystemExit("ERROR: Pillow not installed. Run: pip install -r requirements.txt")
+
+
+def supported(fmt):
+    """Return True if this Pillow build can encode `fmt`."""
+    if fmt == "jpeg":
+        return True
+    return bool(features.check(fmt))
+
+
+def decode(src_path):
+    """Decode an image once into a fully loaded RGB/RGBA Pillow image."""
+    with Image.open(src_path) as im:
+        im.load()
+        has_alpha = im.mode in ("RGBA", "LA") or (im.mode == "P" and "transparency" in im.info)
+        return im.convert("RGBA" if has_alpha else "RGB")
+
+
+def resize_to_width(img, width):
+    """Downscale to `width` keeping aspect ratio. Never upscales."""
+    if width >= img.width:
+        return img
+    height = max(1, round(img.height * width / img.width))
+    return img.resize((width, height), Image.LANCZOS, reducing_gap=2.0)
+
+
+def encode(img, fmt, **overrides):
+    """Encode a decoded image to bytes in memory."""
+    options = dict(ENCODER_OPTIONS[fmt])
+    options.update(overrides)
+    if fmt == "jpeg" and img.mode != "RGB":
+        img = img.convert("RGB")
+    buf = io.BytesIO()
+    img.save(buf, **options)
+    return buf.getvalue()
+
+
+# ─── Quality search ───
+
+def _luma(img):
+    return np.asarray(img.convert("L"), dtype=np.float64)
+
+
+def _window_mean(x, k):
+    """Mean over every k×k window (valid positions) via an integral image."""
+    c = np.pad(x, ((1, 0), (1, 0))).cumsum(0).cumsum(1)
+    return (c[k:, k:] - c[:-k, k:] - c[k:, :-k] + c[:-k, :-k]) / (k * k)
+
+
+def ssim(reference, candidate, window=8):
+    """Mean SSIM between two luma arrays of the same shape."""
+    k = min(window, *reference.shape)
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    mu_x, mu_y = _window_mean(reference, k), _window_mean(candidate, k)
+    var_x = _window_mean(reference * reference, k) - mu_x ** 2
+    var_y = _window_mean(candidate * candidate, k) - mu_y ** 2
+    cov = _window_mean(reference * candidate, k) - mu_x * mu_y
+    s = ((2 * mu_x * mu_y + c1) * (2 * cov + c2)) / ((mu_x ** 2 + mu_y ** 2 + c1) * (var_x + var_y + c2))
+    return float(s.mean())
+
+
+def _measure(img, fmt, q, reference):
+    data = encode(img, fmt, quality=q, **SEARCH_OPTIONS.get(fmt, {}))
+    with Image.open(io.BytesIO(data)) as decoded:
+        return data, q, ssim(reference, _luma(decoded))
+
+
+def search_quality(img, fmt, target=None, reference=None, hint=None):
+    """Smallest-quality encode of `img` whose SSIM reaches `target`.
+
+    Binary search over QUALITY_RANGE[fmt], topped at the fixed-mode
+    quality; returns (data, quality, score).
+    `hint` (the quality found for the next larger breakpoint) narrows the
+    first pass to ±SEARCH_WINDOW around it, widening only if the answer
+    lies outside.
+    """
+    target = TARGET_SSIM if target is None else target
+    reference = _luma(img) if reference is None else reference
+    lo, hi = QUALITY_RANGE[fmt]
+    hi = min(hi, ENCODER_OPTIONS[fmt]["quality"])
+
+    def bisect(lo, hi):
+        best = None
+        while lo <= hi:
+            found = _measure(img, fmt, (lo + hi) // 2, reference)
+            if found[2] >= target:
+                best, hi = found, found[1] - 1
+            else:
+                lo = found[1] + 1
+        return best
+
+    if hint is None:
+        best = bisect(lo, hi)
+    else:
+        w_lo, w_hi = max(lo, hint - SEARCH_WINDOW), min(hi, hint + SEARCH_WINDOW)
+        best = bisect(w_lo, w_hi)
+        if best is None:
+            best = bisect(w_hi + 1, hi)
+        elif best[1] == w_lo and w_lo > lo:
+            best = bisect(lo, w_lo - 1) or best
+    # Even the top of the range misses the target: keep the best we can do
+    data, q, score = best or _measure(img, fmt, hi, reference)
+    if fmt in SEARCH_OPTIONS:
+        data = encode(img, fmt, quality=q)  # final encode at full effort, same q
+    return data, q, score
+
+
+def encode_rendition(img, formats, asset="", suffix="", hints=None):
+    """[(fmt, data, extra)] to write for one breakpoint.
+
+    Fixed mode encodes every format at its ENCODER_OPTIONS quality. SSIM
+    mode searches each format (seeded from `hints`, {fmt: quality}, which it
+    updates); the first non-AVIF format is always kept as the fallback and
+    the others only where they come out smaller.
+    """
+    if OPTIMIZE_MODE != "ssim":
+        out = []
+        for fmt in formats:
+            with tracing.span("encode", asset=asset, suffix=suffix, format=fmt,
+                              width=img.width, height=img.height) as s:
+                data = encode(img, fmt)
+                s.set(bytes=len(data))
+            out.append((fmt, data, {}))
+        return out
+
+    if np is None:
+        raise SystemExit("ERROR: OPTIMIZE_MODE=ssim needs numpy. Run: pip install -r requirements.txt")
+    reference = _luma(img)
+    found = []
+    for fmt in formats:
+        with tracing.span("search", asset=asset, suffix=suffix, format=fmt,
+                          width=img.width, height=img.height) as s:
+            data, q, score = search_quality(img, fmt, reference=reference,
+                                            hint=None if hints is None else hints.get(fmt))
+            s.set(bytes=len(data), quality=q, ssim=round(score, 4))
+        if hints is not None:
+            hints[fmt] = q
+        found.append((fmt, data, {"quality": q, "ssim": round(score, 4)}))
+    fallback = next((f for f in found if f[0] != "avif"), found[0])
+    return [fallback] + [f for f in found if f is not fallback and len(f[1]) < len(fallback[1])]
+
+
+def write_atomic(path, data):
+    """Write bytes to `path` via a temp file so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def resolve_formats(formats=None):
+    """Requested formats with unsupported ones replaced by JPEG (the old cwebp fallback)."""
+    resolved = []
+    for fmt in formats or DEFAULT_FORMATS:
+        fmt = fmt if supported(fmt) else "jpeg"
+        if fmt not in resolved:
+            resolved.append(fmt)
+    return resolved
+
+
+def render(img, dest_base, sizes=None, formats=None, asset=None):
+    """Write every breakpoint × format rendition of a decoded image; returns the rendition dicts.
+
+    The last (smallest) rendition's pixels are returned too, for placeholders.
+    """
+    sizes = sizes or BREAKPOINTS
+    resolved = resolve_formats(formats)
+    asset = asset or os.path.basename(dest_base)
+    renditions = []
+    hints = {}
+    previous, kept = None, None
+    # Largest first so each step is a downscale of the previous one
+    current = img
+    for suffix, width in sorted(sizes.items(), key=lambda kv: -kv[1]):
+        with tracing.span("resize", asset=asset, suffix=suffix, width=width):
+            current = resize_to_width(current, width)
+        # Breakpoints wider than the source get the same pixels: reuse the encode
+        if current is not previous:
+            kept = encode_rendition(current, resolved, asset, suffix, hints)
+            previous = current
+        # A format that lost the size comparison must not leave an older file behind
+        for fmt in set(resolved) - {k[0] for k in kept}:
+            stale = f"{dest_base}-{suffix}.{EXTENSIONS[fmt]}"
+            if os.path.exists(stale):
+                os.remove(stale)
+        for fmt, data, extra in kept:
+            path = f"{dest_base}-{suffix}.{EXTENSIONS[fmt]}"
+            with tracing.span("write", asset=asset, path=path, bytes=len(data)):
+                write_atomic(path, data)
+            renditions.append({
+                "suffix": suffix,
+                "format": fmt,
+                "path": path,
+                "width": current.width,
+                "height": current.height,
+                "bytes": len(data),
+                **extra,
+            })
+    return renditions, current
+
+
+def optimize_image(src_path, dest_base, sizes=None, formats=None):
+    """Write every breakpoint × format rendition of one source image.
+
+    Unsupported formats fall back to JPEG, mirroring the old cwebp fallback.
+    Returns a dict with the source dimensions and a list of renditions.
+    """
+    require_pillow()
+    asset = os.path.basename(dest_base)
+    with tracing.span("decode", asset=asset, src=src_path) as s:
+        img = decode(src_path)
+        s.set(width=img.width, height=img.height)
+    renditions, smallest = render(img, dest_base, sizes, formats, asset)
+
+    manifest.record_renditions(src_path, renditions, formats=EXTENSIONS)
+    # The smallest rendition is plenty for a 32 px placeholder
+    with tracing.span("placeholders", asset=asset):
+        extra = responsive.placeholders(smallest)
+    responsive.write(src_path, dest_base, img.width, img.height, renditions, extra)
+    return {
+        "src": src_path,
+        "width": img.width,
+        "height": img.height,
+        "renditions": renditions,
+        **extra,
+    }
+
+
+def _optimize_job(job):
+    result = optimize_image(job["src"], job["dest_base"], job.get("sizes"), job.get("formats"))
+    # Spans recorded in this worker travel back with the result
+    result["trace"] = tracing.drain()
+    return result
+
+
+def optimize_many(jobs, max_workers=None):
+    """Run optimize_image() for each job dict across a process pool.
+
+    Each job: {"src": path, "dest_base": path-without-suffix, "sizes": ..., "formats": ...}
+    Returns results in completion order; failed jobs carry an "error" key.
+    """
+    require_pillow()
+    jobs = list(jobs)
+    if not jobs:
+        return []
+
+    workers = min(max_workers or MAX_WORKERS, len(jobs))
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_optimize_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"  ❌ Optimise failed: {job['src']}: {str(e)[:120]}")
+                results.append({"src": job["src"], "error": str(e), "renditions": []})
+                continue
+            tracing.ingest(result.pop("trace", []))
+            print(f"  {os.path.basename(job['src'])} ({result['width']}x{result['height']})")
+            for r in result["renditions"]:
+                searched = f", q{r['quality']} ssim {r['ssim']:.3f}" if "quality" in r else ""
+                print(f"    {r['path']} ({r['bytes'] / 1024:.0f} KB{searched})")
+            results.append(result)
+    responsive.export()
+    return results
+
+
+def copy_original(src_path, dest_path):
+    """Copy a source file into the website tree, preserving timestamps."""
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    with tracing.span("publish.copy", src=src_path, dest=dest_path, bytes=os.path.getsize(src_path)):
+        shutil.copy2(src_path, dest_path)
@@ -0,0 +1,180 @@
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — Candidate Scoring & Best-Pick
+═══════════════════════════════════════════════════════════════
+With `--candidates K` a generator asks for K images of the same
+prompt, stores every candidate under output/candidates/, and
+promotes the best one to the canonical filename.
+
+"Best" is a cheap local score, computed on a downscaled copy
+with vectorised NumPy (no per-pixel Python loops):
+
+  sharpness  variance of the Laplacian, relative to the sharpest
+             candidate in the set
+  exposure   mean luminance close to mid-grey, few clipped pixels
+  palette    how close pixels sit to the brand colours
+             Navy #0A1628 and Gold #C8A96E
+═══════════════════════════════════════════════════════════════
+"""
+
+import os
+import json
+import shutil
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+CANDIDATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'output', 'candidates')
+
+BRAND_PALETTE = {
+    "navy": (0x0A, 0x16, 0x28),
+    "gold": (0xC8, 0xA9, 0x6E),
+}
+
+# Weights of each metric in the combined score (all metrics are 0..1)
+WEIGHTS = {"sharpness": 0.45, "exposure": 0.30, "palette": 0.25}
+
+ANALYSIS_SIDE = 512  # longest side of the copy that is scored
+CLIP_LOW, CLIP_HIGH = 0.02, 0.98
+
+# Largest promoted best-of-K that a request for fewer candidates still accepts
+MAX_ACCEPTED_CANDIDATES = 8
+
+
+def require_numpy():
+    """Exit with an install hint when NumPy or Pillow is missing."""
+    if np is None or Image is None:
+        raise SystemExit("ERROR: --candidates needs numpy and Pillow. Run: pip install -r requirements.txt")
+
+
+def accepted_counts(candidates, maximum=MAX_ACCEPTED_CANDIDATES):
+    """Candidate counts whose result satisfies a request for `candidates`, requested first.
+
+    A best-of-K pick stands in for any request for fewer, so generators pass
+    the cache key of every count here to asset_cache.resolve(): a plain run
+    keeps the file a `--candidates K` run promoted instead of replacing it.
+    """
+    return [candidates] + list(range(candidates + 1, max(candidates, maximum) + 1))
+
+
+def candidate_config(config, candidates):
+    """`config` as cached for a best-of-`candidates` request.
+
+    Imagen asks for the count itself (number_of_images); other backends
+    get one request per candidate, so the count is only tagged on for K > 1
+    and single-image keys stay what they were.
+    """
+    if "number_of_images" in config:
+        return dict(config, number_of_images=candidates)
+    return dict(config, candidates=candidates) if candidates > 1 else config
+
+
+def candidate_dir(namespace, asset_id):
+    """Directory holding every candidate for one asset, e.g. candidates/imagen/hero_main_01."""
+    return os.path.join(CANDIDATES_DIR, namespace, asset_id)
+
+
+def candidate_path(namespace, asset_id, index, ext):
+    """Path of candidate `index` (1-based) for one asset."""
+    return os.path.join(candidate_dir(namespace, asset_id), f"candidate-{index}{ext}")
+
+
+def load_rgb(path, max_side=ANALYSIS_SIDE):
+    """Decode, downscale and return an (H, W, 3) float32 array in 0..1."""
+    with Image.open(path) as im:
+        im = im.convert("RGB")
+        im.thumbnail((max_side, max_side), Image.BILINEAR)
+        return np.asarray(im, dtype=np.float32) / 255.0
+
+
+def luminance(rgb):
+    """Rec. 709 luma of an (H, W, 3) array."""
+    return rgb @ np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+
+
+def laplacian_variance(gray):
+    """Variance of the 4-neighbour Laplacian — higher is sharper."""
+    lap = (gray[1:-1, :-2] + gray[1:-1, 2:] + gray[:-2, 1:-1] + gray[2:, 1:-1]
+           - 4.0 * gray[1:-1, 1:-1])
+    return float(lap.var())
+
+
+def exposure_score(gray):
+    """1.0 for a mid-grey mean with no clipping, falling towards 0."""
+    mean_term = 1.0 - min(1.0, abs(float(gray.mean()) - 0.5) * 2.0)
+    clipped = float(np.mean((gray < CLIP_LOW) | (gray > CLIP_HIGH)))
+    return max(0.0, mean_term * (1.0 - clipped))
+
+
+def palette_score(rgb):
+    """1.0 when every pixel sits on a brand colour, 0.0 at the far corner of RGB space."""
+    palette = np.array(list(BRAND_PALETTE.values()), dtype=np.float32) / 255.0
+    pixels = rgb.reshape(-1, 1, 3)
+    # Distance of every pixel to its nearest palette colour, in one broadcast
+    nearest = np.sqrt(((pixels - palette[None, :, :]) ** 2).sum(axis=2)).min(axis=1)
+    return float(1.0 - nearest.mean() / np.sqrt(3.0))
+
+
+def measure(path):
+    """Raw metrics for one image."""
+    rgb = load_rgb(path)
+    gray = luminance(rgb)
+    return {
+        "path": path,
+        "sharpness_raw": laplacian_variance(gray),
+        "exposure": round(exposure_score(gray), 4),
+        "palette": round(palette_score(rgb), 4),
+    }
+
+
+def rank(paths):
+    """Score every candidate and return them best first."""
+    require_numpy()
+    results = [measure(p) for p in paths]
+    sharpest = max((r["sharpness_raw"] for r in results), default=0.0) or 1.0
+    for r in results:
+        r["sharpness"] = round(r["sharpness_raw"] / sharpest, 4)
+        r["score"] = round(sum(WEIGHTS[m] * r[m] for m in WEIGHTS), 4)
+    return sorted(results, key=lambda r: r["score"], reverse=True)
+
+
+def promote(paths, dest):
+    """Rank `paths`, copy the winner to `dest` and write scores.json next to the candidates.
+
+    Returns the ranking (best first).
+    """
+    ranking = rank(paths)
+    best = ranking[0]["path"]
+
+    os.makedirs(os.path.dirname(os.path.abspath(dest)), exist_ok=True)
+    tmp = f"{dest}.{os.getpid()}.tmp"
+    shutil.copyfile(best, tmp)
+    os.replace(tmp, dest)
+
+    with open(os.path.join(os.path.dirname(best), "scores.json"), "w") as f:
+        json.dump({
+            "scored_at": datetime.now().isoformat(),
+            "promoted": best,
+            "dest": dest,
+            "weights": WEIGHTS,
+            "ranking": ranking,
+        }, f, indent=2)
+    return ranking
+
+
+def describe(ranking):
+    """One line per candidate, best first, for the console."""
+    lines = []
+    for i, r in enumerate(ranking):
+        mark = "★" if i == 0 else " "
+        lines.append(f"    {mark} {os.path.basename(r['path'])}: {r['score']:.3f} "
+                     f"(sharp {r['sharpness']:.2f}, exposure {r['exposure']:.2f}, palette {r['palette']:.2f})")
+    return "\n".join(lines)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — manah-assets: one entry point for the pipeline
+═══════════════════════════════════════════════════════════════
+    manah-assets list      [--group G] [--category C] [--backend B] [--kind K] [--missing]
+    manah-assets plan      [selection] [--graph]          stale assets, why, est. time/calls
+    manah-assets apply     [selection] [--no-publish]    regenerate only the stale assets
+    manah-assets generate  [selection] [--no-publish]    generate → optimise → publish
+    manah-assets poll      [--watch]                      pending Veo operations
+    manah-assets optimise  [selection]                    web renditions of existing files
+    manah-assets publish   [selection]                    copy existing originals to the website
+    manah-assets status    [--category C] [--backend B] [--stale] [--missing-renditions]
+    manah-assets dupes     [--distance N] [--json]      near-duplicate images (dedupe.py)
+    manah-assets manifest                                 rewrite the website's image + video manifests
+
+selection: --id ID, --group, --category, --backend, --kind. With no
+selection, generate covers what generate_all.py covers and plan/apply
+the whole catalogue. Staleness comes from provenance.py.
+
+Only the catalogue is imported at start-up. The task graph, Pillow,
+ffmpeg helpers, python-dotenv and the provider SDKs (google-genai,
+replicate) are imported by the commands that use them, so `list`
+starts in well under 100 ms and works without API keys or SDKs:
+
+    python -X importtime scripts/manah_assets.py list 2>&1 | sort -t'|' -k2 -n | tail
+═══════════════════════════════════════════════════════════════
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import catalogue
+
+STAGE_CHOICES = ("generate", "optimise", "publish")
+
+
+def _selection(args):
+    """Catalogue assets picked by the selection flags, or None when none were given."""
+    if getattr(args, "id", None):
+        try:
+            asset = catalogue.get(args.id, group=args.group, backend=args.backend)
+        except catalogue.CatalogueError as e:
+            sys.exit(f"Error: {e}")
+        if asset is None:
+            sys.exit(f"Error: no asset with id '{args.id}'")
+        return [asset]
+    if not any((args.group, args.category, args.backend, args.kind)):
+        return None
+    if args.group and args.group not in catalogue.load().by_group:
+        sys.exit(f"Error: unknown group '{args.group}' (one of: {', '.join(catalogue.load().by_group)})")
+    assets = catalogue.select(group=args.group, category=args.category, backend=args.backend, kind=args.kind)
+    if not assets:
+        sys.exit("Error: no assets match that selection")
+    return list(assets)
+
+
+def _run(args, stages):
+    import generate_all
+
+    if getattr(args, "trace", None):
+        import tracing
+        tracing.enable(args.trace)
+    assets = _selection(args)
+    if assets is None:
+        generate_all.load_env()
+        assets = generate_all.select_assets()
+    generate_all.run_generation(assets=assets, stages=stages)
+
+
+# ─── Commands ───
+
+def cmd_list(args):
+    assets = catalogue.select(group=args.group, category=args.category, backend=args.backend, kind=args.kind)
+    if args.missing:
+        assets = [a for a in assets if not os.path.exists(a.abspath)]
+    for a in assets:
+        mark = "✓" if os.path.exists(a.abspath) else "·"
+        print(f"  {mark} {a.id:36s} {a.group:17s} {a.backend:9s} {a.category:16s} {a.path}")
+    print(f"\n  {len(assets)} asset(s)")
+
+
+def _stale(args):
+    import provenance
+
+    result = provenance.plan(_selection(args))
+    provenance.print_plan(result)
+    return [asset for asset, _ in result["stale"]]
+
+
+def cmd_plan(args):
+    stale = _stale(args)
+    if args.graph and stale:
+        import generate_all
+        generate_all.run_generation(dry_run=True, assets=stale, stages=tuple(args.stage or STAGE_CHOICES))
+
+
+def cmd_apply(args):
+    stale = _stale(args)
+    if not stale:
+        return
+    import generate_all
+
+    if args.trace:
+        import tracing
+        tracing.enable(args.trace)
+    generate_all.run_generation(assets=stale, stages=("generate",) if args.no_publish else STAGE_CHOICES)
+
+
+def cmd_generate(args):
+    _run(args, ("generate",) if args.no_publish else STAGE_CHOICES)
+
+
+def cmd_optimise(args):
+    _run(args, ("optimise",))
+
+
+def cmd_publish(args):
+    _run(args, ("publish",))
+
+
+def cmd_poll(args):
+    if args.trace:
+        import tracing
+        tracing.enable(args.trace)
+    import generate_videos
+    generate_videos.generate_videos(poll=True, watch=args.watch)
+
+
+def cmd_status(args):
+    import generate_all
+    if args.reindex:
+        generate_all.reindex()
+    generate_all.check_status(category=args.category, backend=args.backend,
+                              stale=args.stale, missing_renditions=args.missing_renditions)
+
+
+def cmd_dupes(args):
+    import dedupe
+    radius = dedupe.DUPE_DISTANCE if args.distance is None else args.distance
+    dedupe.report(radius=radius, as_json=args.json)
+
+
+def cmd_manifest(args):
+    import responsive
+    import video_sources
+    count = responsive.export()
+    print(f"  🗂  {count} assets → {os.path.relpath(responsive.TS_MODULE)}")
+    count = video_sources.export()
+    print(f"  🎞  {count} videos → {os.path.relpath(video_sources.TS_MODULE)}")
+
+
+def _add_selection(parser):
+    parser.add_argument("--id", help="One asset (add --group if the id is in several groups)")
+    parser.add_argument("--group", "-g", help="Catalogue group (images, videos, sectors, news, …)")
+    parser.add_argument("--category", "-c", help="Asset category")
+    parser.add_argument("--backend", "-b", help="imagen, veo, replicate or gemini")
+    parser.add_argument("--kind", "-k", choices=("image", "video"), help="Images or videos only")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="manah-assets", description="Manah Group — asset pipeline")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    p = commands.add_parser("list", help="List catalogue assets (no SDKs, no API keys)")
+    _add_selection(p)
+    p.add_argument("--missing", action="store_true", help="Only assets not generated yet")
+    p.set_defaults(func=cmd_list)
+
+    p = commands.add_parser("plan", help="Which assets are stale against their provenance, and why")
+    _add_selection(p)
+    p.add_argument("--graph", action="store_true", help="Also print the task graph apply would run")
+    p.add_argument("--stage", action="append", choices=STAGE_CHOICES, help="--graph: only these stages (repeatable)")
+    p.set_defaults(func=cmd_plan)
+
+    p = commands.add_parser("apply", help="Regenerate exactly the assets plan reports as stale")
+    _add_selection(p)
+    p.add_argument("--no-publish", action="store_true", help="Generate only; skip optimise/publish")
+    p.add_argument("--trace", nargs="?", const="1", metavar="PATH", help="Write a Chrome trace of this run")
+    p.set_defaults(func=cmd_apply)
+
+    for name, func, text in (("generate", cmd_generate, "Generate, optimise and publish assets"),
+                             ("optimise", cmd_optimise, "Build web renditions of already generated assets"),
+                             ("publish", cmd_publish, "Copy already generated originals to the website")):
+        p = commands.add_parser(name, help=text)
+        _add_selection(p)
+        p.add_argument("--trace", nargs="?", const="1", metavar="PATH", help="Write a Chrome trace of this run")
+        if name == "generate":
+            p.add_argument("--no-publish", action="store_true", help="Generate only; skip optimise/publish")
+        p.set_defaults(func=func)
+
+    p = commands.add_parser("poll", help="Poll pending Veo operations and download finished videos")
+    p.add_argument("--watch", "-w", action="store_true", help="Keep polling until every video is downloaded")
+    p.add_argument("--trace", nargs="?", const="1", metavar="PATH", help="Write a Chrome trace of this run")
+    p.set_defaults(func=cmd_poll)
+
+    p = commands.add_parser("status", help="Generation status from the manifest")
+    p.add_argument("--category", "-c", help="Only this category")
+    p.add_argument("--backend", "-b", help="Only this backend")
+    p.add_argument("--stale", action="store_true", help="Only assets whose prompt changed")
+    p.add_argument("--missing-renditions", action="store_true", help="Only assets without web renditions")
+    p.add_argument("--reindex", action="store_true", help="Index existing output files first")
+    p.set_defaults(func=cmd_status)
+
+    p = commands.add_parser("dupes", help="Near-duplicate images across output/ and the website")
+    p.add_argument("--distance", "-d", type=int, default=None, help="Max pHash distance of 64 (default DUPE_DISTANCE=10)")
+    p.add_argument("--json", action="store_true", help="Machine-readable pairs")
+    p.set_defaults(func=cmd_dupes)
+
+    p = commands.add_parser("manifest", help="Rewrite the website's image and video manifests from output/")
+    p.set_defaults(func=cmd_manifest)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — Asset Manifest Index
+═══════════════════════════════════════════════════════════════
+A single SQLite index (output/manifest.sqlite) that every
+generator writes to when an asset is produced, fetched from the
+cache or confirmed up to date, and that the image/video
+optimisers write their renditions to.
+
+    assets      one row per generated file (keyed by its path):
+                id, category, backend, model, prompt hash,
+                bytes, dimensions, timestamps
+    renditions  one row per derived web file, linked to the
+                source asset path, and whether it was on disk when
+                last written or re-checked (`present`)
+    provenance  what produced each generated file: style name and
+                hashes of the style text and prompt body, model,
+                config, aspect ratio, duration (see provenance.py)
+
+`generate_all.py --status` answers from this index instead of
+stat()ing every prompt and re-reading the JSON logs; only
+`--reindex` looks at the filesystem (index_existing,
+check_renditions).
+
+Each call opens its own short-lived connection, so the index can
+be written from worker threads and from the optimiser's process
+pool without sharing a connection.
+═══════════════════════════════════════════════════════════════
+"""
+
+import os
+import sqlite3
+import hashlib
+from datetime import datetime
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+MANIFEST_PATH = os.getenv(
+    "MANAH_MANIFEST",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'output', 'manifest.sqlite'),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    path         TEXT PRIMARY KEY,
+    id           TEXT NOT NULL,
+    category     TEXT,
+    backend      TEXT,
+    model        TEXT,
+    prompt_hash  TEXT,
+    status       TEXT,
+    bytes        INTEGER,
+    width        INTEGER,
+    height       INTEGER,
+    created_at   TEXT,
+    updated_at   TEXT
+);
+CREATE INDEX IF NOT EXISTS assets_id ON assets(id);
+CREATE INDEX IF NOT EXISTS assets_category ON assets(category);
+CREATE INDEX IF NOT EXISTS assets_backend ON assets(backend);
+
+CREATE TABLE IF NOT EXISTS renditions (
+    path          TEXT PRIMARY KEY,
+    source        TEXT NOT NULL,
+    name          TEXT,
+    format        TEXT,
+    bytes         INTEGER,
+    width         INTEGER,
+    height        INTEGER,
+    bitrate_kbps  INTEGER,
+    updated_at    TEXT,
+    present       INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS renditions_source ON renditions(source);
+
+CREATE TABLE IF NOT EXISTS provenance (
+    path          TEXT PRIMARY KEY,
+    id            TEXT NOT NULL,
+    grp           TEXT,
+    style         TEXT,
+    style_hash    TEXT,
+    body_hash     TEXT,
+    model         TEXT,
+    config        TEXT,
+    aspect_ratio  TEXT,
+    duration      INTEGER,
+    recorded_at   TEXT
+);
+"""
+
+# Columns added after the first release, created on manifests that predate them
+MIGRATIONS = (
+    ("renditions", "present", "INTEGER NOT NULL DEFAULT 1"),
+)
+
+_initialised = set()
+
+
+def _norm(path):
+    return os.path.normpath(os.path.abspath(path))
+
+
+class _Connection:
+    """Open the manifest, create the schema once per process, commit and close on exit."""
+
+    def __enter__(self):
+        path = _norm(MANIFEST_PATH)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        if path not in _initialised:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+            for table, column, decl in MIGRATIONS:
+                if column not in {r["name"] for r in self.conn.execute(f"PRAGMA table_info({table})")}:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+            _initialised.add(path)
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.commit()
+        self.conn.close()
+
+
+def prompt_hash(prompt):
+    """Short, stable hash of a prompt string (used to detect stale assets)."""
+    if prompt is None:
+        return None
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+
+
+def image_size(path):
+    """(width, height) from the image header, or (None, None)."""
+    if Image is None:
+        return None, None
+    try:
+        with Image.open(path) as im:
+            return im.size
+    except (OSError, ValueError):
+        return None, None
+
+
+def record_asset(asset_id, path, backend, model=None, prompt=None, category=None,
+                 status="success", width=None, height=None, digest=None):
+    """Insert or update the row for a generated file.
+
+    Call on success, cache hits and up-to-date skips, so files that predate
+    the manifest are indexed on the next run. Dimensions are read from the
+    image header when not given. `digest` is a precomputed prompt_hash(),
+    for callers that no longer hold the prompt text.
+    """
+    if not os.path.exists(path):
+        return
+    if width is None and path.lower().endswith((".png", ".jpg", ".jpeg", ".webp")):
+        width, height = image_size(path)
+    now = datetime.now().isoformat()
+    with _Connection() as conn:
+        conn.execute(
+            """
+            INSERT INTO assets (path, id, category, backend, model, prompt_hash, status,
+                                bytes, width, height, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                id=excluded.id, category=excluded.category, backend=excluded.backend,
+                model=COALESCE(excluded.model, assets.model),
+                prompt_hash=COALESCE(excluded.prompt_hash, assets.prompt_hash),
+                status=excluded.status, bytes=excluded.bytes,
+                width=excluded.width, height=excluded.height, updated_at=excluded.updated_at
+            """,
+            (_norm(path), asset_id, category, backend, model, digest or prompt_hash(prompt), status,
+             os.path.getsize(path), width, height, now, now),
+        )
+
+
+def record_renditions(source, renditions, replace=True, formats=None):
+    """Replace the rendition rows derived from `source` in the given formats.
+
+    `renditions` are dicts with at least "path" and "bytes"; "name"/"suffix",
+    "format", "width", "height" and "bitrate_kbps" are stored when present.
+    Only rows in `formats` (default: the formats of `renditions`) are dropped
+    first, so a video's transcodes (h264/av1/vp9) and its posters
+    (webp/avif) replace their own rows without touching each other's.
+    With replace=False the rows are only added.
+    """
+    now = datetime.now().isoformat()
+    rows = [
+        (_norm(r["path"]), _norm(source), r.get("name") or r.get("suffix"), r.get("format"),
+         r.get("bytes"), r.get("width"), r.get("height"), r.get("bitrate_kbps"), now, 1)
+        for r in renditions
+    ]
+    with _Connection() as conn:
+        if replace:
+            formats = set(formats) if formats is not None else {r[3] for r in rows}
+            named = sorted(f for f in formats if f is not None)
+            if named:
+                conn.execute(
+                    f"DELETE FROM renditions WHERE source = ? AND format IN ({', '.join('?' * len(named))})",
+                    (_norm(source), *named),
+                )
+            if None in formats:
+                conn.execute("DELETE FROM renditions WHERE source = ? AND format IS NULL", (_norm(source),))
+        conn.executemany(
+            "INSERT OR REPLACE INTO renditions (path, source, name, format, bytes, width, height,"
+            " bitrate_kbps, updated_at, present) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+
+
+def assets(category=None, backend=None, asset_id=None):
+    """Asset rows (as dicts) matching the filters, each with its "renditions" list."""
+    clauses, params = [], []
+    for column, value in (("category", category), ("backend", backend), ("id", asset_id)):
+        if value:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    with _Connection() as conn:
+        rows = [dict(r) for r in conn.execute(
+            f"SELECT * FROM assets {where} ORDER BY backend, category, id", params)]
+        by_source = {}
+        for r in conn.execute("SELECT * FROM renditions ORDER BY path"):
+            by_source.setdefault(r["source"], []).append(dict(r))
+    for row in rows:
+        row["renditions"] = by_source.get(row["path"], [])
+    return rows
+
+
+def keys():
+    """{(backend, id)} for every indexed asset, from one query."""
+    with _Connection() as conn:
+        return {(r[0], r[1]) for r in conn.execute("SELECT backend, id FROM assets")}
+
+
+def check_renditions():
+    """Re-check every rendition row against the filesystem; returns how many are missing.
+
+    The only place renditions are stat()ed: `--status` reads `present` as
+    recorded here or when the optimiser wrote the file.
+    """
+    with _Connection() as conn:
+        paths = [r[0] for r in conn.execute("SELECT path FROM renditions")]
+        flags = [(1 if os.path.exists(path) else 0, path) for path in paths]
+        conn.executemany("UPDATE renditions SET present = ? WHERE path = ?", flags)
+    return sum(1 for present, _ in flags if not present)
+
+
+def counts_by(column):
+    """{value: number of assets} for `column` (e.g. "backend" or "category")."""
+    if column not in ("backend", "category", "status"):
+        raise ValueError(f"Cannot group by {column!r}")
+    with _Connection() as conn:
+        return {r[0]: r[1] for r in conn.execute(
+            f"SELECT {column}, COUNT(*) FROM assets GROUP BY {column} ORDER BY {column}")}
+
+
+def record_provenance(path, asset_id, group, style=None, style_hash=None, body_hash=None,
+                      model=None, config=None, aspect_ratio=None, duration=None):
+    """Insert or replace the record of what produced `path` (`config` as JSON text)."""
+    with _Connection() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO provenance VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (_norm(path), asset_id, group, style, style_hash, body_hash, model, config,
+             aspect_ratio, duration, datetime.now().isoformat()),
+        )
+
+
+def provenance():
+    """{normalised path: provenance row (dict)} for every recorded file."""
+    with _Connection() as conn:
+        return {r["path"]: dict(r) for r in conn.execute("SELECT * FROM provenance")}
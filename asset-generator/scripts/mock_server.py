@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — Local Mock Generation Server
+═══════════════════════════════════════════════════════════════
+A deterministic stand-in for the image/video APIs, so throughput
+and concurrency can be measured offline without spending quota.
+
+Endpoints (all POST, JSON in / JSON out):
+    /v1/images        {"prompt", "aspect_ratio", "count"} → MockBackend
+    /v1/videos        {"prompt", "duration"}               → MockBackend
+    /v1beta/models/<model>:generateContent                 → Gemini REST shape,
+                      so GeminiRestBackend(base_url=...) runs unchanged
+    GET /stats        request / error counters
+
+Images are PNGs whose colours derive from the prompt hash (same
+prompt → same bytes). Videos are an ffmpeg test pattern when
+ffmpeg is installed, otherwise a small placeholder MP4 container.
+Latency, jitter and the error rate are configurable; errors
+are drawn from a seeded RNG, so a run is reproducible.
+
+Usage:
+    python scripts/mock_server.py                       # :8765, 0.5s latency
+    python scripts/mock_server.py --latency 2 --error-rate 0.1 --error-status 429
+    GEMINI_API_BASE=http://127.0.0.1:8765/v1beta/models python scripts/generate_sector_images.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import os
+import re
+import json
+import time
+import zlib
+import random
+import shutil
+import struct
+import base64
+import hashlib
+import argparse
+import threading
+import subprocess
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+DEFAULT_PORT = 8765
+IMAGE_WIDTH = 1024
+FFMPEG = os.getenv("FFMPEG", "ffmpeg")
+
+ASPECT_RATIOS = {"1:1": (1, 1), "16:9": (16, 9), "9:16": (9, 16), "4:3": (4, 3), "3:4": (3, 4)}
+
+
+# ─── Synthetic outputs ───
+
+def synthetic_png(prompt, aspect_ratio="16:9", width=IMAGE_WIDTH):
+    """A vertical-gradient PNG whose colours are derived from the prompt."""
+    w_ratio, h_ratio = ASPECT_RATIOS.get(aspect_ratio or "16:9", (16, 9))
+    height = max(1, width * h_ratio // w_ratio)
+    seed = hashlib.sha256((prompt or "").encode("utf-8")).digest()
+    top, bottom = seed[:3], seed[3:6]
+
+    rows = []
+    for y in range(height):
+        t = y / max(1, height - 1)
+        colour = bytes(int(a + (b - a) * t) for a, b in zip(top, bottom))
+        rows.append(b"\x00" + colour * width)  # filter type 0 per scanline
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)  # 8-bit RGB
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(b"".join(rows), 6)) + chunk(b"IEND", b""))
+
+
+_video_cache = {}
+_video_lock = threading.Lock()
+
+
+def synthetic_mp4(duration=4):
+    """An H.264 test pattern (via ffmpeg), or a placeholder MP4 container without it."""
+    duration = max(1, min(int(duration or 4), 8))
+    with _video_lock:
+        if duration in _video_cache:
+            return _video_cache[duration]
+        data = None
+        if shutil.which(FFMPEG):
+            proc = subprocess.run(
+                [FFMPEG, "-hide_banner", "-loglevel", "error",
+                 "-f", "lavfi", "-i", f"testsrc2=size=1280x720:rate=24:duration={duration}",
+                 "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+                 "-movflags", "+frag_keyframe+empty_moov", "-f", "mp4", "pipe:1"],
+                capture_output=True,
+            )
+            if proc.returncode == 0 and proc.stdout:
+                data = proc.stdout
+        if data is None:
+            ftyp = struct.pack(">I4s4sI4s4s", 24, b"ftyp", b"isom", 512, b"isom", b"mp41")
+            payload = hashlib.sha256(str(duration).encode()).digest() * 2048
+            data = ftyp + struct.pack(">I4s", 8 + len(payload), b"free") + payload
+        _video_cache[duration] = data
+        return data
+
+
+# ─── Server ───
+
+class MockState:
+    """Latency/error settings plus counters, shared by all handler threads."""
+
+    def __init__(self, latency=0.5, jitter=0.0, error_rate=0.0, error_status=503,
+                 retry_after=None, seed=0, image_width=IMAGE_WIDTH):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.image_width = image_width
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "images": 0, "videos": 0, "in_flight": 0, "max_in_flight": 0}
+
+    def draw(self):
+        """(delay seconds, fail?) for the next request, from the seeded RNG."""
+        with self._lock:
+            delay = self.latency + self._rng.uniform(-self.jitter, self.jitter)
+            fail = self._rng.random() < self.error_rate
+            self.stats["requests"] += 1
+            self.stats["errors"] += int(fail)
+            return max(0.0, delay), fail
+
+    def count(self, key, n=1):
+        with self._lock:
+            self.stats[key] += n
+            if key == "in_flight":
+                self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+
+
+GENERATE_CONTENT = re.compile(r"^/v1beta/models/([^/:]+):generateContent$")
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    server_version = "ManahMock/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json(200, self.server.state.stats)
+        else:
+            self._send_json(404, {"error": {"code": 404, "message": "not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"code": 400, "message": "invalid JSON"}})
+            return
+
+        path = self.path.split("?", 1)[0]
+        gemini = GENERATE_CONTENT.match(path)
+        if path not in ("/v1/images", "/v1/videos") and not gemini:
+            self._send_json(404, {"error": {"code": 404, "message": f"no route for {path}"}})
+            return
+
+        state = self.server.state
+        delay, fail = state.draw()
+        state.count("in_flight")
+        try:
+            time.sleep(delay)
+        finally:
+            state.count("in_flight", -1)
+
+        if fail:
+            headers = {}
+            if state.retry_after is not None:
+                headers["Retry-After"] = str(state.retry_after)
+            self._send_json(state.error_status,
+                            {"error": {"code": state.error_status, "message": "mock failure"}}, headers)
+            return
+
+        if gemini:
+            prompt = payload.get("contents", [{}])[0].get("parts", [{}])[0].get("text", "")
+            png = synthetic_png(prompt, "16:9", state.image_width)
+            state.count("images")
+            self._send_json(200, {"candidates": [{"content": {"parts": [
+                {"text": "mock"},
+                {"inlineData": {"mimeType": "image/png", "data": base64.b64encode(png).decode()}},
+            ]}}]})
+        elif path == "/v1/images":
+            count = max(1, int(payload.get("count", 1)))
+            outputs = []
+            for i in range(count):
+                png = synthetic_png(f"{payload.get('prompt', '')}#{i}", payload.get("aspect_ratio"), state.image_width)
+                outputs.append({"mime": "image/png", "data": base64.b64encode(png).decode()})
+            state.count("images", count)
+            self._send_json(200, {"outputs": outputs})
+        else:
+            mp4 = synthetic_mp4(payload.get("duration", 4))
+            state.count("videos")
+            self._send_json(200, {"outputs": [{"mime": "video/mp4", "data": base64.b64encode(mp4).decode()}]})
+
+
+class MockServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer that can also be started in the background from Python."""
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, verbose=False, **settings):
+        super().__init__((host, port), MockHandler)
+        self.state = MockState(**settings)
+        self.verbose = verbose
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve from a background thread; returns self."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manah local mock generation server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="± seconds added to latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status for failures")
+    parser.add_argument("--retry-after", type=float, help="Retry-After seconds sent with failures")
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed for latency/errors")
+    parser.add_argument("--image-width", type=int, default=IMAGE_WIDTH)
+    parser.add_argument("--verbose", "-v", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    server = MockServer(
+        args.host, args.port, verbose=args.verbose,
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        error_status=args.error_status, retry_after=args.retry_after,
+        seed=args.seed, image_width=args.image_width,
+    )
+    print(f"  Mock server on {server.url} — latency {args.latency}s ±{args.jitter}s, "
+          f"errors {args.error_rate:.0%} (HTTP {args.error_status})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n  Stats: {server.state.stats}")
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
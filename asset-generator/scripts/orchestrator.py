@@ -0,0 +1,152 @@
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — In-Process Task Graph Orchestrator
+═══════════════════════════════════════════════════════════════
+A small DAG scheduler used by generate_all.py. Every asset becomes
+a chain of tasks (generate → download → optimise → publish); each
+task names the backend it uses and a priority.
+
+Ready tasks are started highest-priority first (lowest number),
+as long as their backend has a free slot, so Veo submissions,
+Imagen calls, Replicate calls and local ffmpeg/Pillow work all
+overlap instead of running one phase after another.
+
+If a task fails, everything downstream of it is skipped; the rest
+of the graph keeps running.
+═══════════════════════════════════════════════════════════════
+"""
+
+import heapq
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import tracing
+
+
+class Task:
+    """One unit of work in the graph.
+
+    `fn` is called with a dict {dependency_id: dependency_result}.
+    """
+
+    def __init__(self, task_id, fn, deps=(), backend="local", priority=100, label=None):
+        self.id = task_id
+        self.fn = fn
+        self.deps = list(deps)
+        self.backend = backend
+        self.priority = priority
+        self.label = label or task_id
+        self.state = "pending"
+        self.result = None
+        self.error = None
+        self.ready_at = None
+        self.started_at = None
+        self.finished_at = None
+
+
+class TaskGraph:
+    """A DAG of Tasks executed with per-backend concurrency limits."""
+
+    def __init__(self):
+        self.tasks = {}
+        self._dependents = {}
+
+    def add(self, task_id, fn, deps=(), backend="local", priority=100, label=None):
+        """Add a task; dependencies must already be in the graph."""
+        if task_id in self.tasks:
+            raise ValueError(f"Duplicate task id: {task_id}")
+        for dep in deps:
+            if dep not in self.tasks:
+                raise ValueError(f"Unknown dependency {dep!r} for {task_id!r}")
+        task = Task(task_id, fn, deps, backend, priority, label)
+        self.tasks[task_id] = task
+        self._dependents[task_id] = []
+        for dep in deps:
+            self._dependents[dep].append(task_id)
+        return task
+
+    def _skip_downstream(self, task_id):
+        for child_id in self._dependents[task_id]:
+            child = self.tasks[child_id]
+            if child.state == "pending":
+                child.state = "skipped"
+                child.error = f"upstream {task_id} failed"
+                self._skip_downstream(child_id)
+
+    def run(self, limits, default_limit=1, on_finish=None):
+        """Execute the graph. `limits` maps backend name → max concurrent tasks.
+
+        Returns the tasks dict. `on_finish(task)` is called after every task.
+        """
+        remaining = {tid: len(t.deps) for tid, t in self.tasks.items()}
+        running = {}
+        ready = []
+        seq = itertools.count()
+
+        def push(task):
+            task.ready_at = time.time()
+            heapq.heappush(ready, (task.priority, next(seq), task.id))
+
+        for tid, count in remaining.items():
+            if count == 0:
+                push(self.tasks[tid])
+
+        def execute(task):
+            task.started_at = time.time()
+            tracing.record("queue", task.ready_at, task.started_at, cat="scheduler",
+                           task=task.id, backend=task.backend)
+            inputs = {dep: self.tasks[dep].result for dep in task.deps}
+            with tracing.span(task.id, cat="task", backend=task.backend, priority=task.priority):
+                return task.fn(inputs)
+
+        workers = max(1, sum(limits.values()) or default_limit)
+        futures = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while ready or futures:
+                # Start every ready task whose backend has a free slot
+                deferred = []
+                while ready:
+                    item = heapq.heappop(ready)
+                    task = self.tasks[item[2]]
+                    limit = limits.get(task.backend, default_limit)
+                    if running.get(task.backend, 0) >= limit:
+                        deferred.append(item)
+                        continue
+                    running[task.backend] = running.get(task.backend, 0) + 1
+                    task.state = "running"
+                    futures[pool.submit(execute, task)] = task
+                for item in deferred:
+                    heapq.heappush(ready, item)
+
+                if not futures:
+                    break
+                done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = futures.pop(future)
+                    task.finished_at = time.time()
+                    running[task.backend] -= 1
+                    try:
+                        task.result = future.result()
+                        task.state = "done"
+                    except Exception as e:
+                        task.state = "failed"
+                        task.error = str(e)
+                    if task.state == "done":
+                        for child_id in self._dependents[task.id]:
+                            remaining[child_id] -= 1
+                            child = self.tasks[child_id]
+                            if remaining[child_id] == 0 and child.state == "pending":
+                                push(child)
+                    else:
+                        self._skip_downstream(task.id)
+                    if on_finish:
+                        on_finish(task)
+        return self.tasks
+
+    def summary(self):
+        """Counts of tasks per state, e.g. {"done": 40, "failed": 1}."""
+        counts = {}
+        for task in self.tasks.values():
+            counts[task.state] = counts.get(task.state, 0) + 1
+        return counts
@@ -0,0 +1,170 @@
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — Video Poster Frames & Animated Previews
+═══════════════════════════════════════════════════════════════
+Gives every video something to paint before the MP4 arrives:
+
+    {base}-poster-{sm,md,lg,xl}.{webp,avif}   still, image breakpoints
+    {base}-preview.webp                        ~3 s animated, 320 px
+
+The poster frame is chosen from the first POSTER_WINDOW seconds:
+ffmpeg decodes them to small greyscale frames piped straight into
+NumPy, each frame is scored on sharpness (variance of the
+Laplacian) and motion (mean difference to its neighbours), and the
+sharpest, stillest frame is extracted at full resolution and run
+through image_pipeline's breakpoints — so it also gets a
+responsive manifest entry with blurhash/LQIP/dominant colour.
+
+Posters and the preview are recorded in the manifest next to the
+video's transcoded renditions.
+═══════════════════════════════════════════════════════════════
+"""
+
+import io
+import os
+import subprocess
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+import manifest
+import tracing
+import transcode
+import responsive
+import image_pipeline
+
+POSTER_WINDOW = 1.0  # seconds of video considered for the poster
+SAMPLE_WIDTH = 160  # frames are scored at this width
+POSTER_FORMATS = ("webp", "avif")
+
+PREVIEW_SECONDS = float(os.getenv("PREVIEW_SECONDS", "3"))
+PREVIEW_FPS = 6
+PREVIEW_WIDTH = 320
+PREVIEW_QUALITY = 30
+
+
+def require_numpy():
+    """Exit with an install hint when NumPy or Pillow is missing."""
+    if np is None or Image is None:
+        raise SystemExit("ERROR: poster frames need numpy and Pillow. Run: pip install -r requirements.txt")
+
+
+def _frames(src, seconds, width, pix_fmt="gray", fps=None):
+    """Decode the first `seconds` of `src` at `width` into an (n, h, w[, 3]) uint8 array."""
+    info = transcode.probe(src)
+    if not info["width"] or not info["height"]:
+        raise RuntimeError(f"cannot read dimensions of {src}")
+    height = max(2, round(info["height"] * width / info["width"] / 2) * 2)
+    vf = f"scale={width}:{height}" + (f",fps={fps}" if fps else "")
+    raw = subprocess.run(
+        [transcode.FFMPEG, "-hide_banner", "-loglevel", "error", "-t", str(seconds), "-i", src,
+         "-vf", vf, "-f", "rawvideo", "-pix_fmt", pix_fmt, "-"],
+        capture_output=True, check=True,
+    ).stdout
+    channels = 3 if pix_fmt == "rgb24" else 1
+    frame = width * height * channels
+    n = len(raw) // frame
+    if n == 0:
+        raise RuntimeError(f"no frames decoded from {src}")
+    shape = (n, height, width, 3) if channels == 3 else (n, height, width)
+    return np.frombuffer(raw[:n * frame], dtype=np.uint8).reshape(shape)
+
+
+def score_frames(frames):
+    """(sharpness, motion) per frame of an (n, h, w) greyscale stack."""
+    f = frames.astype(np.float32)
+    # 4-neighbour Laplacian on the interior, variance per frame
+    lap = (f[:, :-2, 1:-1] + f[:, 2:, 1:-1] + f[:, 1:-1, :-2] + f[:, 1:-1, 2:] - 4 * f[:, 1:-1, 1:-1])
+    sharpness = lap.reshape(len(f), -1).var(axis=1)
+    if len(f) == 1:
+        return sharpness, np.zeros(1, dtype=np.float32)
+    diff = np.abs(np.diff(f, axis=0)).reshape(len(f) - 1, -1).mean(axis=1)
+    # A frame's motion: the mean of its differences to the previous and next frame
+    motion = np.empty(len(f), dtype=np.float32)
+    motion[0], motion[-1] = diff[0], diff[-1]
+    motion[1:-1] = (diff[:-1] + diff[1:]) / 2
+    return sharpness, motion
+
+
+def pick_frame(src, window=POSTER_WINDOW):
+    """Index of the sharpest, stillest frame in the first `window` seconds, and its scores."""
+    frames = _frames(src, window, SAMPLE_WIDTH)
+    sharpness, motion = score_frames(frames)
+    score = sharpness / max(float(sharpness.max()), 1e-6) - motion / max(float(motion.max()), 1e-6)
+    best = int(score.argmax())
+    return best, {"frames": len(frames), "sharpness": round(float(sharpness[best]), 1),
+                  "motion": round(float(motion[best]), 2)}
+
+
+def extract_frame(src, index):
+    """Frame number `index` of `src` at full resolution, as an RGB Pillow image."""
+    png = subprocess.run(
+        [transcode.FFMPEG, "-hide_banner", "-loglevel", "error", "-i", src,
+         "-vf", f"select=eq(n\\,{index})", "-frames:v", "1", "-f", "image2pipe", "-vcodec", "png", "-"],
+        capture_output=True, check=True,
+    ).stdout
+    with Image.open(io.BytesIO(png)) as im:
+        return im.convert("RGB")
+
+
+def preview(src, dest):
+    """Short, small animated WebP of the start of `src`; returns its rendition dict."""
+    frames = _frames(src, PREVIEW_SECONDS, PREVIEW_WIDTH, pix_fmt="rgb24", fps=PREVIEW_FPS)
+    images = [Image.fromarray(f) for f in frames]
+    buf = io.BytesIO()
+    images[0].save(buf, format="WEBP", save_all=True, append_images=images[1:],
+                   duration=round(1000 / PREVIEW_FPS), loop=0, quality=PREVIEW_QUALITY, method=6,
+                   minimize_size=True)
+    image_pipeline.write_atomic(dest, buf.getvalue())
+    return {"name": "preview", "format": "webp", "path": dest, "bytes": len(buf.getvalue()),
+            "width": images[0].width, "height": images[0].height}
+
+
+def make_posters(src, out_dir, base, sizes=None):
+    """Poster renditions + animated preview for one video, recorded next to its transcodes."""
+    require_numpy()
+    label = base
+    with tracing.span("poster.pick", asset=label, src=src) as s:
+        index, scores = pick_frame(src)
+        s.set(frame=index, **scores)
+    with tracing.span("poster.extract", asset=label, frame=index):
+        frame = extract_frame(src, index)
+
+    dest_base = os.path.join(out_dir, f"{base}-poster")
+    renditions, smallest = image_pipeline.render(frame, dest_base, sizes, POSTER_FORMATS, label)
+    with tracing.span("placeholders", asset=label):
+        extra = responsive.placeholders(smallest)
+    responsive.write(src, dest_base, frame.width, frame.height, renditions, extra)
+
+    with tracing.span("poster.preview", asset=label, seconds=PREVIEW_SECONDS):
+        anim = preview(src, os.path.join(out_dir, f"{base}-preview.webp"))
+
+    recorded = [dict(r, name=f"poster-{r['suffix']}") for r in renditions] + [anim]
+    manifest.record_renditions(src, recorded)
+    return {"src": src, "frame": index, "scores": scores, "renditions": recorded}
+
+
+def make_all(items, sizes=None):
+    """make_posters() for each (src, out_dir, base); prints one line per video."""
+    results = []
+    for src, out_dir, base in items:
+        try:
+            result = make_posters(src, out_dir, base, sizes)
+        except (subprocess.CalledProcessError, RuntimeError, OSError) as e:
+            print(f"    ❌ {base}: poster failed — {str(e)[:100]}")
+            continue
+        total = sum(r["bytes"] for r in result["renditions"]) / 1024
+        anim = result["renditions"][-1]["bytes"] / 1024
+        print(f"    🖼  {base}: frame {result['frame']} of {result['scores']['frames']}, "
+              f"{len(result['renditions']) - 1} posters + preview ({anim:.0f} KB), {total:.0f} KB total")
+        results.append(result)
+    if results:
+        responsive.export()
+    return results
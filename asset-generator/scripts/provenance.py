@@ -0,0 +1,210 @@
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — Provenance & Incremental Regeneration Plan
+═══════════════════════════════════════════════════════════════
+Every generator records what produced each file it writes, in the
+manifest's provenance table:
+
+    style         style directive name (catalogue/styles.json)
+    style_hash    hash of that style's text
+    body_hash     hash of the prompt without the style prefix
+    model         the model that actually answered
+    config        the group recipe's generation config
+    aspect_ratio, duration
+
+plan() diffs the catalogue against those records and says exactly
+which assets are stale and why — so editing the "aerial" style
+marks every aerial asset stale, and nothing else:
+
+    python scripts/manah_assets.py plan      # stale set, reasons, estimate
+    python scripts/manah_assets.py apply     # regenerate only that set
+
+Files generated before provenance was recorded are "untracked":
+they are left alone until `manah_assets.py status --reindex` adopts
+them as produced by the current recipe.
+═══════════════════════════════════════════════════════════════
+"""
+
+import os
+import json
+import math
+import statistics
+
+import catalogue
+import manifest
+import ratelimit
+import resilience
+
+PIPELINE_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'output', 'pipeline_log.json')
+
+# Seconds per generation call when output/pipeline_log.json has no history
+DEFAULT_SECONDS = {
+    ("imagen", "image"): 15,
+    ("gemini", "image"): 20,
+    ("replicate", "image"): 25,
+    ("replicate", "video"): 90,
+    ("veo", "video"): 240,
+}
+
+
+def _config_text(config):
+    return json.dumps(config or {}, sort_keys=True, separators=(",", ":"))
+
+
+def fingerprint(asset, model=None):
+    """What the current catalogue would send for `asset` (model defaults to the recipe's)."""
+    recipe = catalogue.recipe(asset.group)
+    style_text = catalogue.style(asset.style) if asset.style else ""
+    return {
+        "style": asset.style,
+        "style_hash": manifest.prompt_hash(style_text),
+        "body_hash": manifest.prompt_hash(asset.prompt[len(style_text):]),
+        "model": model or recipe["model"],
+        "config": _config_text(recipe["config"]),
+        "aspect_ratio": asset.aspect_ratio or recipe["aspect_ratio"],
+        "duration": asset.duration,
+    }
+
+
+def record(asset, path, model=None):
+    """Record that `path` was produced from `asset`'s current prompt and recipe."""
+    if not os.path.exists(path):
+        return
+    manifest.record_provenance(path, asset.id, asset.group, **fingerprint(asset, model))
+
+
+# ─── Diff ───
+
+def _config_changes(old, new):
+    old, new = json.loads(old or "{}"), json.loads(new or "{}")
+    return [f"{k} {old.get(k, '—')} → {new.get(k, '—')}"
+            for k in sorted(set(old) | set(new)) if old.get(k) != new.get(k)]
+
+
+def diff(asset, row):
+    """Why `asset` no longer matches its provenance `row`; [] when up to date."""
+    now = fingerprint(asset)
+    reasons = []
+    if row["style"] != now["style"]:
+        reasons.append(f"style {row['style'] or 'none'} → {now['style'] or 'none'}")
+    elif row["style_hash"] != now["style_hash"]:
+        reasons.append(f"style '{now['style']}' edited")
+    if row["body_hash"] != now["body_hash"]:
+        reasons.append("prompt edited")
+    # Any model in the fallback chain satisfies the request
+    accepted = catalogue.recipe(asset.group)["models"]
+    if asset.backend == "gemini":
+        accepted = accepted + [m for _, m in resilience.model_chain([])]
+    if row["model"] and row["model"] not in accepted:
+        reasons.append(f"model {row['model']} → {now['model']}")
+    if row["config"] != now["config"]:
+        reasons.append("config: " + ", ".join(_config_changes(row["config"], now["config"])))
+    if row["aspect_ratio"] != now["aspect_ratio"]:
+        reasons.append(f"aspect {row['aspect_ratio']} → {now['aspect_ratio']}")
+    if row["duration"] != now["duration"]:
+        reasons.append(f"duration {row['duration']}s → {now['duration']}s")
+    return reasons
+
+
+def plan(assets=None):
+    """Compare `assets` (default: the whole catalogue) with their provenance.
+
+    Returns {"stale": [(asset, reasons)], "untracked": [asset], "fresh": count}.
+    Missing files are stale with the reason "not generated".
+    """
+    records = manifest.provenance()
+    stale, untracked, fresh = [], [], 0
+    for asset in catalogue.load().assets if assets is None else assets:
+        if not os.path.exists(asset.abspath):
+            stale.append((asset, ["not generated"]))
+            continue
+        row = records.get(os.path.normpath(asset.abspath))
+        if row is None:
+            untracked.append(asset)
+            continue
+        reasons = diff(asset, row)
+        if reasons:
+            stale.append((asset, reasons))
+        else:
+            fresh += 1
+    return {"stale": stale, "untracked": untracked, "fresh": fresh}
+
+
+def adopt(assets):
+    """Record untracked existing files as produced by the current recipe."""
+    for asset in assets:
+        record(asset, asset.abspath)
+    return len(assets)
+
+
+# ─── Estimate ───
+
+def _history():
+    """Median seconds per (backend, kind) from the last generate_all run."""
+    try:
+        with open(PIPELINE_LOG) as f:
+            tasks = json.load(f).get("tasks", [])
+    except (OSError, ValueError):
+        return {}
+    index = catalogue.load().by_id
+    samples = {}
+    for task in tasks:
+        stage, _, rest = task["id"].partition(":")
+        if stage not in ("generate", "download") or task["state"] != "done" or not task.get("seconds"):
+            continue
+        if task["seconds"] < 1:  # cache hits and up-to-date skips
+            continue
+        matches = index.get(rest.rpartition(":")[2])
+        if not matches:
+            continue
+        backend = "veo" if task["backend"] == "veo-poll" else task["backend"]
+        samples.setdefault((backend, matches[0].kind), []).append(task["seconds"])
+    return {key: statistics.median(values) for key, values in samples.items()}
+
+
+def estimate(assets):
+    """{"calls": {backend: n}, "seconds": {backend: busy s}, "wall": s} for regenerating `assets`."""
+    history = _history()
+    calls, seconds = {}, {}
+    for asset in assets:
+        key = (asset.backend, asset.kind)
+        calls[asset.backend] = calls.get(asset.backend, 0) + 1
+        seconds[asset.backend] = seconds.get(asset.backend, 0) + history.get(key, DEFAULT_SECONDS.get(key, 30))
+    # Backends run side by side; each is limited by its own concurrency
+    wall = max((math.ceil(s / ratelimit.max_concurrency(b)) for b, s in seconds.items()), default=0)
+    return {"calls": calls, "seconds": seconds, "wall": wall, "from_history": bool(history)}
+
+
+def _duration(seconds):
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes}m {secs:02d}s" if minutes else f"{secs}s"
+
+
+def print_plan(result):
+    stale, untracked = result["stale"], result["untracked"]
+
+    print("\n" + "=" * 60)
+    print("  MANAH GROUP — Regeneration Plan")
+    print("=" * 60)
+    print(f"\n  ✅ Up to date: {result['fresh']}   🔁 Stale: {len(stale)}   ❔ Untracked: {len(untracked)}")
+
+    if stale:
+        print()
+        for asset, reasons in stale:
+            print(f"    - {asset.id:34s} {asset.group:17s} {'; '.join(reasons)}")
+
+        est = estimate([a for a, _ in stale])
+        calls = ", ".join(f"{b} {n}" for b, n in sorted(est["calls"].items()))
+        source = "last run's timings" if est["from_history"] else "default timings"
+        print(f"\n  📞 Generation calls: {sum(est['calls'].values())} ({calls})")
+        if "veo" in est["calls"]:
+            print("     + Veo status polls while those videos render")
+        print(f"  ⏱  Estimated time: ~{_duration(est['wall'])} ({source}, current concurrency limits)")
+        print("\n  Run `manah-assets apply` to regenerate exactly these assets.")
+    else:
+        print("\n  Nothing to regenerate.")
+
+    if untracked:
+        print(f"\n  ❔ {len(untracked)} file(s) predate provenance tracking and are left as they are;")
+        print("     `manah-assets status --reindex` records them as produced by the current recipe.")
+    print()
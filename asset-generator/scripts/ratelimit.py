@@ -0,0 +1,232 @@
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — Request Rate Limiting
+═══════════════════════════════════════════════════════════════
+Shared limiters for the generator scripts.
+
+AdaptiveLimiter is the per-backend controller every API call goes
+through (ratelimit.limiter("imagen").call(...)). It starts at one
+request in flight, adds more while calls succeed, halves on
+429/503 and waits out Retry-After, so each run settles at the
+quota the account actually has. MAX_CONCURRENCY env vars cap it.
+
+TokenBucket is a fixed requests-per-minute ceiling, applied on
+top only when *_REQUESTS_PER_MINUTE is set.
+═══════════════════════════════════════════════════════════════
+"""
+
+import os
+import threading
+import time
+
+import tracing
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `rate_per_minute` tokens per minute."""
+
+    def __init__(self, rate_per_minute, capacity=1):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        """Take a token if one is available right now. Returns True on success."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self):
+        """Block until a token is available and take it. Returns seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+# ─── Adaptive concurrency (AIMD) ───
+
+THROTTLE_STATUSES = (429, 503)
+THROTTLE_MARKERS = ("429", "503", "RESOURCE_EXHAUSTED", "UNAVAILABLE", "rate limit", "too many requests", "overloaded")
+MAX_BACKOFF = 120  # seconds; cap for the no-Retry-After back-off
+
+
+def throttle_info(exc):
+    """(throttled?, retry_after seconds or None) for an exception from any provider.
+
+    Understands backends.BackendError (status/retry_after), SDK errors that
+    carry an HTTP `code`/`status`, and falls back to the error text.
+    """
+    status = getattr(exc, "status", None)
+    if not isinstance(status, int):
+        status = getattr(exc, "code", None)
+    if isinstance(status, int):
+        throttled = status in THROTTLE_STATUSES
+    else:
+        text = str(exc).lower()
+        throttled = any(marker.lower() in text for marker in THROTTLE_MARKERS)
+
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+        try:
+            retry_after = float(headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            retry_after = None
+    return throttled, retry_after
+
+
+class AdaptiveLimiter:
+    """Per-backend AIMD concurrency controller.
+
+    Every successful call grows the in-flight limit by `increase / limit`
+    (about +1 per round of calls); a 429/503 multiplies it by `decrease`
+    and pauses new calls for the server's Retry-After, or an exponential
+    back-off when it sent none. Only the first throttle of a round cuts
+    the limit — calls that were already in flight when it was cut don't
+    cut it again.
+    """
+
+    def __init__(self, name, maximum=4, initial=1, minimum=1, increase=1.0, decrease=0.5,
+                 backoff=5.0, rate_per_minute=None):
+        self.name = name
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.increase = increase
+        self.decrease = decrease
+        self.backoff = backoff
+        self.bucket = TokenBucket(rate_per_minute) if rate_per_minute else None
+        self._limit = float(max(self.minimum, min(initial, self.maximum)))
+        self._in_flight = 0
+        self._epoch = 0
+        self._strikes = 0  # consecutive throttles, for the back-off without Retry-After
+        self._resume_at = 0.0
+        self._cond = threading.Condition()
+        self.stats = {"calls": 0, "throttled": 0, "errors": 0, "peak": 0, "waited": 0.0}
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    def acquire(self):
+        """Block until a slot is free and no back-off is active. Returns (epoch, seconds waited)."""
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if now < self._resume_at:
+                    self._cond.wait(self._resume_at - now)
+                elif self._in_flight >= int(self._limit):
+                    self._cond.wait()
+                else:
+                    break
+            self._in_flight += 1
+            self.stats["peak"] = max(self.stats["peak"], self._in_flight)
+            epoch = self._epoch
+        if self.bucket is not None:
+            self.bucket.acquire()
+        waited = time.monotonic() - start
+        with self._cond:
+            self.stats["waited"] += waited
+        return epoch, waited
+
+    def release(self, epoch, outcome="success", retry_after=None):
+        """Return a slot. `outcome` is "success", "throttled" or "error" (no change)."""
+        with self._cond:
+            self._in_flight -= 1
+            self.stats["calls"] += 1
+            if outcome == "success":
+                self._strikes = 0
+                self._limit = min(self.maximum, self._limit + self.increase / max(1.0, self._limit))
+            elif outcome == "throttled":
+                self.stats["throttled"] += 1
+                self._strikes += 1
+                before = self.limit
+                if epoch == self._epoch:
+                    self._limit = max(self.minimum, self._limit * self.decrease)
+                    self._epoch += 1
+                pause = retry_after if retry_after is not None else min(
+                    MAX_BACKOFF, self.backoff * 2 ** (self._strikes - 1))
+                self._resume_at = max(self._resume_at, time.monotonic() + pause)
+                print(f"  🐢 {self.name}: throttled — concurrency {before} → {self.limit}, "
+                      f"pausing {pause:.0f}s" + (" (Retry-After)" if retry_after is not None else ""))
+            else:
+                self.stats["errors"] += 1
+            self._cond.notify_all()
+
+    def call(self, fn, *args, retries=3, **kwargs):
+        """Run fn(*args, **kwargs) in a slot, retrying throttled calls up to `retries` times."""
+        for attempt in range(retries + 1):
+            with tracing.span("rate_limit.wait", backend=self.name) as s:
+                epoch, _ = self.acquire()
+                s.set(limit=self.limit)
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                throttled, retry_after = throttle_info(e)
+                self.release(epoch, "throttled" if throttled else "error", retry_after)
+                if not throttled or attempt == retries:
+                    raise
+                continue
+            self.release(epoch)
+            return result
+
+    def snapshot(self):
+        """Current limit and counters, for logs."""
+        with self._cond:
+            return dict(self.stats, name=self.name, limit=self.limit, in_flight=self._in_flight,
+                        waited=round(self.stats["waited"], 1))
+
+
+# Per-backend ceilings; the limiter finds the real quota below them.
+# (max-concurrency env var, optional requests-per-minute env var, default max)
+LIMITER_ENV = {
+    "imagen": ("IMAGE_MAX_CONCURRENCY", "IMAGE_REQUESTS_PER_MINUTE", 4),
+    "veo": ("VIDEO_MAX_CONCURRENCY", "VIDEO_REQUESTS_PER_MINUTE", 3),
+    "replicate": ("REPLICATE_MAX_CONCURRENCY", "REPLICATE_REQUESTS_PER_MINUTE", 4),
+    "gemini": ("GEMINI_MAX_CONCURRENCY", "GEMINI_REQUESTS_PER_MINUTE", 2),
+}
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def max_concurrency(backend):
+    """The configured in-flight ceiling for `backend`."""
+    max_env, _, default = LIMITER_ENV.get(backend, (None, None, 4))
+    return int(os.getenv(max_env, default)) if max_env else default
+
+
+def limiter(backend):
+    """The shared AdaptiveLimiter for `backend`, created on first use."""
+    with _limiters_lock:
+        if backend not in _limiters:
+            rate_env = LIMITER_ENV.get(backend, (None, None, None))[1]
+            rate = os.getenv(rate_env) if rate_env else None
+            _limiters[backend] = AdaptiveLimiter(backend, maximum=max_concurrency(backend),
+                                                 rate_per_minute=float(rate) if rate else None)
+        return _limiters[backend]
+
+
+def limiter_stats():
+    """Snapshots of every limiter used in this process."""
+    with _limiters_lock:
+        return [l.snapshot() for l in _limiters.values()]
@@ -0,0 +1,283 @@
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — Retries, Circuit Breakers, Model Fallback
+═══════════════════════════════════════════════════════════════
+Shared failure handling for every generator:
+
+    classify(exc)      → "throttled" | "transient" | "model" | "fatal"
+    retry(fn)          jittered exponential retries of transient errors
+    breaker(model)     per-model circuit breaker
+    call(backend, model, fn, ...)
+                       one provider call: breaker check → retries →
+                       the backend's adaptive limiter (ratelimit.py)
+    model_chain()      a generator's fallback chain, overridable from
+                       the environment, e.g. IMAGE_MODEL_CHAIN=
+                       "gemini:gemini-3.1-flash-image-preview,
+                        gemini:gemini-2.5-flash-image,
+                        imagen:imagen-4.0-generate-001"
+    generate_image(prompt, chain, configs=…)
+                       walk the chain until a model returns images;
+                       each link gets its own backend's request config
+
+Every image generator walks a chain: sectors and projects
+IMAGE_MODEL_CHAIN, Imagen IMAGEN_MODEL_CHAIN, and the FLUX
+scripts (replicate, news, media) FLUX_MODEL_CHAIN. Video
+generation stays on one model: a Veo job is submitted in one run
+and collected by operation name in a later one, so there is no
+point at which another model could take over, and the Replicate
+video recipes (duration, resolution) are specific to Veo 3 Fast.
+
+Throttles (429/503) are retried by the limiter itself, so they
+are not retried again here; if they outlast the limiter they
+count against the model's breaker and the chain moves on. Once a
+model's breaker opens, every queued job skips straight to the next
+model until the cool-down lets a single trial call through.
+═══════════════════════════════════════════════════════════════
+"""
+
+import os
+import time
+import random
+import threading
+
+import asset_cache
+import backends
+import catalogue
+import image_scoring
+import ratelimit
+import tracing
+
+RETRY_ATTEMPTS = int(os.getenv("RETRY_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = 2.0  # seconds; doubles per attempt, full jitter
+RETRY_MAX_DELAY = 60.0
+CIRCUIT_FAILURES = int(os.getenv("CIRCUIT_FAILURES", "3"))  # consecutive failures that open a breaker
+CIRCUIT_COOLDOWN = float(os.getenv("CIRCUIT_COOLDOWN", "120"))  # seconds before a trial call
+
+# The recipe whose config a chain link uses when its generator has none for that backend
+LINK_RECIPES = {"imagen": "images", "gemini": "sectors", "replicate": "replicate-images"}
+
+TRANSIENT_STATUSES = (408, 500, 502, 504)
+MODEL_STATUSES = (403, 404)  # model missing / not enabled for this key
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a model whose breaker is open."""
+
+
+# ─── Classification ───
+
+def classify(exc):
+    """Sort an exception from any provider into a retry class.
+
+    throttled  429/503 — the limiter already backed off and retried
+    transient  5xx, timeouts, dropped connections — worth retrying
+    model      the model itself is unavailable (403/404) — fall back
+    fatal      bad request, safety block, anything unknown — don't retry
+    """
+    if isinstance(exc, CircuitOpenError):
+        return "model"
+    throttled, _ = ratelimit.throttle_info(exc)
+    if throttled:
+        return "throttled"
+    status = getattr(exc, "status", None)
+    if not isinstance(status, int):
+        status = getattr(exc, "code", None)
+    if isinstance(status, int):
+        if status in TRANSIENT_STATUSES or status >= 500:
+            return "transient"
+        if status in MODEL_STATUSES:
+            return "model"
+        return "fatal"
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return "transient"
+    if isinstance(exc, backends.BackendError):
+        return "transient"  # no status: connection-level failure
+    return "fatal"
+
+
+# ─── Retries ───
+
+def backoff(attempt, retry_after=None):
+    """Full-jitter delay before retry `attempt` (0-based), at least Retry-After."""
+    delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+    return max(delay, retry_after or 0.0)
+
+
+def retry(fn, *args, attempts=None, label="", **kwargs):
+    """Call fn, retrying transient errors with jittered exponential back-off."""
+    attempts = attempts or RETRY_ATTEMPTS
+    for attempt in range(attempts):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if classify(e) != "transient" or attempt == attempts - 1:
+                raise
+            delay = backoff(attempt, getattr(e, "retry_after", None))
+            print(f"    ↻ {label or 'call'}: {str(e)[:80]} — retry {attempt + 1}/{attempts - 1} in {delay:.1f}s")
+            with tracing.span("retry.backoff", label=label, attempt=attempt + 1):
+                time.sleep(delay)
+
+
+# ─── Circuit breaker ───
+
+class CircuitBreaker:
+    """closed → (N consecutive failures) → open → (cool-down) → half-open → closed/open."""
+
+    def __init__(self, name, threshold=CIRCUIT_FAILURES, cooldown=CIRCUIT_COOLDOWN):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial = False  # a half-open trial call is in flight
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """True if a call may go ahead now."""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.cooldown:
+                self.state = "half-open"
+            if self.state == "half-open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if self.state == "half-open" or self.failures >= self.threshold:
+                if self.state != "open":
+                    print(f"  ⛔ {self.name}: circuit open after {self.failures} failure(s) "
+                          f"— skipping for {self.cooldown:.0f}s")
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker(model):
+    """The shared CircuitBreaker for `model`, created on first use."""
+    with _breakers_lock:
+        if model not in _breakers:
+            _breakers[model] = CircuitBreaker(model)
+        return _breakers[model]
+
+
+def call(backend, model, fn, *args, **kwargs):
+    """One provider call with the model's breaker, transient retries and the backend limiter."""
+    circuit = breaker(model)
+    if not circuit.allow():
+        raise CircuitOpenError(f"{model}: circuit open")
+    try:
+        result = retry(ratelimit.limiter(backend).call, fn, *args, label=model, **kwargs)
+    except Exception as e:
+        if classify(e) == "fatal":
+            circuit.success()  # the model answered; the request was the problem
+        else:
+            circuit.failure()
+        raise
+    circuit.success()
+    return result
+
+
+# ─── Fallback chain ───
+
+def _infer_backend(model):
+    if "/" in model:
+        return "replicate"
+    for prefix in ("imagen", "veo", "gemini", "mock"):
+        if model.startswith(prefix):
+            return prefix
+    return "gemini"
+
+
+def parse_chain(spec):
+    """"backend:model,model,…" → [(backend, model), …]; a bare model's backend is inferred."""
+    chain = []
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        backend, sep, model = item.partition(":")
+        if not sep or backend not in backends.BACKENDS:
+            backend, model = _infer_backend(item), item
+        chain.append((backend, model))
+    return chain
+
+
+def model_chain(default, env="IMAGE_MODEL_CHAIN"):
+    """The fallback chain from `env`, or `default` ([(backend, model), …]) when unset."""
+    return parse_chain(os.getenv(env)) or list(default)
+
+
+def link_config(backend, configs=None):
+    """Request config for a chain link on `backend`: the generator's own, else its LINK_RECIPES default."""
+    if configs and backend in configs:
+        return configs[backend]
+    recipe = LINK_RECIPES.get(backend)
+    return catalogue.recipe(recipe)["config"] if recipe else None
+
+
+def chain_keys(chain, prompt, aspect_ratio=None, configs=None, counts=(1,)):
+    """Cache keys for `prompt` on every link of `chain`, as {key: (backend, model, config)}.
+
+    Ordered by count, then link, so the first key is the request a run
+    makes on the primary model. Passing them all to asset_cache.resolve()
+    keeps an image whichever model produced it; recorded_key() maps the
+    file back to its link.
+    """
+    keys = {}
+    for n in counts:
+        for backend_name, model in chain:
+            config = image_scoring.candidate_config(link_config(backend_name, configs) or {}, n)
+            keys.setdefault(asset_cache.cache_key(model, prompt, aspect_ratio, config),
+                            (backend_name, model, config))
+    return keys
+
+
+def link_key(keys, backend, model):
+    """The key in chain_keys() output that this run's request on (backend, model) is stored under."""
+    return next(key for key, link in keys.items() if link[:2] == (backend, model))
+
+
+def generate_image(prompt, chain, aspect_ratio=None, count=1, label="", configs=None):
+    """Walk `chain` until a model returns images. Returns (results, backend, model).
+
+    `configs` maps a backend name to the request config its links send
+    (see link_config). Models whose breaker is open are skipped without a
+    call; when every link fails, the last error is raised.
+    """
+    last_error = None
+    for backend_name, model in chain:
+        backend = backends.get_backend(backend_name, model)
+        config = link_config(backend_name, configs)
+        try:
+            results = call(backend_name, model,
+                           lambda: backends.run(backend.generate_image(
+                               prompt, aspect_ratio=aspect_ratio, count=count, config=config)))
+        except CircuitOpenError as e:
+            print(f"    ⤼ {label or 'image'}: {model} circuit open, falling back")
+            last_error = e
+            continue
+        except Exception as e:
+            print(f"    ✗ {label or 'image'}: {model} failed ({classify(e)}): {str(e)[:120]}")
+            last_error = e
+            continue
+        if results:
+            return results, backend_name, model
+        print(f"    ✗ {label or 'image'}: no image from {model}")
+    if last_error is not None:
+        raise last_error
+    return [], None, None
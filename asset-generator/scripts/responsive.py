@@ -0,0 +1,255 @@
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — Responsive Image Manifest
+═══════════════════════════════════════════════════════════════
+The optimiser writes {base}-sm/md/lg/xl.webp; this module records
+what it wrote so the website never has to probe files:
+
+    output/responsive/<public path>.json     one per asset
+    website/src/lib/image-manifest.ts        every asset, typed
+
+Each entry holds the intrinsic width/height, every rendition's
+src, width, height, bytes and format, plus three placeholders
+computed with NumPy from the smallest rendition:
+
+  blurhash     4×3 (or 3×4) DCT components, base83 (blurha.sh)
+  blurDataURL  a 16 px WebP as a data URL — drop-in for Next.js
+               <Image placeholder="blur">
+  color        dominant colour: most populated 4-bit RGB bin
+
+image_pipeline.optimize_image() writes the per-asset file; export()
+collects them into the TypeScript module after each optimise run
+(or on demand: `manah-assets manifest`).
+═══════════════════════════════════════════════════════════════
+"""
+
+import io
+import os
+import json
+import base64
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_DIR = os.path.join(BASE_DIR, '..', 'output', 'responsive')
+WEBSITE_PUBLIC = os.path.join(BASE_DIR, '..', '..', 'website', 'public')
+TS_MODULE = os.path.join(BASE_DIR, '..', '..', 'website', 'src', 'lib', 'image-manifest.ts')
+
+LQIP_WIDTH = 16
+BLURHASH_SAMPLE = 32  # blurhash is computed on a thumbnail this wide
+
+BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+# ─── Placeholders ───
+
+def _base83(value, length):
+    return "".join(BASE83[(value // 83 ** (length - 1 - i)) % 83] for i in range(length))
+
+
+def _to_linear(srgb):
+    v = srgb / 255.0
+    return np.where(v <= 0.04045, v / 12.92, ((v + 0.055) / 1.055) ** 2.4)
+
+
+def _to_srgb(linear):
+    v = np.clip(linear, 0.0, 1.0)
+    return np.where(v <= 0.0031308, v * 12.92 * 255 + 0.5, (1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5).astype(int)
+
+
+def blurhash(pixels, components_x=4, components_y=3):
+    """Blurhash of an RGB array (h, w, 3); every component in one einsum."""
+    h, w = pixels.shape[:2]
+    linear = _to_linear(pixels.astype(np.float64))
+    cos_x = np.cos(np.pi * np.arange(components_x)[:, None] * np.arange(w)[None, :] / w)
+    cos_y = np.cos(np.pi * np.arange(components_y)[:, None] * np.arange(h)[None, :] / h)
+    # factors[j, i] = Σ cos_y[j, y] · cos_x[i, x] · linear[y, x]
+    factors = np.einsum("jy,ix,yxc->jic", cos_y, cos_x, linear) / (w * h)
+    factors[1:] *= 2
+    factors[0, 1:] *= 2
+    factors = factors.reshape(-1, 3)
+
+    dc, ac = factors[0], factors[1:]
+    r, g, b = _to_srgb(dc)
+    result = _base83((components_x - 1) + (components_y - 1) * 9, 1)
+    if len(ac):
+        quantised = int(max(0, min(82, np.floor(np.abs(ac).max() * 166 - 0.5))))
+        maximum = (quantised + 1) / 166
+    else:
+        quantised, maximum = 0, 1.0
+    result += _base83(quantised, 1) + _base83((r << 16) + (g << 8) + b, 4)
+
+    scaled = np.sign(ac / maximum) * np.abs(ac / maximum) ** 0.5
+    q = np.clip(np.floor(scaled * 9 + 9.5), 0, 18).astype(int)
+    for qr, qg, qb in q:
+        result += _base83(qr * 19 * 19 + qg * 19 + qb, 2)
+    return result
+
+
+def dominant_color(pixels, alpha=None):
+    """Hex colour of the most populated 4-bit-per-channel bin (transparent pixels ignored)."""
+    rgb = pixels.reshape(-1, 3).astype(np.int32)
+    if alpha is not None:
+        opaque = rgb[alpha.reshape(-1) >= 128]
+        rgb = opaque if len(opaque) else rgb
+    bins = (rgb[:, 0] >> 4) << 8 | (rgb[:, 1] >> 4) << 4 | rgb[:, 2] >> 4
+    top = np.bincount(bins, minlength=4096).argmax()
+    r, g, b = rgb[bins == top].mean(axis=0).round().astype(int)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def lqip(img):
+    """A LQIP_WIDTH-wide WebP of `img` as a base64 data URL (a few hundred bytes)."""
+    height = max(1, round(img.height * LQIP_WIDTH / img.width))
+    small = img.resize((LQIP_WIDTH, height), Image.BOX)
+    buf = io.BytesIO()
+    small.save(buf, format="WEBP", quality=40, method=6)
+    return "data:image/webp;base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def placeholders(img):
+    """{"blurhash", "blurDataURL", "color"} for a decoded RGB/RGBA image; {} without NumPy."""
+    if np is None or Image is None:
+        return {}
+    height = max(1, round(img.height * BLURHASH_SAMPLE / img.width))
+    sample = np.asarray(img.resize((BLURHASH_SAMPLE, height), Image.BOX))
+    rgb, alpha = sample[..., :3], sample[..., 3] if sample.shape[-1] == 4 else None
+    components = (4, 3) if img.width >= img.height else (3, 4)
+    return {
+        "blurhash": blurhash(rgb, *components),
+        "blurDataURL": lqip(img),
+        "color": dominant_color(rgb, alpha),
+    }
+
+
+# ─── Per-asset manifest ───
+
+def public_path(path):
+    """URL path of a file under website/public ("/images/hero/x"), or None."""
+    path = os.path.normpath(os.path.abspath(path))
+    root = os.path.normpath(os.path.abspath(WEBSITE_PUBLIC))
+    if path.startswith(root + os.sep):
+        return "/" + os.path.relpath(path, root).replace(os.sep, "/")
+    # Generators that still write to an absolute checkout path
+    marker = f"{os.sep}website{os.sep}public{os.sep}"
+    if marker in path:
+        return "/" + path.split(marker, 1)[1].replace(os.sep, "/")
+    return None
+
+
+def write(src, dest_base, width, height, renditions, extra):
+    """Write output/responsive/<public dest_base>.json; returns its path (None off-site)."""
+    key = public_path(dest_base)
+    if key is None:
+        return None
+    entry = {
+        "src": key,
+        "source": os.path.relpath(src, os.path.join(BASE_DIR, '..', '..')),
+        "width": width,
+        "height": height,
+        "renditions": [],
+        **extra,
+    }
+    # Breakpoints wider than the source collapse to one width; srcset needs each width once
+    seen = set()
+    for r in sorted(renditions, key=lambda r: (r["format"], r["width"])):
+        if (r["format"], r["width"]) not in seen:
+            seen.add((r["format"], r["width"]))
+            entry["renditions"].append({"src": public_path(r["path"]), "width": r["width"], "height": r["height"],
+                                        "bytes": r["bytes"], "format": r["format"]})
+    path = os.path.join(MANIFEST_DIR, key.lstrip("/") + ".json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(entry, f, indent=2)
+    os.replace(tmp, path)
+    return path
+
+
+def entries():
+    """Every per-asset manifest whose renditions are still on disk, by src."""
+    found = {}
+    for dirpath, _, filenames in os.walk(MANIFEST_DIR):
+        for name in filenames:
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(dirpath, name)) as f:
+                entry = json.load(f)
+            if all(os.path.exists(os.path.join(WEBSITE_PUBLIC, r["src"].lstrip("/"))) for r in entry["renditions"]):
+                found[entry["src"]] = entry
+    return dict(sorted(found.items()))
+
+
+# ─── TypeScript module ───
+
+TS_HEADER = '''/* ═══════════════════════════════════════════════════════════
+   MANAH GROUP — Responsive Image Manifest
+   GENERATED by asset-generator/scripts/responsive.py — do not edit.
+   Regenerate with: ./manah-assets manifest
+   ═══════════════════════════════════════════════════════════ */
+
+export type ImageFormat = "webp" | "avif" | "jpeg";
+
+export interface ImageRendition {
+  src: string;
+  width: number;
+  height: number;
+  bytes: number;
+  format: ImageFormat;
+}
+
+export interface ResponsiveImage {
+  width: number;
+  height: number;
+  renditions: ImageRendition[];
+  blurhash?: string;
+  /** Tiny WebP data URL, for `<Image placeholder="blur" blurDataURL=…>` */
+  blurDataURL?: string;
+  /** Dominant colour, e.g. as a background while the image loads */
+  color?: string;
+}
+
+'''
+
+TS_HELPERS = '''
+/** Manifest entry for an image path; the extension is ignored ("/images/hero/x.png" → "/images/hero/x"). */
+export function responsiveImage(src: string): ResponsiveImage | undefined {
+  return IMAGE_MANIFEST[src.replace(/\\?.*$/, "").replace(/\\.[a-z0-9]+$/i, "")];
+}
+
+/** `srcset` for one format, smallest first, e.g. "/images/a-sm.webp 640w, /images/a-md.webp 1024w". */
+export function srcSet(image: ResponsiveImage, format: ImageFormat = "webp"): string {
+  return image.renditions
+    .filter((r) => r.format === format)
+    .map((r) => `${r.src} ${r.width}w`)
+    .join(", ");
+}
+'''
+
+
+def export(ts_path=None):
+    """Write every per-asset manifest into the website's typed module; returns the entry count."""
+    ts_path = ts_path or TS_MODULE
+    items = entries()
+    body = {
+        src: {k: e[k] for k in ("width", "height", "renditions", "blurhash", "blurDataURL", "color") if k in e}
+        for src, e in items.items()
+    }
+    os.makedirs(os.path.dirname(ts_path), exist_ok=True)
+    tmp = f"{ts_path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(TS_HEADER)
+        f.write("export const IMAGE_MANIFEST: Record<string, ResponsiveImage> = ")
+        f.write(json.dumps(body, indent=2))
+        f.write(";\n")
+        f.write(TS_HELPERS)
+    os.replace(tmp, ts_path)
+    return len(items)
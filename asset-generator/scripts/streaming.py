@@ -0,0 +1,154 @@
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — HLS / DASH Packaging (CMAF)
+═══════════════════════════════════════════════════════════════
+Runs after the progressive MP4 transcodes. One ffmpeg invocation
+per clip decodes the source once, splits it into every rung of
+STREAM_RENDITIONS, encodes each one with keyframes forced on
+segment boundaries, and writes fMP4 (CMAF) segments. The same
+segments are described by both manifests:
+
+    website/public/videos/stream/hero_{id}/
+        manifest.mpd            DASH
+        master.m3u8             HLS master (media_0.m3u8, …)
+        init-0.m4s  chunk-0-00001.m4s  …
+
+so players switch rungs at any segment boundary instead of
+stalling on a single progressive file. Rungs are capped-CRF
+(crf + maxrate/bufsize) so each advertised BANDWIDTH holds; with
+TRANSCODE_MODE=per-title their CRFs come from the clip's ladder
+sidecar (transcode.per_title_ladder).
+
+Everything is static files — serve the directory as-is.
+═══════════════════════════════════════════════════════════════
+"""
+
+import os
+import time
+import shutil
+import subprocess
+
+import tracing
+import transcode
+
+# Streaming ladder; maxrate/bufsize in kb/s. "ssim" is the per-title target.
+STREAM_RENDITIONS = [
+    {"name": "720p", "width": 1280, "height": 720, "crf": 28, "maxrate": 3000, "ssim": 0.975},
+    {"name": "480p", "width": 854, "height": 480, "crf": 30, "maxrate": 1500, "ssim": 0.965},
+    {"name": "360p", "width": 640, "height": 360, "crf": 31, "maxrate": 800, "ssim": 0.955},
+]
+
+SEGMENT_SECONDS = int(os.getenv("STREAM_SEGMENT_SECONDS", "2"))
+STREAM_DIR = "stream"
+
+
+def stream_dir(video_dir, base):
+    """Where a clip's manifests and segments go, e.g. videos/stream/hero_main_loop/."""
+    return os.path.join(video_dir, STREAM_DIR, base)
+
+
+def ladder_for(src, width=None, height=None, per_title=None):
+    """STREAM_RENDITIONS that fit the source (no upscaling), with per-title CRFs if enabled."""
+    renditions = [r for r in STREAM_RENDITIONS if not height or r["height"] <= height] or STREAM_RENDITIONS[-1:]
+    if per_title is None:
+        per_title = transcode.TRANSCODE_MODE == "per-title"
+    if per_title:
+        renditions = transcode.per_title_ladder(src, renditions)
+    return renditions
+
+
+def build_command(src, out_dir, renditions, aspect, threads=transcode.THREADS_PER_RENDITION):
+    """One ffmpeg command: decode once, encode every rung, write DASH + HLS over shared CMAF segments.
+
+    `aspect` is the source "W/H"; every rung gets it as its display aspect
+    so the rungs form one DASH adaptation set (854×480 is not exactly 16:9).
+    """
+    n = len(renditions)
+    split = f"[0:v]split={n}" + "".join(f"[s{i}]" for i in range(n))
+    scales = [
+        f"[s{i}]scale={r['width']}:{r['height']}"
+        f":force_original_aspect_ratio=decrease:force_divisible_by=2,setdar={aspect}[v{i}]"
+        for i, r in enumerate(renditions)
+    ]
+    cmd = [transcode.FFMPEG, "-y", "-hide_banner", "-loglevel", "error",
+           "-i", src, "-filter_complex", ";".join([split] + scales)]
+    for i in range(n):
+        cmd += ["-map", f"[v{i}]"]
+    cmd += ["-c:v", "libx264", "-preset", transcode.PRESET, "-pix_fmt", "yuv420p", "-an",
+            "-threads", str(threads),  # per encoder
+            # Keyframes on every segment boundary, in every rung, so rungs switch cleanly
+            "-force_key_frames", f"expr:gte(t,n_forced*{SEGMENT_SECONDS})", "-sc_threshold", "0"]
+    for i, r in enumerate(renditions):
+        cmd += [f"-crf:v:{i}", str(r["crf"]),
+                f"-maxrate:v:{i}", f"{r['maxrate']}k", f"-bufsize:v:{i}", f"{r['maxrate'] * 2}k"]
+    cmd += ["-f", "dash", "-seg_duration", str(SEGMENT_SECONDS),
+            "-use_template", "1", "-use_timeline", "0",
+            "-hls_playlist", "1", "-adaptation_sets", "id=0,streams=v",
+            "-init_seg_name", "init-$RepresentationID$.m4s",
+            "-media_seg_name", "chunk-$RepresentationID$-$Number%05d$.m4s",
+            os.path.join(out_dir, "manifest.mpd")]
+    return cmd
+
+
+def package(src, out_dir, label=None, budget=None, per_title=None, threads=transcode.THREADS_PER_RENDITION):
+    """Package one clip into `out_dir` (replaced atomically). Returns a result dict."""
+    label = label or os.path.basename(out_dir)
+    result = {"label": label, "src": src, "dir": out_dir}
+    probe_start = time.time()
+    try:
+        # Probing (and the per-title CRF search) runs ffmpeg too; a bad source ends up as an error result
+        info = transcode.probe(src)
+        renditions = ladder_for(src, info["width"], info["height"], per_title)
+    except subprocess.CalledProcessError as e:
+        return dict(result, status="error", error=(e.stderr or str(e)).strip()[-300:],
+                    wall_seconds=round(time.time() - probe_start, 2))
+    except (FileNotFoundError, RuntimeError) as e:
+        return dict(result, status="error", error=str(e), wall_seconds=round(time.time() - probe_start, 2))
+    aspect = f"{info['width']}/{info['height']}" if info["width"] and info["height"] else "16/9"
+
+    partial = f"{out_dir}.partial"
+    shutil.rmtree(partial, ignore_errors=True)
+    os.makedirs(partial)
+
+    budget = budget or transcode.ThreadBudget()
+    cost = threads * len(renditions)
+    with tracing.span("package.wait", asset=label, threads=cost):
+        budget.acquire(cost)
+    start = time.time()
+    try:
+        with tracing.span("package", asset=label, src=src,
+                          renditions=",".join(r["name"] for r in renditions)) as s:
+            proc = subprocess.run(build_command(src, partial, renditions, aspect, threads),
+                                  capture_output=True, text=True)
+            s.set(returncode=proc.returncode)
+        error = proc.stderr.strip()[-300:] if proc.returncode != 0 else None
+    except FileNotFoundError as e:
+        error = str(e)
+    finally:
+        budget.release(cost)
+
+    result["wall_seconds"] = round(time.time() - start, 2)
+    if error:
+        shutil.rmtree(partial, ignore_errors=True)
+        return dict(result, status="error", error=error)
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(partial, out_dir)
+    files = os.listdir(out_dir)
+    return dict(
+        result, status="success",
+        dash=os.path.join(out_dir, "manifest.mpd"),
+        hls=os.path.join(out_dir, "master.m3u8"),
+        renditions=[{"name": r["name"], "crf": r["crf"], "maxrate_kbps": r["maxrate"]} for r in renditions],
+        segments=sum(1 for f in files if f.startswith("chunk-")),
+        bytes=sum(os.path.getsize(os.path.join(out_dir, f)) for f in files),
+    )
+
+
+def print_result(result):
+    if result["status"] != "success":
+        print(f"    ❌ {result['label']}: packaging failed after {result['wall_seconds']:.1f}s — {result['error'][:100]}")
+        return
+    rungs = ", ".join(f"{r['name']} crf {r['crf']}" for r in result["renditions"])
+    print(f"    📦 {result['label']}: {result['segments']} segments, {result['bytes'] / 1024:.0f} KB "
+          f"({rungs}) in {result['wall_seconds']:.1f}s → {result['dir']}")
@@ -0,0 +1,186 @@
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — Span Tracing (Chrome trace format)
+═══════════════════════════════════════════════════════════════
+Span-level timing for every phase of every asset: API calls,
+rate-limit waits, queueing, downloads, decode, each encode,
+transcodes and the copy into the website tree.
+
+Enable with MANAH_TRACE=1 (or a path), or `--trace` on the
+generator scripts. The trace is written on exit to
+output/traces/trace-<time>.json in Chrome trace-event format.
+Open it in chrome://tracing or https://ui.perfetto.dev.
+
+    with tracing.span("encode", asset=asset_id, format="webp") as s:
+        data = encode(...)
+        s.set(bytes=len(data))
+
+When tracing is off, span() returns a shared no-op object, so
+instrumented code pays almost nothing.
+
+Worker processes (the image pipeline's process pool) record into
+their own buffer; the parent collects those events with
+drain()/ingest() together with each job's result.
+═══════════════════════════════════════════════════════════════
+"""
+
+import os
+import json
+import time
+import atexit
+import threading
+from datetime import datetime
+
+TRACE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'output', 'traces')
+
+_events = []
+_lock = threading.Lock()
+_path = None
+_owner = None  # pid of the process that writes the file
+
+
+def _default_path():
+    return os.path.join(TRACE_DIR, f"trace-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+
+
+def enable(path=None):
+    """Turn tracing on for this process and its workers; written to `path` at exit."""
+    global _path, _owner
+    if _path is not None:
+        return _path
+    _path = os.path.abspath(path) if path and path != "1" else _default_path()
+    _owner = int(os.environ.get("MANAH_TRACE_OWNER", os.getpid()))
+    # Inherited by worker processes, so they record too
+    os.environ["MANAH_TRACE"] = _path
+    os.environ["MANAH_TRACE_OWNER"] = str(_owner)
+    if _owner == os.getpid():
+        atexit.register(save)
+    return _path
+
+
+def enabled():
+    return _path is not None
+
+
+def _now_us():
+    return time.time() * 1e6
+
+
+def _thread_id():
+    return threading.get_ident() % 1_000_000
+
+
+class Span:
+    """One timed region; attributes can be added while it is open."""
+
+    __slots__ = ("name", "cat", "args", "start")
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = None
+
+    def set(self, **attrs):
+        self.args.update(attrs)
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = str(exc)[:200]
+        _append(self.name, self.cat, self.start, _now_us() - self.start, self.args)
+        return False
+
+
+class _NullSpan:
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL = _NullSpan()
+
+
+def span(name, cat="pipeline", **attrs):
+    """Context manager timing a region as a complete ("X") trace event."""
+    if _path is None:
+        return _NULL
+    return Span(name, cat, attrs)
+
+
+def record(name, start, end, cat="pipeline", **attrs):
+    """Record a span after the fact from time.time() timestamps (e.g. queueing)."""
+    if _path is None or start is None or end is None:
+        return
+    _append(name, cat, start * 1e6, max(0.0, (end - start) * 1e6), attrs)
+
+
+def _append(name, cat, ts, dur, args):
+    event = {
+        "name": name, "cat": cat, "ph": "X",
+        "ts": round(ts, 1), "dur": round(dur, 1),
+        "pid": os.getpid(), "tid": _thread_id(),
+        "args": {k: v for k, v in args.items() if v is not None},
+    }
+    with _lock:
+        _events.append(event)
+
+
+def drain():
+    """Remove and return the events this process recorded (used by worker processes).
+
+    A forked worker starts with a copy of the parent's buffer; those events
+    are dropped rather than sent back twice.
+    """
+    pid = os.getpid()
+    with _lock:
+        events = [e for e in _events if e["pid"] == pid]
+        _events.clear()
+    return events
+
+
+def ingest(events):
+    """Add events recorded in another process."""
+    if _path is None or not events:
+        return
+    with _lock:
+        _events.extend(events)
+
+
+def save(path=None):
+    """Write every event so far as a Chrome trace JSON file; returns its path."""
+    path = path or _path
+    if path is None:
+        return None
+    with _lock:
+        events = list(_events)
+
+    # Name processes/threads so the viewer shows readable rows
+    meta = []
+    for pid in sorted({e["pid"] for e in events}):
+        label = "main" if pid == _owner else "worker"
+        meta.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": f"{label} ({pid})"}})
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({
+            "traceEvents": meta + sorted(events, key=lambda e: e["ts"]),
+            "displayTimeUnit": "ms",
+            "otherData": {"generator": "manah-asset-generator", "saved_at": datetime.now().isoformat()},
+        }, f)
+    os.replace(tmp, path)
+    print(f"  🧭 Trace: {path} ({len(events)} spans)")
+    return path
+
+
+if os.getenv("MANAH_TRACE"):
+    enable(os.getenv("MANAH_TRACE"))
@@ -0,0 +1,615 @@
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — Parallel Video Transcode Scheduler
+═══════════════════════════════════════════════════════════════
+Produces the web renditions of a source video with a single
+ffmpeg invocation: the source is decoded once and a `split`
+filter feeds one scaler + encoder per rendition.
+
+Jobs (one per source video) run concurrently. Each job costs
+`threads × renditions` encoder threads, and jobs are admitted
+only while the total stays within the machine's core count, so
+a 16-core box runs several sources at once instead of one
+`-preset slow` encode after another.
+
+Every job reports wall time and per-output bitrate.
+
+TRANSCODE_MODE=per-title replaces the fixed CRFs with a per-clip
+search. Each rung is probed with fast `veryfast` encodes, and each
+probe's SSIM against the source (scaled to the rung) is measured
+with ffmpeg's ssim filter. A binary search over CRF_RANGE starts
+at the old fixed CRF, which doubles as the complexity pass, and
+keeps the highest CRF (fewest bytes) that still reaches the
+rung's "ssim" target (+TRANSCODE_SSIM_OFFSET), so a calm aerial
+pan ends up at a higher CRF than a busy montage. The chosen
+ladder is written next to the source as {source}.ladder.json
+and reused while the source, targets and rungs are unchanged.
+
+Long sources (TRANSCODE_CHUNKED=auto, at least two chunks of
+TRANSCODE_CHUNK_SECONDS) are encoded in chunks instead: the
+source is cut at its own keyframes (where its encoder already put
+the scene cuts), the chunks are encoded in parallel — one ffmpeg
+per chunk, still one decode for every rendition, each admitted by
+the same thread budget — and then concatenated with stream copy
+plus +faststart. The result must have exactly the source's frame
+count and duration, or the job fails.
+
+VIDEO_CODECS adds WebM renditions at every rung next to the MP4s:
+AV1 (SVT-AV1, or libaom when that is all ffmpeg has) by default,
+VP9 (libvpx-vp9) on request. One measurement so far, on
+hero_technology at 720p (libaom cpu-used 6 vs x264 -preset slow):
+AV1 crf 38 came to 203 KB at SSIM 0.985 against 264 KB at 0.986
+for H.264 crf 28; VP9 has not been measured. The WebM rungs are
+extra outputs of the same job — still one decode — so they share
+its thread budget and chunking. If a job fails only the MP4s fall
+back to a copy of the source; WebM outputs are left absent so the
+site's <source> list falls through to the MP4. Each job also
+writes the <source> order for the site (video_sources.py).
+═══════════════════════════════════════════════════════════════
+"""
+
+import os
+import re
+import json
+import time
+import bisect
+import shutil
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import manifest
+import tracing
+import video_sources
+
+FFMPEG = os.getenv("FFMPEG", "ffmpeg")
+FFPROBE = os.getenv("FFPROBE", "ffprobe")
+
+# Default web ladder — H.264, no audio (background videos), faststart.
+# "ssim" is the per-title target for the rung (roughly what the fixed CRF gives on a typical clip).
+WEB_RENDITIONS = [
+    {"name": "720p", "width": 1280, "height": 720, "crf": 28, "ssim": 0.975},
+    {"name": "480p", "width": 854, "height": 480, "crf": 30, "ssim": 0.965},
+]
+
+PRESET = "slow"
+
+# Container, <source> type and encoders (first available wins) per codec; WebM CRFs per rung
+CODECS = {
+    "h264": {"ext": "mp4", "mime": "video/mp4", "encoders": ["libx264"]},
+    "vp9": {"ext": "webm", "mime": 'video/webm; codecs="vp9"', "encoders": ["libvpx-vp9"],
+            "crf": {"720p": 33, "480p": 35}},
+    "av1": {"ext": "webm", "mime": 'video/webm; codecs="av01.0.08M.08"', "encoders": ["libsvtav1", "libaom-av1"],
+            "crf": {"720p": 38, "480p": 46}},
+}
+# Codecs every web video is encoded in; H.264 stays as the universal fallback
+VIDEO_CODECS = [c.strip() for c in os.getenv("VIDEO_CODECS", "h264,av1").split(",") if c.strip()]
+
+# "fixed": WEB_RENDITIONS CRFs for every clip; "per-title": search each clip's CRFs
+TRANSCODE_MODE = os.getenv("TRANSCODE_MODE", "fixed")
+# Added to every rung's "ssim" target, e.g. 0.005 for a little more quality everywhere
+SSIM_OFFSET = float(os.getenv("TRANSCODE_SSIM_OFFSET", "0"))
+CRF_RANGE = (20, 36)
+PROBE_PRESET = "veryfast"
+THREADS_PER_RENDITION = int(os.getenv("TRANSCODE_THREADS", "4"))
+CORES = os.cpu_count() or 1
+
+# "auto": chunk sources long enough and cores enough for 2+ chunks at once; "on"; "off"
+CHUNK_MODE = os.getenv("TRANSCODE_CHUNKED", "auto")
+CHUNK_SECONDS = float(os.getenv("TRANSCODE_CHUNK_SECONDS", "10"))
+CHUNK_THREADS = 2  # per rendition per chunk; x264 uses few threads more efficiently
+
+
+_encoders = None
+
+
+def encoder(codec):
+    """The ffmpeg encoder used for `codec`, or None when this ffmpeg has none of them."""
+    global _encoders
+    if _encoders is None:
+        try:
+            out = subprocess.run([FFMPEG, "-hide_banner", "-encoders"], capture_output=True, text=True).stdout
+        except FileNotFoundError:
+            out = ""
+        _encoders = {line.split()[1] for line in out.splitlines() if len(line.split()) > 1}
+    return next((e for e in CODECS[codec]["encoders"] if e in _encoders), None)
+
+
+def web_renditions(codecs=None, renditions=None):
+    """WEB_RENDITIONS in every codec of VIDEO_CODECS that this ffmpeg can encode."""
+    renditions = renditions or WEB_RENDITIONS
+    result = []
+    for codec in codecs or VIDEO_CODECS:
+        if codec == "h264":
+            result += [dict(r, codec="h264") for r in renditions]
+        elif codec not in CODECS:
+            print(f"  ⚠️  Unknown video codec '{codec}' (one of: {', '.join(CODECS)})")
+        elif encoder(codec) is None:
+            print(f"  ⚠️  No {codec} encoder in {FFMPEG}; skipping {codec} renditions")
+        else:
+            result += [dict(r, codec=codec, crf=CODECS[codec]["crf"].get(r["name"], r["crf"] + 9))
+                       for r in renditions]
+    return result
+
+
+def rendition_path(out_dir, base, rendition, ext=None):
+    """Website path for one rendition, e.g. hero/hero_main_loop-720p.mp4 or …-720p-vp9.webm."""
+    codec = rendition.get("codec", "h264")
+    suffix = "" if codec == "h264" else f"-{codec}"
+    return os.path.join(out_dir, f"{base}-{rendition['name']}{suffix}.{ext or CODECS[codec]['ext']}")
+
+
+def base_path(rendition, path):
+    """Inverse of rendition_path: the shared path of every rendition ("…/hero_main_loop")."""
+    tail = os.path.basename(rendition_path("", "", rendition))
+    return path[:-len(tail)] if path.endswith(tail) else os.path.splitext(path)[0]
+
+
+def codec_args(rendition):
+    """Encoder arguments for one rendition's codec and CRF."""
+    codec = rendition.get("codec", "h264")
+    crf = str(rendition["crf"])
+    if codec == "h264":
+        return ["-c:v", "libx264", "-preset", rendition.get("preset", PRESET), "-crf", crf]
+    name = encoder(codec)
+    if name == "libvpx-vp9":
+        return ["-c:v", name, "-b:v", "0", "-crf", crf, "-deadline", "good", "-cpu-used", "4", "-row-mt", "1"]
+    if name == "libsvtav1":
+        return ["-c:v", name, "-preset", "8", "-crf", crf]
+    if name == "libaom-av1":
+        return ["-c:v", name, "-b:v", "0", "-crf", crf, "-cpu-used", "6", "-row-mt", "1"]
+    raise RuntimeError(f"no encoder for {codec} in {FFMPEG}")
+
+
+def container_args(path):
+    """Muxer flags that let playback start before the whole file has arrived."""
+    return ["-movflags", "+faststart"] if path.endswith(".mp4") else ["-cues_to_front", "1"]
+
+
+def _partial(path):
+    root, ext = os.path.splitext(path)
+    return f"{root}.partial{ext}"
+
+
+def build_command(src, outputs, threads=THREADS_PER_RENDITION, start=None, frames=None, faststart=True):
+    """Build one ffmpeg command that decodes `src` once and writes every output.
+
+    `outputs` is a list of (rendition, out_path) pairs. Outputs are written to
+    a `.partial` file first; the caller renames them on success. `start`
+    (seconds) and `frames` restrict the encode to one chunk of the source.
+    """
+    n = len(outputs)
+    split = f"[0:v]split={n}" + "".join(f"[s{i}]" for i in range(n))
+    scales = [
+        f"[s{i}]scale={r['width']}:{r['height']}"
+        f":force_original_aspect_ratio=decrease:force_divisible_by=2[v{i}]"
+        for i, (r, _) in enumerate(outputs)
+    ]
+
+    cmd = [FFMPEG, "-y", "-hide_banner", "-loglevel", "error"]
+    if start:
+        cmd += ["-ss", f"{start:.6f}"]  # before -i: seeks to the keyframe, decodes only this chunk
+    cmd += ["-i", src, "-filter_complex", ";".join([split] + scales)]
+    for i, (r, path) in enumerate(outputs):
+        cmd += ["-map", f"[v{i}]"] + codec_args(r) + [
+            "-threads", str(threads),
+            "-an",  # no audio for background videos
+            "-pix_fmt", "yuv420p",
+        ]
+        if frames:
+            cmd += ["-frames:v", str(frames)]
+        if faststart:
+            cmd += container_args(path)
+        cmd.append(_partial(path))
+    return cmd
+
+
+def probe(path):
+    """Return duration (s), bit_rate (bps), width and height of a media file.
+
+    Uses ffprobe when available, otherwise parses the `ffmpeg -i` banner.
+    """
+    info = {"duration": None, "bit_rate": None, "width": None, "height": None}
+    try:
+        out = subprocess.run(
+            [FFPROBE, "-v", "error", "-select_streams", "v:0",
+             "-show_entries", "format=duration,bit_rate:stream=width,height",
+             "-of", "json", path],
+            capture_output=True, check=True, text=True,
+        ).stdout
+        data = json.loads(out)
+        fmt = data.get("format", {})
+        stream = (data.get("streams") or [{}])[0]
+        info["duration"] = float(fmt["duration"]) if fmt.get("duration") else None
+        info["bit_rate"] = int(fmt["bit_rate"]) if fmt.get("bit_rate") else None
+        info["width"] = stream.get("width")
+        info["height"] = stream.get("height")
+        return info
+    except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
+        pass
+
+    try:
+        err = subprocess.run([FFMPEG, "-hide_banner", "-i", path], capture_output=True, text=True).stderr
+    except FileNotFoundError:
+        return info
+    m = re.search(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", err)
+    if m:
+        info["duration"] = int(m.group(1)) * 3600 + int(m.group(2)) * 60 + float(m.group(3))
+    m = re.search(r"bitrate: (\d+) kb/s", err)
+    if m:
+        info["bit_rate"] = int(m.group(1)) * 1000
+    m = re.search(r"Video: .*?, (\d{2,5})x(\d{2,5})", err)
+    if m:
+        info["width"], info["height"] = int(m.group(1)), int(m.group(2))
+    return info
+
+
+# ─── Per-title ladder ───
+
+def _scale(rendition):
+    return (f"scale={rendition['width']}:{rendition['height']}"
+            ":force_original_aspect_ratio=decrease:force_divisible_by=2")
+
+
+def measure_crf(src, rendition, crf, threads=THREADS_PER_RENDITION):
+    """Probe-encode `src` at one rung and CRF; returns {"crf", "bytes", "kbps", "ssim"}."""
+    fd, probe_path = tempfile.mkstemp(prefix=f"probe-{rendition['name']}-{crf}-", suffix=".mp4")
+    os.close(fd)
+    try:
+        subprocess.run(
+            [FFMPEG, "-y", "-hide_banner", "-loglevel", "error", "-i", src, "-vf", _scale(rendition),
+             "-c:v", "libx264", "-preset", PROBE_PRESET, "-crf", str(crf), "-threads", str(threads),
+             "-an", "-pix_fmt", "yuv420p", probe_path],
+            capture_output=True, check=True, text=True,
+        )
+        size = os.path.getsize(probe_path)
+        err = subprocess.run(
+            [FFMPEG, "-hide_banner", "-i", probe_path, "-i", src, "-lavfi",
+             f"[1:v]{_scale(rendition)}[ref];[0:v][ref]ssim", "-f", "null", "-"],
+            capture_output=True, text=True,
+        ).stderr
+        duration = probe(probe_path)["duration"]
+    finally:
+        if os.path.exists(probe_path):
+            os.remove(probe_path)
+    m = re.search(r"All:([\d.]+)", err)
+    if not m:
+        raise RuntimeError(f"ssim filter gave no score for {src}: {err.strip()[-200:]}")
+    return {"crf": crf, "bytes": size, "ssim": round(float(m.group(1)), 5),
+            "kbps": round(size * 8 / duration / 1000) if duration else None}
+
+
+def _target(rendition):
+    return round(rendition.get("ssim", 0.97) + SSIM_OFFSET, 4)
+
+
+def search_crf(src, rendition, threads=THREADS_PER_RENDITION):
+    """Highest CRF in CRF_RANGE whose probe reaches the rung's SSIM target.
+
+    The first probe is at the rung's fixed CRF; its bitrate is the clip's
+    complexity. Returns (chosen probe, every probe).
+    """
+    target = _target(rendition)
+    lo, hi = CRF_RANGE
+    probes = []
+    best = None
+    crf = min(max(rendition["crf"], lo), hi)
+    while lo <= hi:
+        with tracing.span("transcode.probe", src=src, rendition=rendition["name"], crf=crf) as s:
+            result = measure_crf(src, rendition, crf, threads)
+            s.set(ssim=result["ssim"], kbps=result["kbps"])
+        probes.append(result)
+        if result["ssim"] >= target:
+            best, lo = result, crf + 1
+        else:
+            hi = crf - 1
+        crf = (lo + hi) // 2
+    # Not even the lowest CRF reaches the target: spend the most bits the range allows
+    return best or min(probes, key=lambda p: p["crf"]), probes
+
+
+def ladder_path(src):
+    return f"{os.path.splitext(src)[0]}.ladder.json"
+
+
+def per_title_ladder(src, renditions, threads=THREADS_PER_RENDITION):
+    """Renditions with per-clip CRFs.
+
+    The sidecar keeps every rung searched for this source (the progressive
+    ladder and the streaming ladder share it), so only rungs that are new
+    or whose size or target changed are probed.
+    """
+    stat = os.stat(src)
+    key = {"size": stat.st_size, "mtime": stat.st_mtime, "crf_range": list(CRF_RANGE)}
+    steps = []
+    try:
+        with open(ladder_path(src)) as f:
+            sidecar = json.load(f)
+        if sidecar.get("key") == key:
+            steps = sidecar["ladder"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    def rung(r):
+        return [r["name"], r["width"], r["height"], _target(r)]
+
+    known = {tuple(rung(step)): step for step in steps}
+    missing = [r for r in renditions if tuple(rung(r)) not in known]
+    for r in missing:
+        chosen, probes = search_crf(src, r, threads)
+        step = {"name": r["name"], "width": r["width"], "height": r["height"], "target_ssim": _target(r),
+                "crf": chosen["crf"], "fixed_crf": r["crf"], "ssim": chosen["ssim"],
+                "probe_kbps": chosen["kbps"], "probes": probes}
+        known[tuple(rung(r))] = step
+    if missing:
+        # Replace older entries for the same rung name (size or target changed)
+        names = {r["name"]: tuple(rung(r)) for r in renditions}
+        ladder = sorted((step for k, step in known.items() if names.get(k[0], k) == k),
+                        key=lambda step: -step["height"])
+        with open(ladder_path(src), "w") as f:
+            json.dump({"src": os.path.basename(src), "key": key, "preset": PRESET, "probe_preset": PROBE_PRESET,
+                       "complexity_kbps": ladder[0]["probes"][0]["kbps"],
+                       "ladder": ladder}, f, indent=2)
+    return [dict(r, crf=known[tuple(rung(r))]["crf"]) for r in renditions]
+
+
+# ─── Chunked encoding ───
+
+def stream_info(path):
+    """Frame count, duration (s) and keyframes of the first video stream, from its packets.
+
+    Reads packet timestamps and flags with a stream-copy framecrc pass (no
+    decode, no ffprobe needed). Keyframes are (frames before it, seconds
+    from the first frame) pairs in presentation order.
+    """
+    out = subprocess.run(
+        [FFMPEG, "-hide_banner", "-loglevel", "error", "-i", path, "-map", "0:v:0", "-c", "copy",
+         "-f", "framecrc", "-"],
+        capture_output=True, check=True, text=True,
+    ).stdout
+    num, den = 1, 1
+    packets = []  # (pts, duration, key)
+    for line in out.splitlines():
+        if line.startswith("#tb 0:"):
+            num, den = (int(v) for v in line.split(":", 1)[1].strip().split("/"))
+        elif line and not line.startswith("#"):
+            fields = [f.strip() for f in line.split(",")]
+            flags = next((f for f in fields[6:] if f.startswith("F=")), None)
+            packets.append((int(fields[2]), int(fields[3]), flags is None or int(flags[2:], 16) & 1))
+    if not packets:
+        raise RuntimeError(f"no video packets in {path}")
+    first = min(p[0] for p in packets)
+    end = max(p[0] + p[1] for p in packets)
+    pts = sorted(p[0] for p in packets)
+    keyframes = sorted({(bisect.bisect_left(pts, p[0]), (p[0] - first) * num / den) for p in packets if p[2]})
+    return {"frames": len(packets), "duration": (end - first) * num / den, "keyframes": keyframes}
+
+
+def plan_chunks(info, seconds=CHUNK_SECONDS):
+    """Cut points at source keyframes, about `seconds` apart: [{"start", "frames"}].
+
+    No chunk is shorter than half of `seconds`, so the tail joins the last chunk.
+    """
+    cuts = [(0, 0.0)]
+    for index, at in info["keyframes"]:
+        if at - cuts[-1][1] >= seconds and info["duration"] - at >= seconds / 2:
+            cuts.append((index, at))
+    bounds = [index for index, _ in cuts] + [info["frames"]]
+    return [{"start": at, "frames": bounds[i + 1] - index} for i, (index, at) in enumerate(cuts)]
+
+
+def use_chunks(job, info=None):
+    """Whether `job` is encoded in chunks (TRANSCODE_CHUNKED / job["chunked"])."""
+    mode = job.get("chunked", CHUNK_MODE)
+    if mode in (False, "off"):
+        return False
+    if mode in (True, "on"):
+        return True
+    # auto: only when two chunks can actually run side by side
+    if CORES // (CHUNK_THREADS * len(job["outputs"])) < 2:
+        return False
+    duration = (info or probe(job["src"]))["duration"]
+    return bool(duration) and duration >= 2 * CHUNK_SECONDS
+
+
+def encode_chunked(src, outputs, budget, label=None, threads=CHUNK_THREADS, seconds=CHUNK_SECONDS):
+    """Encode `src` chunk by chunk in parallel, then concatenate each rendition.
+
+    Writes the same `.partial` outputs as a whole-file run and verifies each
+    against the source's frame count and duration. Returns the chunk plan;
+    raises RuntimeError / CalledProcessError on failure.
+    """
+    label = label or src
+    info = stream_info(src)
+    chunks = plan_chunks(info, seconds)
+    work = tempfile.mkdtemp(prefix="chunks-", dir=os.path.dirname(outputs[0][1]))
+    cost = threads * len(outputs)
+
+    def encode(i):
+        chunk = chunks[i]
+        paths = [(r, rendition_path(work, f"{i:04d}", r)) for r, _ in outputs]
+        # Half a frame early, so rounding never drops the keyframe itself
+        start = max(0.0, chunk["start"] - info["duration"] / info["frames"] / 2)
+        with tracing.span("transcode.wait", asset=label, chunk=i, threads=cost):
+            budget.acquire(cost)
+        try:
+            with tracing.span("transcode.chunk", asset=label, chunk=i, start=round(chunk["start"], 3),
+                              frames=chunk["frames"]):
+                subprocess.run(build_command(src, paths, threads, start=start, frames=chunk["frames"],
+                                             faststart=False),
+                               capture_output=True, check=True, text=True)
+        finally:
+            budget.release(cost)
+        return [_partial(p) for _, p in paths]
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(len(chunks), CORES // cost))) as pool:
+            parts = list(pool.map(encode, range(len(chunks))))
+        for n, (rendition, path) in enumerate(outputs):
+            listing = f"{rendition_path(work, 'chunks', rendition)}.txt"
+            with open(listing, "w") as f:
+                f.writelines(f"file '{chunk[n]}'\n" for chunk in parts)
+            with tracing.span("transcode.concat", asset=label, rendition=rendition["name"], chunks=len(chunks)):
+                subprocess.run(
+                    [FFMPEG, "-y", "-hide_banner", "-loglevel", "error", "-f", "concat", "-safe", "0",
+                     "-i", listing, "-c", "copy"] + container_args(path) + [_partial(path)],
+                    capture_output=True, check=True, text=True,
+                )
+            got = stream_info(_partial(path))
+            frame = info["duration"] / info["frames"]
+            if got["frames"] != info["frames"] or abs(got["duration"] - info["duration"]) > frame:
+                raise RuntimeError(f"{os.path.basename(path)}: {got['frames']} frames / {got['duration']:.3f}s "
+                                   f"after concat, source has {info['frames']} / {info['duration']:.3f}s")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return chunks
+
+
+class ThreadBudget:
+    """Admit jobs while their combined encoder threads fit within `capacity` cores."""
+
+    def __init__(self, capacity=CORES):
+        self.capacity = max(1, capacity)
+        self.in_use = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, cost):
+        with self._cond:
+            # A job larger than the whole budget still runs, just on its own
+            while self.in_use > 0 and self.in_use + cost > self.capacity:
+                self._cond.wait()
+            self.in_use += cost
+
+    def release(self, cost):
+        with self._cond:
+            self.in_use -= cost
+            self._cond.notify_all()
+
+
+def run_job(job, budget, threads=THREADS_PER_RENDITION):
+    """Run one source → N renditions ffmpeg invocation under the thread budget."""
+    outputs = job["outputs"]
+    for _, path in outputs:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    cost = threads * len(outputs)
+    label = job.get("label", job["src"])
+    chunked = use_chunks(job)
+    with tracing.span("transcode.wait", asset=label, threads=cost):
+        budget.acquire(cost)
+    start = time.time()
+    error = None
+    try:
+        if job.get("per_title", TRANSCODE_MODE == "per-title"):
+            # The CRF search probes with libx264; WebM rungs keep their codec's CRFs
+            h264 = [i for i, (r, _) in enumerate(outputs) if r.get("codec", "h264") == "h264"]
+            with tracing.span("transcode.ladder", asset=label, src=job["src"]):
+                tuned = per_title_ladder(job["src"], [outputs[i][0] for i in h264], threads=threads)
+            outputs = list(outputs)
+            for i, r in zip(h264, tuned):
+                outputs[i] = (r, outputs[i][1])
+        if not chunked:
+            with tracing.span("transcode", asset=label, src=job["src"], threads=threads,
+                              renditions=",".join(r["name"] for r, _ in outputs)) as s:
+                proc = subprocess.run(build_command(job["src"], outputs, threads), capture_output=True, text=True)
+                error = proc.stderr.strip()[-300:] if proc.returncode != 0 else None
+                s.set(returncode=proc.returncode)
+    except (FileNotFoundError, subprocess.CalledProcessError, RuntimeError) as e:
+        error = str(e)
+    finally:
+        budget.release(cost)
+
+    chunks = None
+    if chunked and not error:
+        # Each chunk takes its own share of the budget
+        try:
+            with tracing.span("transcode.chunked", asset=label, src=job["src"],
+                              renditions=",".join(r["name"] for r, _ in outputs)) as s:
+                chunks = encode_chunked(job["src"], outputs, budget, label)
+                s.set(chunks=len(chunks))
+        except subprocess.CalledProcessError as e:
+            error = (e.stderr or str(e)).strip()[-300:]
+        except (FileNotFoundError, RuntimeError) as e:
+            error = str(e)
+    wall = time.time() - start
+
+    result = {"label": label, "src": job["src"],
+              "wall_seconds": round(wall, 2), "outputs": []}
+    if chunks:
+        result["chunks"] = len(chunks)
+
+    if error:
+        result["status"] = "error"
+        result["error"] = error
+        for rendition, path in outputs:
+            if os.path.exists(_partial(path)):
+                os.remove(_partial(path))
+            # Fallback: ship the source untouched rather than nothing — as an MP4 only,
+            # a source copied to -av1.webm would be served with the wrong type
+            if (job.get("fallback_copy", True) and rendition.get("codec", "h264") == "h264"
+                    and os.path.exists(job["src"])):
+                shutil.copyfile(job["src"], path)
+        return result
+
+    for rendition, path in outputs:
+        os.replace(_partial(path), path)
+        size = os.path.getsize(path)
+        with tracing.span("probe", asset=label, rendition=rendition["name"], bytes=size) as s:
+            info = probe(path)
+            s.set(width=info["width"], height=info["height"], duration=info["duration"])
+        bit_rate = info["bit_rate"]
+        if not bit_rate and info["duration"]:
+            bit_rate = int(size * 8 / info["duration"])
+        codec = rendition.get("codec", "h264")
+        result["outputs"].append({
+            "name": rendition["name"],
+            "codec": codec,
+            "type": CODECS[codec]["mime"],
+            "crf": rendition["crf"],
+            "path": path,
+            "bytes": size,
+            "width": info["width"],
+            "height": info["height"],
+            "duration": info["duration"],
+            "bitrate_kbps": round(bit_rate / 1000) if bit_rate else None,
+        })
+    manifest.record_renditions(job["src"], [dict(o, format=o["codec"]) for o in result["outputs"]],
+                               formats=CODECS)
+    video_sources.write(job["src"], base_path(*outputs[0]), result["outputs"])
+    result["status"] = "success"
+    return result
+
+
+def transcode_all(jobs, threads=THREADS_PER_RENDITION, cores=CORES):
+    """Run all transcode jobs concurrently within the core budget.
+
+    Each job: {"src": path, "outputs": [(rendition, out_path), ...], "label": str}
+    Returns one result dict per job, in input order.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+
+    budget = ThreadBudget(cores)
+    max_parallel = max(1, min(len(jobs), cores // max(1, threads)))
+    print(f"  Transcoding {len(jobs)} source(s) — up to {max_parallel} in parallel "
+          f"({cores} cores, {threads} threads/rendition)")
+
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+        results = list(pool.map(lambda job: run_job(job, budget, threads), jobs))
+
+    for r in results:
+        if r["status"] != "success":
+            print(f"    ❌ {r['label']}: ffmpeg error after {r['wall_seconds']:.1f}s — {r['error'][:100]}")
+            continue
+        chunks = f" ({r['chunks']} chunks)" if r.get("chunks") else ""
+        print(f"    {r['label']}: {r['wall_seconds']:.1f}s{chunks}")
+        for o in r["outputs"]:
+            rate = f"{o['bitrate_kbps']} kb/s" if o["bitrate_kbps"] else "? kb/s"
+            print(f"      {o['name']:>6} {o['codec']:>4}: {o['path']} ({o['bytes'] / 1024:.0f} KB, {rate}, crf {o['crf']})")
+    if any(r["status"] == "success" for r in results):
+        video_sources.export()
+    print(f"  Video phase: {time.time() - start:.1f}s wall")
+    return results
@@ -0,0 +1,130 @@
+"""
+═══════════════════════════════════════════════════════════════
+MANAH GROUP — Video <source> Manifest
+═══════════════════════════════════════════════════════════════
+The transcoder writes each rung of a video in several codecs:
+
+    hero_main_loop-720p-av1.webm   (VIDEO_CODECS=…,av1)
+    hero_main_loop-720p-vp9.webm
+    hero_main_loop-720p.mp4        always — the universal fallback
+
+A browser plays the first <source> whose type it supports, so the
+order matters: most efficient codec first, H.264 last. This module
+records that order so the website never hard-codes it:
+
+    output/video-sources/<public path>.json    one per video
+    website/src/lib/video-manifest.ts          every video, typed
+
+transcode.run_job() writes the per-video file; export() collects
+them after each transcode run (or on demand: `manah-assets manifest`).
+═══════════════════════════════════════════════════════════════
+"""
+
+import os
+import json
+
+from responsive import public_path, WEBSITE_PUBLIC
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_DIR = os.path.join(BASE_DIR, '..', 'output', 'video-sources')
+TS_MODULE = os.path.join(BASE_DIR, '..', '..', 'website', 'src', 'lib', 'video-manifest.ts')
+
+# Most efficient first; the browser takes the first type it can play
+CODEC_ORDER = ("av1", "vp9", "h264")
+
+
+def write(src, dest_base, outputs):
+    """Write output/video-sources/<public dest_base>.json; returns its path (None off-site).
+
+    `outputs` are transcode result outputs ("name", "codec", "type", "path", …).
+    """
+    key = public_path(dest_base)
+    if key is None:
+        return None
+    sources = [
+        {"src": public_path(o["path"]), "type": o["type"], "codec": o["codec"], "rendition": o["name"],
+         "width": o["width"], "height": o["height"], "bytes": o["bytes"]}
+        for o in outputs
+    ]
+    sources.sort(key=lambda s: (-(s["height"] or 0), CODEC_ORDER.index(s["codec"])))
+    entry = {
+        "src": key,
+        "source": os.path.relpath(src, os.path.join(BASE_DIR, '..', '..')),
+        "sources": sources,
+    }
+    path = os.path.join(MANIFEST_DIR, key.lstrip("/") + ".json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(entry, f, indent=2)
+    os.replace(tmp, path)
+    return path
+
+
+def entries():
+    """Every per-video manifest whose files are still on disk, by src."""
+    found = {}
+    for dirpath, _, filenames in os.walk(MANIFEST_DIR):
+        for name in filenames:
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(dirpath, name)) as f:
+                entry = json.load(f)
+            if all(os.path.exists(os.path.join(WEBSITE_PUBLIC, s["src"].lstrip("/"))) for s in entry["sources"]):
+                found[entry["src"]] = entry
+    return dict(sorted(found.items()))
+
+
+# ─── TypeScript module ───
+
+TS_HEADER = '''/* ═══════════════════════════════════════════════════════════
+   MANAH GROUP — Video <source> Manifest
+   GENERATED by asset-generator/scripts/video_sources.py — do not edit.
+   Regenerate with: ./manah-assets manifest
+   ═══════════════════════════════════════════════════════════ */
+
+export type VideoCodec = "av1" | "vp9" | "h264";
+
+export interface VideoSource {
+  src: string;
+  /** MIME type with codecs, for `<source type=…>` */
+  type: string;
+  codec: VideoCodec;
+  /** Ladder rung, e.g. "720p" */
+  rendition: string;
+  width: number;
+  height: number;
+  bytes: number;
+}
+
+'''
+
+TS_HELPERS = '''
+/**
+ * `<source>` list for one MP4 rendition path ("/videos/hero/x-720p.mp4"):
+ * the same rung in every codec, most efficient first, the MP4 last.
+ * Videos the pipeline has not transcoded yet get just the MP4.
+ */
+export function videoSources(mp4: string): Pick<VideoSource, "src" | "type">[] {
+  const match = mp4.match(/^(.*)-(\\d+p)\\.mp4$/);
+  const sources = match && VIDEO_MANIFEST[match[1]]?.filter((s) => s.rendition === match[2]);
+  return sources?.length ? sources : [{ src: mp4, type: "video/mp4" }];
+}
+'''
+
+
+def export(ts_path=None):
+    """Write every per-video manifest into the website's typed module; returns the video count."""
+    ts_path = ts_path or TS_MODULE
+    items = entries()
+    body = {src: e["sources"] for src, e in items.items()}
+    os.makedirs(os.path.dirname(ts_path), exist_ok=True)
+    tmp = f"{ts_path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(TS_HEADER)
+        f.write("export const VIDEO_MANIFEST: Record<string, VideoSource[]> = ")
+        f.write(json.dumps(body, indent=2))
+        f.write(";\n")
+        f.write(TS_HELPERS)
+    os.replace(tmp, ts_path)
+    return len(items)
@@ -10,6 +10,7 @@ import {
 } from "@/lib/animations";
 import MotionSection from "@/components/animations/MotionSection";
 import SectionHeading from "@/components/ui/SectionHeading";
+import { videoSources } from "@/lib/video-manifest";
 import CounterAnimation from "@/components/animations/CounterAnimation";
 import { Award, Target, Eye, Heart, Shield, Users, Clock, Globe } from "lucide-react";
 import Image from "next/image";
@@ -72,7 +73,9 @@ export default function AboutPage() {
           poster="/images/about/team_collaboration.png"
           className="absolute inset-0 w-full h-full object-cover opacity-20"
         >
-          <source src="/videos/about/company_story-720p.mp4" type="video/mp4" />
+          {videoSources("/videos/about/company_story-720p.mp4").map((s) => (
+            <source key={s.src} src={s.src} type={s.type} />
+          ))}
         </video>
         <div className="absolute inset-0 bg-[radial-gradient(ellipse_at_30%_20%,rgba(200,169,110,0.15),transparent_70%)]" />
         <div className="section-container py-24 md:py-32 relative z-10">
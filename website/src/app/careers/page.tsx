@@ -5,6 +5,7 @@ import Link from "next/link";
 import { motion, AnimatePresence } from "framer-motion";
 import { fadeUp, staggerContainer, scaleIn } from "@/lib/animations";
 import SectionHeading from "@/components/ui/SectionHeading";
+import { videoSources } from "@/lib/video-manifest";
 import MotionSection from "@/components/animations/MotionSection";
 import {
   ArrowRight,
@@ -123,7 +124,9 @@ export default function CareersPage() {
           poster="/images/careers/careers_hero.png"
           className="absolute inset-0 w-full h-full object-cover opacity-25"
         >
-          <source src="/videos/careers/culture_reel-720p.mp4" type="video/mp4" />
+          {videoSources("/videos/careers/culture_reel-720p.mp4").map((s) => (
+            <source key={s.src} src={s.src} type={s.type} />
+          ))}
         </video>
         <div className="absolute inset-0 bg-[radial-gradient(ellipse_at_60%_40%,rgba(200,169,110,0.12),transparent_60%)]" />
         <div className="section-container py-24 md:py-32 relative z-10">
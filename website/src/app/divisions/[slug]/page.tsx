@@ -12,6 +12,7 @@ import {
 } from "@/lib/animations";
 import MotionSection from "@/components/animations/MotionSection";
 import SectionHeading from "@/components/ui/SectionHeading";
+import { videoSources } from "@/lib/video-manifest";
 import { DIVISION_DETAILS } from "@/lib/divisions-data";
 import {
   ArrowRight,
@@ -76,7 +77,9 @@ export default function DivisionPage() {
               poster={DIVISION_IMAGES[slug].hero}
               className="absolute inset-0 w-full h-full object-cover"
             >
-              <source src={DIVISION_IMAGES[slug].video} type="video/mp4" />
+              {videoSources(DIVISION_IMAGES[slug].video).map((s) => (
+                <source key={s.src} src={s.src} type={s.type} />
+              ))}
             </video>
           ) : (
             <Image
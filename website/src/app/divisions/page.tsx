@@ -4,6 +4,7 @@ import Image from "next/image";
 import Link from "next/link";
 import { motion } from "framer-motion";
 import { BLUR_DATA_URL } from "@/lib/blur";
+import { videoSources } from "@/lib/video-manifest";
 import { fadeUp, staggerContainer } from "@/lib/animations";
 import SectionHeading from "@/components/ui/SectionHeading";
 import { DIVISIONS } from "@/lib/constants";
@@ -24,7 +25,9 @@ export default function DivisionsPage() {
           poster="/images/hero/hero_main_infrastructure.png"
           className="absolute inset-0 w-full h-full object-cover"
         >
-          <source src="/videos/hero/hero_main_loop-720p.mp4" type="video/mp4" />
+          {videoSources("/videos/hero/hero_main_loop-720p.mp4").map((s) => (
+            <source key={s.src} src={s.src} type={s.type} />
+          ))}
         </video>
 
         {/* Overlay gradients */}
@@ -3,6 +3,7 @@
 import Link from "next/link";
 import Image from "next/image";
 import { BLUR_DATA_URL } from "@/lib/blur";
+import { videoSources } from "@/lib/video-manifest";
 import { motion } from "framer-motion";
 import { fadeUp, staggerContainer, scaleIn } from "@/lib/animations";
 import SectionHeading from "@/components/ui/SectionHeading";
@@ -90,7 +91,9 @@ export default function SectorsPage() {
           poster="/images/hero/hero_construction_site.png"
           className="absolute inset-0 w-full h-full object-cover"
         >
-          <source src="/videos/hero/hero_technology-720p.mp4" type="video/mp4" />
+          {videoSources("/videos/hero/hero_technology-720p.mp4").map((s) => (
+            <source key={s.src} src={s.src} type={s.type} />
+          ))}
         </video>
 
         {/* Overlay gradients */}
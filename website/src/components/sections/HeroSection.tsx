@@ -5,6 +5,8 @@ import { motion } from "framer-motion";
 import { Play, ChevronDown } from "lucide-react";
 import ParallaxWrapper from "@/components/animations/ParallaxWrapper";
 import { useReducedMotion } from "@/hooks/useReducedMotion";
+import { responsiveImage } from "@/lib/image-manifest";
+import { videoSources } from "@/lib/video-manifest";
 
 const DIVISIONS = [
   {
@@ -36,6 +38,14 @@ const DIVISIONS = [
 
 const CROSSFADE_DURATION = 4000; // ms per video
 
+/** The pipeline's poster frame for a clip (`{video}-poster`), else the static fallback. */
+function getPosterSrc(basePath: string, fallback: string, isMobile: boolean): string {
+  const webp = responsiveImage(`${basePath}-poster`)?.renditions.filter((r) => r.format === "webp");
+  if (!webp?.length) return fallback;
+  const width = isMobile ? 640 : 1280;
+  return (webp.find((r) => r.width >= width) ?? webp[webp.length - 1]).src;
+}
+
 function getVideoSrc(basePath: string, isMobile: boolean): string {
   return isMobile ? `${basePath}-480p.mp4` : `${basePath}-720p.mp4`;
 }
@@ -94,10 +104,12 @@ export default function HeroSection() {
               loop
               playsInline
               preload={i === 0 ? "auto" : "metadata"}
-              poster={div.poster}
+              poster={getPosterSrc(div.video, div.poster, isMobile)}
               className="absolute inset-0 w-full h-full object-cover"
             >
-              <source src={getVideoSrc(div.video, isMobile)} type="video/mp4" />
+              {videoSources(getVideoSrc(div.video, isMobile)).map((s) => (
+                <source key={s.src} src={s.src} type={s.type} />
+              ))}
             </video>
           </div>
         ))}
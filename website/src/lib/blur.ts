@@ -2,6 +2,8 @@
    Blur placeholder utilities for Next.js Image component
    ═══════════════════════════════════════════════════════════ */
 
+import { responsiveImage } from "./image-manifest";
+
 /**
  * Generates a shimmer SVG as a base64-encoded data URL for use
  * as a `blurDataURL` with Next.js `<Image placeholder="blur">`.
@@ -43,3 +45,11 @@ export function shimmerBlur(w = 16, h = 9): string {
 
 /** Pre-computed blur data URL for common use (16:9 aspect ratio) */
 export const BLUR_DATA_URL = shimmerBlur();
+
+/**
+ * The asset pipeline's precomputed LQIP for `src` (see image-manifest.ts),
+ * falling back to the brand shimmer for images it has not processed.
+ */
+export function blurFor(src: string): string {
+  return responsiveImage(src)?.blurDataURL ?? BLUR_DATA_URL;
+}
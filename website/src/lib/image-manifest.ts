@@ -0,0 +1,41 @@
+/* ═══════════════════════════════════════════════════════════
+   MANAH GROUP — Responsive Image Manifest
+   GENERATED by asset-generator/scripts/responsive.py — do not edit.
+   Regenerate with: ./manah-assets manifest
+   ═══════════════════════════════════════════════════════════ */
+
+export type ImageFormat = "webp" | "avif" | "jpeg";
+
+export interface ImageRendition {
+  src: string;
+  width: number;
+  height: number;
+  bytes: number;
+  format: ImageFormat;
+}
+
+export interface ResponsiveImage {
+  width: number;
+  height: number;
+  renditions: ImageRendition[];
+  blurhash?: string;
+  /** Tiny WebP data URL, for `<Image placeholder="blur" blurDataURL=…>` */
+  blurDataURL?: string;
+  /** Dominant colour, e.g. as a background while the image loads */
+  color?: string;
+}
+
+export const IMAGE_MANIFEST: Record<string, ResponsiveImage> = {};
+
+/** Manifest entry for an image path; the extension is ignored ("/images/hero/x.png" → "/images/hero/x"). */
+export function responsiveImage(src: string): ResponsiveImage | undefined {
+  return IMAGE_MANIFEST[src.replace(/\?.*$/, "").replace(/\.[a-z0-9]+$/i, "")];
+}
+
+/** `srcset` for one format, smallest first, e.g. "/images/a-sm.webp 640w, /images/a-md.webp 1024w". */
+export function srcSet(image: ResponsiveImage, format: ImageFormat = "webp"): string {
+  return image.renditions
+    .filter((r) => r.format === format)
+    .map((r) => `${r.src} ${r.width}w`)
+    .join(", ");
+}
@@ -0,0 +1,32 @@
+/* ═══════════════════════════════════════════════════════════
+   MANAH GROUP — Video <source> Manifest
+   GENERATED by asset-generator/scripts/video_sources.py — do not edit.
+   Regenerate with: ./manah-assets manifest
+   ═══════════════════════════════════════════════════════════ */
+
+export type VideoCodec = "av1" | "vp9" | "h264";
+
+export interface VideoSource {
+  src: string;
+  /** MIME type with codecs, for `<source type=…>` */
+  type: string;
+  codec: VideoCodec;
+  /** Ladder rung, e.g. "720p" */
+  rendition: string;
+  width: number;
+  height: number;
+  bytes: number;
+}
+
+export const VIDEO_MANIFEST: Record<string, VideoSource[]> = {};
+
+/**
+ * `<source>` list for one MP4 rendition path ("/videos/hero/x-720p.mp4"):
+ * the same rung in every codec, most efficient first, the MP4 last.
+ * Videos the pipeline has not transcoded yet get just the MP4.
+ */
+export function videoSources(mp4: string): Pick<VideoSource, "src" | "type">[] {
+  const match = mp4.match(/^(.*)-(\d+p)\.mp4$/);
+  const sources = match && VIDEO_MANIFEST[match[1]]?.filter((s) => s.rendition === match[2]);
+  return sources?.length ? sources : [{ src: mp4, type: "video/mp4" }];
+}